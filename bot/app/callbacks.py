@@ -0,0 +1,15 @@
+"""Содержит фабрики callback-данных для inline-кнопок."""
+
+from aiogram.filters.callback_data import CallbackData
+
+
+class TranslateExactCallback(CallbackData, prefix="exact"):
+    """Запрос перевода текста как есть, без подбора похожих слов."""
+
+    source: str
+
+
+class DetailedTranslationCallback(CallbackData, prefix="more"):
+    """Запрос подробной статьи для краткого перевода."""
+
+    translation_id: int
@@ -1,18 +1,151 @@
-from typing import Any
+from typing import Any, Literal
 from urllib.parse import quote
 
-from pydantic import Field, PostgresDsn, validator
+from pydantic import BaseModel, Field, PostgresDsn, validator
 from pydantic_settings import BaseSettings
 
 
+class OpenAIBackendSettings(BaseModel):
+    """Настройки одного бэкенда ChatGPT API из OPENAI_BACKENDS."""
+
+    name: str
+    base_url: str = Field(default="https://api.openai.com/v1")
+    # Если не задан, используется OPENAI_API_KEY
+    api_key: str | None = Field(default=None)
+    # Если не задана, используется модель из запроса (OPENAI_MODEL_NAME)
+    model: str | None = Field(default=None)
+
+
+class ModelPriceSettings(BaseModel):
+    """Цены модели за 1 млн токенов для оценки расходов в /stats."""
+
+    input: float
+    cached_input: float
+    output: float
+
+
 class Settings(BaseSettings):
     TELEGRAM_BOT_TOKEN: str
     SENTRY_DSN: str | None = Field(default=None)
+    # Доля обновлений, для которых в Sentry записывается трассировка (0 — выключено)
+    SENTRY_TRACES_SAMPLE_RATE: float = Field(default=0.0)
     OPENAI_API_KEY: str
     OPENAI_API_BASE_URL: str | None = Field(default=None)
     OPENAI_MODEL_NAME: str = Field(default="gpt-4.1-mini")
     ALLOWED_USERS: list[str]
 
+    # Несколько бэкендов ChatGPT API (JSON-список) для распределения нагрузки.
+    # Если список пуст, используются OPENAI_API_BASE_URL и OPENAI_API_KEY.
+    OPENAI_BACKENDS: list[OpenAIBackendSettings] = Field(default_factory=list)
+
+    # Ограничения на текст, который отправляется на перевод: длина и количество
+    # слов проверяются для каждой строки (элемента списка слов) отдельно
+    INPUT_MAX_LENGTH: int = Field(default=300)
+    INPUT_MAX_WORDS: int = Field(default=30)
+    INPUT_MAX_LINES: int = Field(default=50)
+
+    # Настройки HTTP-клиента для ChatGPT API
+    OPENAI_HTTP_CONNECT_TIMEOUT: float = Field(default=5.0)
+    OPENAI_HTTP_READ_TIMEOUT: float = Field(default=30.0)
+    OPENAI_HTTP_WRITE_TIMEOUT: float = Field(default=10.0)
+    OPENAI_HTTP_POOL_TIMEOUT: float = Field(default=5.0)
+    OPENAI_HTTP_MAX_CONNECTIONS: int = Field(default=20)
+    OPENAI_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(default=10)
+    OPENAI_HTTP_KEEPALIVE_EXPIRY: float = Field(default=60.0)
+    OPENAI_HTTP2: bool = Field(default=False)
+    # Read-таймаут для потока (пауза между фрагментами) и для пакетного перевода
+    OPENAI_HTTP_STREAM_READ_TIMEOUT: float = Field(default=15.0)
+    OPENAI_HTTP_BATCH_READ_TIMEOUT: float = Field(default=90.0)
+
+    # Повторы запросов к ChatGPT API при временных сбоях (429, 5xx, таймауты)
+    OPENAI_MAX_RETRIES: int = Field(default=2)
+    OPENAI_RETRY_BASE_DELAY: float = Field(default=0.5)
+    OPENAI_RETRY_MAX_DELAY: float = Field(default=8.0)
+
+    # Автоматический выключатель: после OPENAI_CIRCUIT_FAILURE_THRESHOLD сбоев
+    # подряд запросы к ChatGPT отклоняются сразу в течение OPENAI_CIRCUIT_RESET_TIMEOUT с
+    OPENAI_CIRCUIT_FAILURE_THRESHOLD: int = Field(default=5)
+    OPENAI_CIRCUIT_RESET_TIMEOUT: float = Field(default=30.0)
+
+    # Дублирующие запросы перевода: если ответа нет дольше OPENAI_HEDGE_PERCENTILE-го
+    # перцентиля недавних ответов, отправляется второй запрос. Доля дублирующих
+    # запросов ограничена OPENAI_HEDGE_MAX_RATIO. Второй запрос ждёт места
+    # в очереди LLM_* и резервирует токены, как и основной.
+    OPENAI_HEDGE_ENABLED: bool = Field(default=False)
+    OPENAI_HEDGE_PERCENTILE: float = Field(default=95.0)
+    OPENAI_HEDGE_MAX_RATIO: float = Field(default=0.1)
+
+    # Планировщик запросов к LLM: общий лимит одновременных запросов, лимит на
+    # пользователя и лимит провайдера в токенах в минуту (None — без лимита)
+    LLM_MAX_CONCURRENCY: int = Field(default=8)
+    LLM_MAX_CONCURRENCY_PER_USER: int = Field(default=2)
+    LLM_TOKENS_PER_MINUTE: int | None = Field(default=None)
+
+    # Цены моделей за 1 млн токенов (JSON-объект). Модель из ответа API
+    # сопоставляется по самому длинному префиксу: "gpt-4.1-mini-2025-04-14"
+    # получит цены "gpt-4.1-mini".
+    OPENAI_MODEL_PRICES: dict[str, ModelPriceSettings] = Field(
+        default_factory=lambda: {
+            "gpt-4.1": ModelPriceSettings(input=2.0, cached_input=0.5, output=8.0),
+            "gpt-4.1-mini": ModelPriceSettings(input=0.4, cached_input=0.1, output=1.6),
+            "gpt-4.1-nano": ModelPriceSettings(
+                input=0.1, cached_input=0.025, output=0.4
+            ),
+            "gpt-4o-mini": ModelPriceSettings(
+                input=0.15, cached_input=0.075, output=0.6
+            ),
+        }
+    )
+    OPENAI_PRICE_CURRENCY: str = Field(default="$")
+
+    # Потоковая генерация перевода в Markdown с постепенным редактированием
+    # сообщения. Если выключена, перевод запрашивается в виде статьи в JSON
+    # и оформляется локально: ответ короче, но показывается только целиком.
+    OPENAI_STREAM: bool = Field(default=True)
+    TELEGRAM_EDIT_INTERVAL: float = Field(default=1.0)
+
+    # Сначала запрашивается краткий перевод слова или фразы, а подробная статья
+    # со значениями и примерами — по кнопке "Подробнее" (только при OPENAI_STREAM=false)
+    TRANSLATION_BRIEF_FIRST: bool = Field(default=True)
+
+    # Настройки in-memory кэша переводов. Без VIEW_COUNT_WRITE_BEHIND перевод
+    # из кэша не читается из БД, но просмотр всё равно записывается запросом
+    # UPDATE; с отложенной записью кэш избавляет от запросов к БД полностью
+    TRANSLATION_CACHE_MAX_SIZE: int = Field(default=10_000)
+    TRANSLATION_CACHE_TTL: float = Field(default=3600.0)
+
+    # Подсказка похожего сохранённого слова для слов с возможной опечаткой
+    FUZZY_INDEX_ENABLED: bool = Field(default=True)
+
+    # Настройки отложенной записи счетчиков просмотров. Выключена по умолчанию:
+    # при аварийной остановке бота теряются просмотры за последние
+    # VIEW_COUNT_FLUSH_INTERVAL секунд
+    VIEW_COUNT_WRITE_BEHIND: bool = Field(default=False)
+    VIEW_COUNT_FLUSH_INTERVAL: float = Field(default=5.0)
+    VIEW_COUNT_FLUSH_MAX_EVENTS: int = Field(default=100)
+
+    # Время жизни кэша текста статистики /stats, в секундах
+    STATS_CACHE_TTL: float = Field(default=60.0)
+
+    # Получение обновлений: "polling" (для разработки) или "webhook". В режиме
+    # webhook Telegram отправляет обновления на WEBHOOK_BASE_URL + WEBHOOK_PATH,
+    # а бот принимает их на WEBHOOK_HOST:WEBHOOK_PORT и проверяет заголовок
+    # X-Telegram-Bot-Api-Secret-Token по WEBHOOK_SECRET
+    BOT_MODE: Literal["polling", "webhook"] = Field(default="polling")
+    WEBHOOK_BASE_URL: str | None = Field(default=None)
+    WEBHOOK_PATH: str = Field(default="/webhook")
+    WEBHOOK_SECRET: str | None = Field(default=None)
+    WEBHOOK_HOST: str = Field(default="0.0.0.0")
+    WEBHOOK_PORT: int = Field(default=8080)
+
+    # Максимальное количество одновременно обрабатываемых обновлений
+    HANDLER_MAX_CONCURRENCY: int = Field(default=100)
+
+    # HTTP-сервер метрик в формате Prometheus (/metrics)
+    METRICS_ENABLED: bool = Field(default=False)
+    METRICS_HOST: str = Field(default="127.0.0.1")
+    METRICS_PORT: int = Field(default=9464)
+
     # Настройки базы данных
     POSTGRES_USER: str = Field(default="postgres")
     POSTGRES_PASSWORD: str = Field(default="password")
@@ -54,5 +187,23 @@ class Settings(BaseSettings):
             path=f"{values.get('POSTGRES_DB') or ''}",
         )
 
+    @validator("OPENAI_BACKENDS")
+    def check_unique_backend_names(
+        cls,
+        v: list[OpenAIBackendSettings],
+    ) -> list[OpenAIBackendSettings]:
+        """
+        Проверяет, что названия бэкендов не повторяются: по названию бэкенды
+        различаются в метриках, логах и при выборе бэкенда для повтора запроса.
+        """
+
+        names = [backend.name for backend in v]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(
+                f"Повторяющиеся названия бэкендов в OPENAI_BACKENDS: {duplicates}"
+            )
+        return v
+
 
 settings = Settings()
@@ -1,7 +1,9 @@
+from app.db.llm_call_dao import LLMCallDAO
 from app.db.session import SessionLocal
 from app.db.translation_dao import TranslationDAO
 
 __all__ = [
+    "LLMCallDAO",
     "SessionLocal",
     "TranslationDAO",
 ]
@@ -3,7 +3,9 @@
 from typing import Any, Generic, TypeVar
 
 from pydantic import BaseModel as PydanticBaseModel
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import column as sa_column
+from sqlalchemy import delete, insert, select, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import BaseModel as SQLAlchemyBaseModel
@@ -47,6 +49,103 @@ class BaseDAO(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         result = await session.execute(stmt)
         return result.scalars().first()  # type: ignore[no-any-return]
 
+    # MARK: Upsert
+    @classmethod
+    async def upsert(
+        cls,
+        session: AsyncSession,
+        obj_in: CreateSchemaType | dict[str, Any],
+        *,
+        index_elements: list[str],
+        set_: dict[str, Any] | None = None,
+    ) -> ModelType | None:
+        """Добавляет объект или обновляет существующий одним запросом.
+
+        Выполняет INSERT ... ON CONFLICT DO UPDATE ... RETURNING (PostgreSQL).
+        Если `set_` не задан, при конфликте ничего не обновляется и возвращается None.
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy
+            obj_in: Данные для создания объекта (схема Pydantic или словарь)
+            index_elements: Колонки уникального индекса, по которому определяется конфликт
+            set_: Значения для обновления существующей строки при конфликте
+
+        Returns:
+            Созданный или обновленный объект или None
+        """
+
+        if cls.model is None:
+            raise ValueError("Model class не установлен")
+
+        if isinstance(obj_in, dict):
+            create_data = obj_in
+        else:
+            create_data = obj_in.model_dump(exclude_unset=True)
+
+        insert_stmt = pg_insert(cls.model).values(**create_data)
+        if set_:
+            stmt = insert_stmt.on_conflict_do_update(
+                index_elements=index_elements,
+                set_=set_,
+            )
+        else:
+            stmt = insert_stmt.on_conflict_do_nothing(index_elements=index_elements)
+
+        result = await session.execute(
+            stmt.returning(cls.model).execution_options(populate_existing=True)
+        )
+        return result.scalars().one_or_none()  # type: ignore[no-any-return]
+
+    @classmethod
+    async def upsert_many(
+        cls,
+        session: AsyncSession,
+        objs_in: list[CreateSchemaType] | list[dict[str, Any]],
+        *,
+        index_elements: list[str],
+        set_: dict[str, Any] | None = None,
+    ) -> list[ModelType]:
+        """Добавляет несколько объектов или обновляет существующие одним запросом.
+
+        Выполняет многострочный INSERT ... ON CONFLICT DO UPDATE ... RETURNING
+        (PostgreSQL). Если `set_` не задан, конфликтующие строки пропускаются
+        и не попадают в результат.
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy
+            objs_in: Данные для создания объектов (схемы Pydantic или словари)
+            index_elements: Колонки уникального индекса, по которому определяется конфликт
+            set_: Значения для обновления существующих строк при конфликте
+
+        Returns:
+            Список созданных или обновленных объектов
+        """
+
+        if cls.model is None:
+            raise ValueError("Model class не установлен")
+
+        if not objs_in:
+            return []
+
+        create_data = [
+            obj_in if isinstance(obj_in, dict) else obj_in.model_dump()
+            for obj_in in objs_in
+        ]
+
+        insert_stmt = pg_insert(cls.model).values(create_data)
+        if set_:
+            stmt = insert_stmt.on_conflict_do_update(
+                index_elements=index_elements,
+                set_=set_,
+            )
+        else:
+            stmt = insert_stmt.on_conflict_do_nothing(index_elements=index_elements)
+
+        result = await session.execute(
+            stmt.returning(cls.model).execution_options(populate_existing=True)
+        )
+        return list(result.scalars().all())
+
     # MARK: Read
     @classmethod
     async def find_one_or_none(
@@ -142,6 +241,125 @@ class BaseDAO(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         result = await session.execute(stmt)
         return result.scalars().one_or_none()  # type: ignore[no-any-return]
 
+    @classmethod
+    async def increment(
+        cls,
+        session: AsyncSession,
+        *where: Any,
+        column: str,
+        amount: int = 1,
+    ) -> ModelType | None:
+        """Атомарно увеличивает значение числовой колонки одним запросом.
+
+        Выполняет UPDATE ... SET column = column + amount ... RETURNING, поэтому
+        параллельные увеличения не теряются.
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy
+            where: Условия для выбора обновляемого объекта
+            column: Название числовой колонки
+            amount: Величина увеличения
+
+        Returns:
+            Обновленный объект или None, если объект не найден
+        """
+
+        if cls.model is None:
+            raise ValueError("Model class не установлен")
+
+        stmt = (
+            update(cls.model)
+            .where(*where)
+            .values({column: getattr(cls.model, column) + amount})
+            .returning(cls.model)
+            .execution_options(populate_existing=True)
+        )
+        result = await session.execute(stmt)
+        return result.scalars().one_or_none()  # type: ignore[no-any-return]
+
+    @classmethod
+    async def increment_without_returning(
+        cls,
+        session: AsyncSession,
+        *where: Any,
+        column: str,
+        amount: int = 1,
+    ) -> bool:
+        """Атомарно увеличивает значение числовой колонки, не читая объект.
+
+        Выполняет UPDATE ... SET column = column + amount без RETURNING: для
+        случаев, когда объект уже известен (например, взят из кэша).
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy
+            where: Условия для выбора обновляемого объекта
+            column: Название числовой колонки
+            amount: Величина увеличения
+
+        Returns:
+            True, если объект найден и обновлен
+        """
+
+        if cls.model is None:
+            raise ValueError("Model class не установлен")
+
+        stmt = (
+            update(cls.model)
+            .where(*where)
+            .values({column: getattr(cls.model, column) + amount})
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(stmt)
+        return bool(result.rowcount)
+
+    @classmethod
+    async def increment_many(
+        cls,
+        session: AsyncSession,
+        *,
+        key: str,
+        column: str,
+        amounts: dict[Any, int],
+    ) -> list[ModelType]:
+        """Атомарно увеличивает числовую колонку у нескольких объектов одним запросом.
+
+        Выполняет UPDATE ... SET column = column + v.amount FROM (VALUES ...) v
+        WHERE key = v.key RETURNING.
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy
+            key: Название колонки, по которой выбираются объекты
+            column: Название числовой колонки
+            amounts: Величины увеличения по значениям колонки `key`
+
+        Returns:
+            Список обновленных объектов
+        """
+
+        if cls.model is None:
+            raise ValueError("Model class не установлен")
+
+        if not amounts:
+            return []
+
+        key_column = getattr(cls.model, key)
+        value_column = getattr(cls.model, column)
+        increments = values(
+            sa_column("key", key_column.type),
+            sa_column("amount", value_column.type),
+            name="increments",
+        ).data(list(amounts.items()))
+
+        stmt = (
+            update(cls.model)
+            .where(key_column == increments.c.key)
+            .values({column: value_column + increments.c.amount})
+            .returning(cls.model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
     # MARK: Delete
     @classmethod
     async def delete(
@@ -0,0 +1,81 @@
+from collections.abc import Sequence
+from datetime import date, datetime
+
+from sqlalchemy import Date, Row, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base_dao import BaseDAO
+from app.models import LLMCallModel
+from app.schemas import LLMCallCreateSchema, LLMCallUpdateSchema
+
+
+class LLMCallDAO(BaseDAO[LLMCallModel, LLMCallCreateSchema, LLMCallUpdateSchema]):
+    """Класс для работы с записями о запросах к LLM в базе данных."""
+
+    model: type[LLMCallModel] = LLMCallModel
+
+    @classmethod
+    async def get_usage_by_day_and_model(
+        cls,
+        session: AsyncSession,
+        *,
+        since: datetime,
+    ) -> Sequence[Row[tuple[date, str, int, int, int, int, int]]]:
+        """Суммирует расход токенов по дням и моделям.
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy
+            since: Начало периода (использует индекс по created_at)
+
+        Returns:
+            Строки (день, модель, запросов, переведённых текстов, токенов запроса,
+            токенов из кэша, токенов ответа), новые дни первыми
+        """
+        day = cast(LLMCallModel.created_at, Date).label("day")
+        stmt = (
+            select(
+                day,
+                LLMCallModel.model,
+                func.count(LLMCallModel.id),
+                func.coalesce(func.sum(LLMCallModel.items), 0),
+                func.coalesce(func.sum(LLMCallModel.prompt_tokens), 0),
+                func.coalesce(func.sum(LLMCallModel.cached_tokens), 0),
+                func.coalesce(func.sum(LLMCallModel.completion_tokens), 0),
+            )
+            .where(LLMCallModel.created_at >= since)
+            .group_by(day, LLMCallModel.model)
+            .order_by(day.desc(), LLMCallModel.model.asc())
+        )
+        return (await session.execute(stmt)).all()  # type: ignore[return-value]
+
+    @classmethod
+    async def get_usage_by_model(
+        cls,
+        session: AsyncSession,
+        *,
+        since: datetime,
+    ) -> Sequence[Row[tuple[str, int, int, int, int, int]]]:
+        """Суммирует расход токенов по моделям за период.
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy
+            since: Начало периода (использует индекс по created_at)
+
+        Returns:
+            Строки (модель, запросов, переведённых текстов, токенов запроса,
+            токенов из кэша, токенов ответа)
+        """
+        stmt = (
+            select(
+                LLMCallModel.model,
+                func.count(LLMCallModel.id),
+                func.coalesce(func.sum(LLMCallModel.items), 0),
+                func.coalesce(func.sum(LLMCallModel.prompt_tokens), 0),
+                func.coalesce(func.sum(LLMCallModel.cached_tokens), 0),
+                func.coalesce(func.sum(LLMCallModel.completion_tokens), 0),
+            )
+            .where(LLMCallModel.created_at >= since)
+            .group_by(LLMCallModel.model)
+            .order_by(LLMCallModel.model.asc())
+        )
+        return (await session.execute(stmt)).all()  # type: ignore[return-value]
@@ -1,11 +1,43 @@
 """Модуль для управления асинхронными сессиями базы данных с использованием SQLAlchemy."""
 
+import time
+from typing import Any, cast
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExceptionContext
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
 
 from app.config import settings
+from app.metrics import (
+    DB_ERRORS,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_CONNECTIONS,
+    DB_QUERY_DURATION,
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений, который измеряет время получения соединения.
+
+    События пула срабатывают уже после получения соединения, поэтому время
+    измеряется вокруг публичного метода `Pool.connect`, через который движок
+    берёт каждое соединение. В него входят ожидание свободного соединения,
+    открытие нового и проверка соединения (pool_pre_ping).
+    """
+
+    def connect(self) -> PoolProxiedConnection:
+        started_at = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started_at)
+
 
 engine = create_async_engine(
     url=str(settings.ASYNC_POSTGRES_URI),
+    poolclass=InstrumentedQueuePool,
     pool_size=10,
     max_overflow=20,
     pool_pre_ping=True,  # Проверяет соединения перед использованием
@@ -20,3 +52,33 @@ SessionLocal = async_sessionmaker(
     expire_on_commit=False,
     class_=AsyncSession,
 )
+
+
+# MARK: Metrics
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn: Connection, *args: Any) -> None:
+    """Запоминает время начала запроса к БД."""
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn: Connection, *args: Any) -> None:
+    """Учитывает время выполнения запроса к БД."""
+    started_at = conn.info["query_started_at"].pop()
+    DB_QUERY_DURATION.observe(time.perf_counter() - started_at)
+
+
+@event.listens_for(engine.sync_engine, "handle_error")
+def _handle_error(context: ExceptionContext) -> None:
+    """Учитывает ошибку запроса к БД."""
+    if context.connection is not None:
+        # after_cursor_execute для запроса с ошибкой не вызывается
+        query_started_at = context.connection.info.get("query_started_at")
+        if query_started_at:
+            query_started_at.pop()
+    DB_ERRORS.labels(error=type(context.original_exception).__name__).inc()
+
+
+pool = cast(InstrumentedQueuePool, engine.pool)
+DB_POOL_CONNECTIONS.labels(state="checked_out").set_function(pool.checkedout)
+DB_POOL_CONNECTIONS.labels(state="idle").set_function(pool.checkedin)
@@ -1,6 +1,11 @@
+from sqlalchemy import case, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants import CURRENT_TIMESTAMP
 from app.db.base_dao import BaseDAO
 from app.models import TranslationModel
 from app.schemas import TranslationCreateSchema, TranslationUpdateSchema
+from app.utils import get_source_hash, traced
 
 
 class TranslationDAO(
@@ -9,3 +14,259 @@ class TranslationDAO(
     """Класс для работы с переводами в базе данных."""
 
     model: type[TranslationModel] = TranslationModel
+
+    @classmethod
+    @traced("db.dao")
+    async def find_by_source(
+        cls,
+        session: AsyncSession,
+        *,
+        source: str,
+    ) -> TranslationModel | None:
+        """Находит перевод по нормализованному исходному тексту.
+
+        Поиск идёт по уникальному индексу на хэше текста, поэтому не зависит
+        от длины текста.
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy
+            source: Нормализованный исходный текст
+
+        Returns:
+            Найденный перевод или None
+        """
+        return await cls.find_one_or_none(
+            session,
+            source_hash=get_source_hash(source),
+        )
+
+    @classmethod
+    @traced("db.dao")
+    async def find_by_sources(
+        cls,
+        session: AsyncSession,
+        *,
+        sources: list[str],
+    ) -> list[TranslationModel]:
+        """Находит переводы нескольких текстов одним запросом.
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy
+            sources: Нормализованные исходные тексты
+
+        Returns:
+            Список найденных переводов (порядок не гарантируется)
+        """
+        if not sources:
+            return []
+
+        stmt = select(TranslationModel).where(
+            TranslationModel.source_hash.in_(
+                [get_source_hash(source) for source in sources]
+            )
+        )
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+    @classmethod
+    @traced("db.dao")
+    async def find_existing_source_hashes(
+        cls,
+        session: AsyncSession,
+        *,
+        sources: list[str],
+    ) -> set[str]:
+        """Проверяет наличие переводов нескольких текстов одним запросом.
+
+        Читается только индекс хэшей, без текста переводов.
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy
+            sources: Нормализованные исходные тексты
+
+        Returns:
+            Хэши исходных текстов, для которых перевод уже есть
+        """
+        if not sources:
+            return set()
+
+        stmt = select(TranslationModel.source_hash).where(
+            TranslationModel.source_hash.in_(
+                [get_source_hash(source) for source in sources]
+            )
+        )
+        result = await session.execute(stmt)
+        return set(result.scalars().all())
+
+    @classmethod
+    @traced("db.dao")
+    async def find_by_lemma(
+        cls,
+        session: AsyncSession,
+        *,
+        lemmas: list[str],
+    ) -> TranslationModel | None:
+        """Находит перевод другой формы того же слова.
+
+        Предпочтение отдаётся записи для самой начальной формы слова, затем
+        самой популярной записи с той же начальной формой.
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy
+            lemmas: Возможные начальные формы слова
+
+        Returns:
+            Найденный перевод или None
+        """
+        if not lemmas:
+            return None
+
+        stmt = (
+            select(TranslationModel)
+            .where(TranslationModel.lemma.in_(lemmas))
+            .order_by(
+                case((TranslationModel.source.in_(lemmas), 0), else_=1),
+                TranslationModel.view_count.desc(),
+            )
+            .limit(1)
+        )
+        result = await session.execute(stmt)
+        return result.scalars().first()
+
+    @classmethod
+    @traced("db.dao")
+    async def increment_view_count(
+        cls,
+        session: AsyncSession,
+        *,
+        source: str,
+        amount: int = 1,
+    ) -> TranslationModel | None:
+        """Атомарно увеличивает счетчик просмотров перевода по исходному тексту.
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy
+            source: Нормализованный исходный текст
+            amount: Величина увеличения
+
+        Returns:
+            Обновленный перевод или None, если перевод не найден
+        """
+        return await cls.increment(
+            session,
+            TranslationModel.source_hash == get_source_hash(source),
+            column="view_count",
+            amount=amount,
+        )
+
+    @classmethod
+    @traced("db.dao")
+    async def increment_view_count_without_returning(
+        cls,
+        session: AsyncSession,
+        *,
+        source: str,
+        amount: int = 1,
+    ) -> bool:
+        """Атомарно увеличивает счетчик просмотров перевода, не читая запись.
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy
+            source: Нормализованный исходный текст
+            amount: Величина увеличения
+
+        Returns:
+            True, если перевод найден
+        """
+        return await cls.increment_without_returning(
+            session,
+            TranslationModel.source_hash == get_source_hash(source),
+            column="view_count",
+            amount=amount,
+        )
+
+    @classmethod
+    @traced("db.dao")
+    async def bulk_increment_view_count(
+        cls,
+        session: AsyncSession,
+        *,
+        amounts: dict[str, int],
+    ) -> list[TranslationModel]:
+        """Атомарно увеличивает счетчики просмотров нескольких переводов одним запросом.
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy
+            amounts: Величины увеличения по нормализованному исходному тексту
+
+        Returns:
+            Список обновленных переводов
+        """
+        return await cls.increment_many(
+            session,
+            key="source_hash",
+            column="view_count",
+            amounts={
+                get_source_hash(source): amount for source, amount in amounts.items()
+            },
+        )
+
+    @classmethod
+    @traced("db.dao")
+    async def add_or_increment_view_count(
+        cls,
+        session: AsyncSession,
+        obj_in: TranslationCreateSchema,
+    ) -> TranslationModel | None:
+        """Добавляет перевод или увеличивает счетчик просмотров существующего.
+
+        Если перевод того же текста уже добавлен (например, другим процессом бота),
+        сохраняется существующий перевод, а его счетчик просмотров увеличивается.
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy
+            obj_in: Данные нового перевода
+
+        Returns:
+            Добавленный или обновленный перевод
+        """
+        return await cls.upsert(
+            session,
+            obj_in,
+            index_elements=["source_hash"],
+            set_={
+                "view_count": TranslationModel.view_count + 1,
+                # onupdate не применяется к ON CONFLICT DO UPDATE
+                "updated_at": CURRENT_TIMESTAMP,
+            },
+        )
+
+    @classmethod
+    @traced("db.dao")
+    async def add_many_or_increment_view_count(
+        cls,
+        session: AsyncSession,
+        objs_in: list[TranslationCreateSchema],
+    ) -> list[TranslationModel]:
+        """Добавляет несколько переводов одним запросом.
+
+        Для уже существующих переводов сохраняется существующий текст перевода,
+        а счетчик просмотров увеличивается.
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy
+            objs_in: Данные новых переводов с разными исходными текстами
+
+        Returns:
+            Список добавленных или обновленных переводов
+        """
+        return await cls.upsert_many(
+            session,
+            objs_in,
+            index_elements=["source_hash"],
+            set_={
+                "view_count": TranslationModel.view_count + 1,
+                # onupdate не применяется к ON CONFLICT DO UPDATE
+                "updated_at": CURRENT_TIMESTAMP,
+            },
+        )
@@ -1,13 +1,35 @@
 from aiogram import Bot, Router
 from aiogram.enums import ChatAction
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.filters import Command, CommandStart
-from aiogram.types import Message
+from aiogram.types import (
+    CallbackQuery,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    Message,
+)
 from loguru import logger
 
+from app.callbacks import DetailedTranslationCallback, TranslateExactCallback
 from app.config import settings
 from app.db import SessionLocal
-from app.integrations.chatgpt import get_chatgpt_client
-from app.services.translation import get_stats_text, get_translation
+from app.integrations.chatgpt import (
+    ChatGPTCircuitOpenError,
+    ChatGPTError,
+    ChatGPTRateLimitError,
+    ChatGPTTimeoutError,
+    get_chatgpt_client,
+)
+from app.schemas import TranslationSuggestionSchema
+from app.services.input_gate import REJECT_MESSAGES, check_input, split_lines
+from app.services.translation import (
+    get_detailed_translation,
+    get_stats_text,
+    get_translation,
+    get_translations_batch,
+)
+from app.services.translation_renderer import render_translation
+from app.utils.telegram import ProgressiveMessage, join_message_parts
 
 router = Router()
 chatgpt_client = get_chatgpt_client()
@@ -36,6 +58,7 @@ async def start_command_handler(message: Message) -> None:
         f"👋 Привет, {username}!\n\n"
         "Этот бот умеет следующее:\n"
         "• Переводить слова и фразы на русский язык\n"
+        "• Переводить списки слов (по одному слову или фразе в строке)\n"
         "Используйте /help для получения списка всех команд."
     )
 
@@ -97,7 +120,10 @@ async def stats_command_handler(message: Message) -> None:
 
     try:
         async with SessionLocal() as session:
-            stats_text = await get_stats_text(session=session)
+            stats_text = await get_stats_text(
+                session=session,
+                chatgpt_client=chatgpt_client,
+            )
     except Exception as e:
         logger.error(f"Ошибка при получении статистики: {e}")
         await message.answer(f"❌ Произошла ошибка при получении статистики: {e}")
@@ -138,32 +164,315 @@ async def message_handler(message: Message, bot: Bot) -> None:
         )
         return
 
+    # Отсекаем неподходящий текст до обращения к БД и ChatGPT
+    reject_reason = check_input(message.text)
+    if reject_reason is not None:
+        logger.debug(f"Сообщение отклонено без перевода: {reject_reason}")
+        await message.answer(REJECT_MESSAGES[reject_reason])
+        return
+
+    # Список слов по одному в строке переводится одним пакетом
+    batch_sources = split_lines(message.text)
+    if len(batch_sources) > 1:
+        await _send_translations_batch(
+            message=message,
+            bot=bot,
+            sources=batch_sources,
+            user_id=user_id,
+        )
+        return
+
+    await _send_translation(
+        message=message,
+        bot=bot,
+        source=message.text,
+        user_id=user_id,
+    )
+
+
+# MARK: Translate Exact
+@router.callback_query(TranslateExactCallback.filter())
+async def translate_exact_callback_handler(
+    callback: CallbackQuery,
+    callback_data: TranslateExactCallback,
+    bot: Bot,
+) -> None:
+    """
+    Обработчик кнопок с похожим словом и переводом текста как есть.
+
+    Переводит текст кнопки как есть, без подбора других форм и похожих слов.
+    """
+    user_id = callback.from_user.id
+    logger.debug(f"Получен запрос перевода как есть от пользователя {user_id}")
+
+    if str(user_id) not in settings.ALLOWED_USERS:
+        logger.warning(f"Пользователь {user_id} не имеет доступа к боту")
+        await callback.answer("❌ У вас нет доступа к этому боту.")
+        return
+
+    await callback.answer()
+
+    if not isinstance(callback.message, Message):
+        logger.error("Сообщение с кнопкой недоступно")
+        return
+
+    await _send_translation(
+        message=callback.message,
+        bot=bot,
+        source=callback_data.source,
+        allow_approximate=False,
+        user_id=user_id,
+    )
+
+
+# MARK: Detailed Translation
+@router.callback_query(DetailedTranslationCallback.filter())
+async def detailed_translation_callback_handler(
+    callback: CallbackQuery,
+    callback_data: DetailedTranslationCallback,
+    bot: Bot,
+) -> None:
+    """
+    Обработчик кнопки "Подробнее".
+
+    Заменяет краткий перевод в сообщении подробной статьёй со значениями
+    и примерами. Статья запрашивается у ChatGPT только при первом нажатии.
+    """
+    user_id = callback.from_user.id
+    logger.debug(f"Получен запрос подробной статьи от пользователя {user_id}")
+
+    if str(user_id) not in settings.ALLOWED_USERS:
+        logger.warning(f"Пользователь {user_id} не имеет доступа к боту")
+        await callback.answer("❌ У вас нет доступа к этому боту.")
+        return
+
+    await callback.answer()
+
+    if not isinstance(callback.message, Message):
+        logger.error("Сообщение с кнопкой недоступно")
+        return
+
+    await bot.send_chat_action(
+        chat_id=callback.message.chat.id,
+        action=ChatAction.TYPING,
+    )
+
+    try:
+        async with SessionLocal() as session:
+            translation = await get_detailed_translation(
+                session=session,
+                chatgpt_client=chatgpt_client,
+                translation_id=callback_data.translation_id,
+                model=settings.OPENAI_MODEL_NAME,
+                user_id=user_id,
+            )
+    except Exception as e:
+        logger.error(f"Ошибка при получении подробной статьи: {e}")
+        await callback.message.answer(_get_error_message(e))
+        return
+
+    if translation is None:
+        await callback.message.answer("❌ Перевод не найден.")
+        return
+
+    answer_text = render_translation(translation)
+    if translation.model is not None:
+        answer_text += f"\n\n🧠 _Модель: {translation.model}_"
+
+    try:
+        await callback.message.edit_text(answer_text, parse_mode="Markdown")
+    except TelegramBadRequest as e:
+        logger.warning(f"Не удалось отправить сообщение с разметкой: {e}")
+        await callback.message.edit_text(answer_text, parse_mode=None)
+
+
+async def _send_translation(
+    *,
+    message: Message,
+    bot: Bot,
+    source: str,
+    allow_approximate: bool = True,
+    user_id: int | None = None,
+) -> None:
+    """
+    Получает перевод текста и отправляет его в чат сообщения.
+
+    Args:
+        message: Сообщение, в чат которого отправляется перевод
+        bot: Экземпляр бота
+        source: Текст для перевода
+        allow_approximate: Разрешить перевод другой формы слова или похожего слова
+        user_id: Пользователь, запросивший перевод
+    """
     # Показать индикатор "Печатает..."
     await bot.send_chat_action(chat_id=message.chat.id, action=ChatAction.TYPING)
 
+    # Перевод от ChatGPT показываем по мере генерации, редактируя одно сообщение
+    progressive_message = ProgressiveMessage(
+        message=message,
+        min_interval=settings.TELEGRAM_EDIT_INTERVAL,
+    )
+
     try:
         async with SessionLocal() as session:
             translation = await get_translation(
                 session=session,
                 chatgpt_client=chatgpt_client,
-                source=message.text,
+                source=source,
                 model=settings.OPENAI_MODEL_NAME,
+                on_partial=(
+                    progressive_message.update if settings.OPENAI_STREAM else None
+                ),
+                allow_approximate=allow_approximate,
+                user_id=user_id,
             )
     except Exception as e:
         logger.error(f"Ошибка при получении перевода: {e}")
-        await message.answer(f"❌ Произошла ошибка при получении перевода: {e}")
+        # Оборванный на середине перевод заменяется сообщением об ошибке
+        await progressive_message.fail(_get_error_message(e))
         return
 
-    if translation is not None:
-        answer_text = translation.translation
+    if isinstance(translation, TranslationSuggestionSchema):
+        # Перевод не запрашивался: пользователь выбирает похожее слово
+        # или перевод текста как есть
+        await message.answer(
+            f"🔎 Возможно, вы имели в виду «{translation.suggested_source}»?",
+            reply_markup=InlineKeyboardMarkup(
+                inline_keyboard=[
+                    [
+                        InlineKeyboardButton(
+                            text=f"✅ «{translation.suggested_source}»",
+                            callback_data=TranslateExactCallback(
+                                source=translation.suggested_source
+                            ).pack(),
+                        )
+                    ],
+                    [
+                        InlineKeyboardButton(
+                            text="✍️ Перевести как написано",
+                            callback_data=TranslateExactCallback(
+                                source=translation.requested_source
+                            ).pack(),
+                        )
+                    ],
+                ]
+            ),
+        )
+    elif translation is not None:
+        answer_text = render_translation(translation)
+
+        buttons: list[list[InlineKeyboardButton]] = []
+        if translation.is_brief:
+            buttons.append(
+                [
+                    InlineKeyboardButton(
+                        text="📖 Подробнее",
+                        callback_data=DetailedTranslationCallback(
+                            translation_id=translation.id
+                        ).pack(),
+                    )
+                ]
+            )
+        if translation.requested_source is not None:
+            answer_text = (
+                f"ℹ️ _«{translation.requested_source}» — форма слова "
+                f"«{translation.source}»_\n\n{answer_text}"
+            )
+            # Правила лемматизации могут ошибиться (например, принять
+            # существительное за форму глагола), поэтому оставляем возможность
+            # перевести текст запроса как есть
+            try:
+                callback_data = TranslateExactCallback(
+                    source=translation.requested_source
+                ).pack()
+            except ValueError:
+                logger.warning(
+                    "Текст запроса не помещается в callback-данные: "
+                    f"{translation.requested_source}"
+                )
+            else:
+                buttons.append(
+                    [
+                        InlineKeyboardButton(
+                            text="✍️ Перевести как написано",
+                            callback_data=callback_data,
+                        )
+                    ]
+                )
 
         if translation.view_count > 1:
             answer_text += f"\n\n👁️ _Количество просмотров: {translation.view_count}_"
         else:
-            # Название модели выводим только при первом просмотре, т.к. текст точно был
-            # переведен именно текущей моделью из конфига приложения
-            answer_text += f"\n\n🧠 _Модель: {settings.OPENAI_MODEL_NAME}_"
-
-        await message.answer(answer_text, parse_mode="Markdown")
+            # Название модели выводим только при первом просмотре: модель из ответа
+            # API, т.к. бэкенд может заменить модель из конфига приложения
+            model_name = translation.model or settings.OPENAI_MODEL_NAME
+            answer_text += f"\n\n🧠 _Модель: {model_name}_"
+
+        await progressive_message.finish(
+            answer_text,
+            parse_mode="Markdown",
+            reply_markup=(
+                InlineKeyboardMarkup(inline_keyboard=buttons) if buttons else None
+            ),
+        )
     else:
+        await progressive_message.fail("❌ Не удалось получить перевод.")
+
+
+async def _send_translations_batch(
+    *,
+    message: Message,
+    bot: Bot,
+    sources: list[str],
+    user_id: int | None = None,
+) -> None:
+    """
+    Получает переводы списка слов и отправляет их в чат сообщения.
+
+    Args:
+        message: Сообщение, в чат которого отправляются переводы
+        bot: Экземпляр бота
+        sources: Слова или фразы для перевода
+        user_id: Пользователь, запросивший перевод
+    """
+    await bot.send_chat_action(chat_id=message.chat.id, action=ChatAction.TYPING)
+
+    try:
+        async with SessionLocal() as session:
+            translations = await get_translations_batch(
+                session=session,
+                chatgpt_client=chatgpt_client,
+                sources=sources,
+                model=settings.OPENAI_MODEL_NAME,
+                user_id=user_id,
+            )
+    except Exception as e:
+        logger.error(f"Ошибка при получении пакета переводов: {e}")
+        await message.answer(_get_error_message(e))
+        return
+
+    if not translations:
         await message.answer("❌ Не удалось получить перевод.")
+        return
+
+    for answer_text in join_message_parts(
+        [render_translation(translation) for translation in translations],
+        separator="\n\n----\n\n",
+    ):
+        try:
+            await message.answer(answer_text, parse_mode="Markdown")
+        except TelegramBadRequest as e:
+            # Перевод может содержать символы, ломающие разметку Markdown
+            logger.warning(f"Не удалось отправить сообщение с разметкой: {e}")
+            await message.answer(answer_text, parse_mode=None)
+
+
+def _get_error_message(error: Exception) -> str:
+    """Возвращает понятное пользователю сообщение об ошибке получения перевода."""
+    if isinstance(error, ChatGPTCircuitOpenError | ChatGPTRateLimitError):
+        return "⏳ Сервис перевода сейчас перегружен. Попробуйте ещё раз через минуту."
+    if isinstance(error, ChatGPTTimeoutError):
+        return "⌛ Сервис перевода не ответил вовремя. Попробуйте ещё раз."
+    if isinstance(error, ChatGPTError):
+        return "❌ Сервис перевода временно недоступен. Попробуйте позже."
+    return "❌ Произошла ошибка при получении перевода. Попробуйте позже."
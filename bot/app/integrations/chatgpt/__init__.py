@@ -1,23 +1,104 @@
-from app.config import settings
+from functools import cache
+
+import httpx
+
+from app.config import OpenAIBackendSettings, settings
+from app.integrations.chatgpt.backend import ChatGPTBackend
 from app.integrations.chatgpt.client import ChatGPTClient
 from app.integrations.chatgpt.exceptions import (
+    ChatGPTCircuitOpenError,
     ChatGPTError,
     ChatGPTHTTPError,
+    ChatGPTRateLimitError,
+    ChatGPTTimeoutError,
     ChatGPTValidationError,
 )
 
 __all__ = [
+    "ChatGPTBackend",
+    "ChatGPTCircuitOpenError",
     "ChatGPTClient",
     "ChatGPTError",
     "ChatGPTHTTPError",
+    "ChatGPTRateLimitError",
+    "ChatGPTTimeoutError",
     "ChatGPTValidationError",
+    "create_chatgpt_client",
     "get_chatgpt_client",
 ]
 
 
+@cache
 def get_chatgpt_client() -> ChatGPTClient:
-    """Фабрика для создания экземпляра ChatGPTClient."""
+    """
+    Фабрика для создания экземпляра ChatGPTClient.
+
+    Возвращает один и тот же экземпляр на всё приложение, чтобы все запросы
+    использовали общий пул соединений.
+    """
+    return create_chatgpt_client()
+
+
+def create_chatgpt_client(*, api_base_url: str | None = None) -> ChatGPTClient:
+    """
+    Создаёт новый экземпляр ChatGPTClient с настройками из конфигурации.
+
+    Args:
+        api_base_url: Адрес API вместо OPENAI_API_BASE_URL и OPENAI_BACKENDS
+            (например, локальный тестовый сервер)
+    """
     return ChatGPTClient(
-        api_key=settings.OPENAI_API_KEY,
-        api_base_url=settings.OPENAI_API_BASE_URL,
+        backends=_build_backends(api_base_url=api_base_url),
+        timeout=_build_timeout(read=settings.OPENAI_HTTP_READ_TIMEOUT),
+        stream_timeout=_build_timeout(read=settings.OPENAI_HTTP_STREAM_READ_TIMEOUT),
+        batch_timeout=_build_timeout(read=settings.OPENAI_HTTP_BATCH_READ_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=settings.OPENAI_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.OPENAI_HTTP_KEEPALIVE_EXPIRY,
+        ),
+        http2=settings.OPENAI_HTTP2,
+        max_retries=settings.OPENAI_MAX_RETRIES,
+        retry_base_delay=settings.OPENAI_RETRY_BASE_DELAY,
+        retry_max_delay=settings.OPENAI_RETRY_MAX_DELAY,
+        hedge_percentile=(
+            settings.OPENAI_HEDGE_PERCENTILE if settings.OPENAI_HEDGE_ENABLED else None
+        ),
+        hedge_max_ratio=settings.OPENAI_HEDGE_MAX_RATIO,
     )
+
+
+def _build_timeout(*, read: float) -> httpx.Timeout:
+    """Собирает таймауты HTTP-запроса с заданным таймаутом чтения."""
+    return httpx.Timeout(
+        connect=settings.OPENAI_HTTP_CONNECT_TIMEOUT,
+        read=read,
+        write=settings.OPENAI_HTTP_WRITE_TIMEOUT,
+        pool=settings.OPENAI_HTTP_POOL_TIMEOUT,
+    )
+
+
+def _build_backends(*, api_base_url: str | None = None) -> list[ChatGPTBackend]:
+    """Собирает список бэкендов ChatGPT API из настроек."""
+    backend_settings = settings.OPENAI_BACKENDS
+    if api_base_url is not None or not backend_settings:
+        backend_settings = [
+            OpenAIBackendSettings(
+                name="default",
+                base_url=api_base_url
+                or settings.OPENAI_API_BASE_URL
+                or "https://api.openai.com/v1",
+            )
+        ]
+
+    return [
+        ChatGPTBackend(
+            name=backend.name,
+            base_url=backend.base_url,
+            api_key=backend.api_key or settings.OPENAI_API_KEY,
+            model=backend.model,
+            failure_threshold=settings.OPENAI_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.OPENAI_CIRCUIT_RESET_TIMEOUT,
+        )
+        for backend in backend_settings
+    ]
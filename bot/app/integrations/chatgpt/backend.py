@@ -0,0 +1,90 @@
+"""Бэкенд ChatGPT API: адрес, ключ и модель, а также метрики для маршрутизации."""
+
+import time
+
+from app.utils import CircuitBreaker
+
+# Вес нового измерения в экспоненциальном скользящем среднем (EWMA)
+EWMA_ALPHA = 0.2
+
+# Через сколько секунд без запросов бэкенд снова пробуется независимо от
+# измеренной задержки: иначе медленный когда-то бэкенд не получил бы запросов
+# и его задержка не обновилась бы
+STALE_AFTER = 60.0
+
+
+class ChatGPTBackend:
+    """
+    Один бэкенд (провайдер или прокси) ChatGPT API.
+
+    Хранит экспоненциальные скользящие средние времени ответа и доли ошибок,
+    по которым клиент выбирает бэкенд для запроса, и автоматический
+    выключатель, который исключает бэкенд из маршрутизации после серии сбоев
+    и возвращает его после успешного пробного запроса.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        base_url: str,
+        api_key: str,
+        model: str | None = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.chat_url = self.base_url + "/chat/completions"
+        self.api_key = api_key
+        # Модель бэкенда заменяет модель из запроса, если задана
+        self.model = model
+        self.circuit_breaker = CircuitBreaker(
+            name=name,
+            failure_threshold=failure_threshold,
+            reset_timeout=reset_timeout,
+        )
+
+        self.latency: float | None = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.in_flight = 0
+        self._last_used_at = 0.0
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """Заголовки авторизации для запросов к бэкенду."""
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    def score(self) -> float:
+        """
+        Возвращает оценку ожидаемого времени ответа: чем меньше, тем лучше.
+
+        Задержка умножается на число выполняющихся запросов, чтобы нагрузка
+        распределялась между близкими по скорости бэкендами, и делится на долю
+        успешных ответов. Бэкенд без свежих измерений получает нулевую оценку,
+        чтобы его задержка была измерена.
+        """
+        if self.latency is None or time.monotonic() - self._last_used_at > STALE_AFTER:
+            return 0.0
+        return self.latency * (1 + self.in_flight) / max(1.0 - self.error_rate, 0.05)
+
+    def record_success(self, latency: float) -> None:
+        """Учитывает успешный ответ и время ответа в секундах."""
+        self.requests += 1
+        self._last_used_at = time.monotonic()
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += EWMA_ALPHA * (latency - self.latency)
+        self.error_rate -= EWMA_ALPHA * self.error_rate
+        self.circuit_breaker.record_success()
+
+    def record_failure(self) -> None:
+        """Учитывает сбой запроса."""
+        self.requests += 1
+        self.failures += 1
+        self._last_used_at = time.monotonic()
+        self.error_rate += EWMA_ALPHA * (1.0 - self.error_rate)
+        self.circuit_breaker.record_failure()
@@ -1,15 +1,359 @@
 """Клиент для работы с ChatGPT API."""
 
+import asyncio
+import importlib.util
+import json
+import math
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from typing import Any
+
 import httpx
+import sentry_sdk
 from loguru import logger
 from pydantic import ValidationError
 
+from app.integrations.chatgpt.backend import ChatGPTBackend
 from app.integrations.chatgpt.exceptions import (
-    ChatGPTError,
+    BACKEND_FAULT_STATUS_CODES,
+    ChatGPTCircuitOpenError,
     ChatGPTHTTPError,
+    ChatGPTRateLimitError,
+    ChatGPTTimeoutError,
     ChatGPTValidationError,
 )
-from app.integrations.chatgpt.schemas import ChatCompletionResponse
+from app.integrations.chatgpt.schemas import (
+    BatchTranslationResponse,
+    BatchTranslationResult,
+    ChatCompletionChunk,
+    ChatCompletionResponse,
+    CompletionResult,
+    TranslationArticle,
+    TranslationResult,
+    Usage,
+)
+from app.metrics import LLM_ERRORS, LLM_REQUEST_DURATION, LLM_TOKENS
+from app.utils import traced
+
+# Системное сообщение для перевода. Не зависит от входного текста, поэтому
+# собирается один раз при импорте модуля; переменная часть (язык и текст)
+# находится только в сообщении пользователя. Кэш промптов OpenAI применяется
+# только к запросам от 1024 токенов, а системные сообщения перевода короче,
+# поэтому токенов из кэша в запросах перевода не ожидается.
+TRANSLATION_SYSTEM_MESSAGE = (
+    "You are a professional translator. "
+    "Translate the user's text as in examples below. Include usage examples and various meanings."
+    "Return the translated text with Markdown markup, without any additional comments, "
+    "greetings, or explanations.\n\n"
+)
+TRANSLATION_SYSTEM_MESSAGE += """
+Example for word:
+
+## Deliberate – решительный
+
+"Deliberate" на русский язык может переводиться в зависимости от контекста:
+
+1. **Решительный** (в контексте решительного решения или действия).  
+   Пример: *deliberate decision* — *решительное решение*.
+
+2. **Усмотрительный** (в контексте тщательного рассмотрения).  
+   Пример: *deliberate act* — *усмотрительное действие*.
+
+3. **Обдуманный** (если речь идёт о тщательном планировании).  
+   Пример: *deliberate plan* — *обдуманный план*.
+
+Если контекст не указан, наиболее распространённый перевод — **"решительный"**.
+
+----
+
+Example for a phrase:
+
+## Case study – тематическое исследование
+
+"Case study" на русский язык переводится как:
+
+1.  **Тематическое исследование** (детальный анализ конкретного примера или ситуации).
+    Пример: *a case study of a successful company* — *тематическое исследование успешной компании*.
+
+2.  **Анализ конкретного случая** (более дословный перевод).
+    Пример: *The report includes a case study on the project's failure.* — *В отчет включен анализ
+    конкретного случая неудачи проекта*.
+
+Наиболее точный перевод — **"тематическое исследование"**.
+"""
+
+# Компактное системное сообщение для отдельных слов: формат ответа описан
+# словами, без примеров, поэтому запрос в несколько раз короче
+TRANSLATION_COMPACT_SYSTEM_MESSAGE = (
+    "You are a professional translator. "
+    "Translate the user's English word and return a short Markdown article "
+    "in the target language, without any additional comments, greetings, "
+    'or explanations: a heading "## <Word> – <main translation>", '
+    "up to three numbered meanings with the translation in bold and a usage "
+    'example ("Пример: *english example* — *translated example*"), and a final '
+    "line with the most common translation in bold."
+)
+
+
+# Системное сообщение для перевода в виде статьи в JSON. Разметка для Telegram
+# добавляется при выводе, поэтому ответ короче перевода в Markdown.
+TRANSLATION_ARTICLE_SYSTEM_MESSAGE = (
+    "You are a professional translator. "
+    "Translate the user's English text and reply with a JSON object of the form "
+    '{"headword": "<text as given>", "senses": [{"translation": "<translation>", '
+    '"note": "<when this meaning is used>", "examples": [{"source": '
+    '"<short English example>", "translation": "<translated example>"}]}], '
+    '"preferred": "<most common translation>"}. '
+    "For a word or phrase give up to three senses, the most common first, "
+    "with one example each. For a sentence give a single sense with the "
+    "translation and no examples. Write translations and notes in the target "
+    "language, as plain text without Markdown. "
+    "Do not add any other keys or comments."
+)
+
+# Системное сообщение для краткого перевода: только основные переводы без
+# пояснений и примеров. Подробная статья запрашивается отдельно, если она нужна.
+TRANSLATION_BRIEF_SYSTEM_MESSAGE = (
+    "You are a professional translator. "
+    "Translate the user's English text and reply with a JSON object of the form "
+    '{"headword": "<text as given>", "senses": [{"translation": "<translation>"}], '
+    '"preferred": "<most common translation>"}. '
+    "List up to three most common translations as separate senses, without "
+    "notes or examples. Write translations in the target language, as plain "
+    "text without Markdown. Do not add any other keys or comments."
+)
+
+# Системное сообщение для пакетного перевода списка слов. Ответ запрашивается
+# в виде JSON, чтобы разобрать перевод каждого элемента отдельно.
+BATCH_TRANSLATION_SYSTEM_MESSAGE = (
+    "You are a professional translator. "
+    "The user sends a JSON object with a list of English words or phrases. "
+    "Translate each item and reply with a JSON object of the form "
+    '{"items": [{"source": "<item exactly as given>", "translation": "<text>"}]}, '
+    "keeping the order of the input items. "
+    "Each translation is a short Markdown article: a heading "
+    '"## <Item> – <main translation>" followed by up to three numbered meanings '
+    "with a short usage example each. "
+    "Do not add any other keys or comments."
+)
+
+# Ограничение длины ответа на перевод одного текста
+TRANSLATION_MAX_TOKENS = 1000
+
+# Максимальное количество слов во фразе: более длинные тексты переводятся
+# как предложения
+PHRASE_MAX_WORDS = 4
+
+# Количество последних времён ответа на перевод для расчёта порога дублирования
+TRANSLATION_LATENCY_SAMPLES = 200
+
+# Минимальное количество измерений, после которого включается дублирование
+HEDGE_MIN_SAMPLES = 20
+
+# Ограничение длины ответа на один элемент пакетного перевода
+BATCH_MAX_TOKENS_PER_ITEM = 200
+
+
+@dataclass(frozen=True)
+class TranslationPrompt:
+    """Вариант запроса перевода в зависимости от длины исходного текста."""
+
+    # Название варианта для логов
+    name: str
+    system_message: str
+    # Ограничение длины ответа: статья о слове короче перевода предложения
+    max_tokens: int
+    # Краткий перевод без пояснений и примеров
+    brief: bool = False
+
+
+WORD_TRANSLATION_PROMPT = TranslationPrompt(
+    name="word",
+    system_message=TRANSLATION_COMPACT_SYSTEM_MESSAGE,
+    max_tokens=400,
+)
+PHRASE_TRANSLATION_PROMPT = TranslationPrompt(
+    name="phrase",
+    system_message=TRANSLATION_SYSTEM_MESSAGE,
+    max_tokens=600,
+)
+SENTENCE_TRANSLATION_PROMPT = TranslationPrompt(
+    name="sentence",
+    system_message=TRANSLATION_SYSTEM_MESSAGE,
+    max_tokens=TRANSLATION_MAX_TOKENS,
+)
+
+
+WORD_ARTICLE_PROMPT = TranslationPrompt(
+    name="word-article",
+    system_message=TRANSLATION_ARTICLE_SYSTEM_MESSAGE,
+    max_tokens=WORD_TRANSLATION_PROMPT.max_tokens,
+)
+PHRASE_ARTICLE_PROMPT = TranslationPrompt(
+    name="phrase-article",
+    system_message=TRANSLATION_ARTICLE_SYSTEM_MESSAGE,
+    max_tokens=PHRASE_TRANSLATION_PROMPT.max_tokens,
+)
+SENTENCE_ARTICLE_PROMPT = TranslationPrompt(
+    name="sentence-article",
+    system_message=TRANSLATION_ARTICLE_SYSTEM_MESSAGE,
+    max_tokens=SENTENCE_TRANSLATION_PROMPT.max_tokens,
+)
+
+
+WORD_BRIEF_PROMPT = TranslationPrompt(
+    name="word-brief",
+    system_message=TRANSLATION_BRIEF_SYSTEM_MESSAGE,
+    max_tokens=100,
+    brief=True,
+)
+PHRASE_BRIEF_PROMPT = TranslationPrompt(
+    name="phrase-brief",
+    system_message=TRANSLATION_BRIEF_SYSTEM_MESSAGE,
+    max_tokens=150,
+    brief=True,
+)
+
+
+def select_translation_prompt(
+    text: str,
+    *,
+    article: bool = False,
+    brief: bool = False,
+) -> TranslationPrompt:
+    """
+    Выбирает вариант запроса перевода по количеству слов в тексте.
+
+    Args:
+        text: Текст для перевода
+        article: Запросить статью в JSON вместо текста в Markdown
+        brief: Запросить краткую статью. Предложения всегда переводятся
+            одним вариантом перевода, поэтому краткой статьи для них нет
+    """
+    words_count = len(text.split())
+    if words_count <= 1:
+        if article:
+            return WORD_BRIEF_PROMPT if brief else WORD_ARTICLE_PROMPT
+        return WORD_TRANSLATION_PROMPT
+    if words_count <= PHRASE_MAX_WORDS:
+        if article:
+            return PHRASE_BRIEF_PROMPT if brief else PHRASE_ARTICLE_PROMPT
+        return PHRASE_TRANSLATION_PROMPT
+    return SENTENCE_ARTICLE_PROMPT if article else SENTENCE_TRANSLATION_PROMPT
+
+
+def estimate_tokens(text: str) -> int:
+    """Грубо оценивает количество токенов в тексте (около 4 символов на токен)."""
+    return len(text) // 4 + 1
+
+
+def _build_translation_prompt(text: str, target_language: str) -> str:
+    """Формирует пользовательский запрос на перевод текста."""
+    return f"Translate the following text to {target_language}:\n\n---\n{text}\n---"
+
+
+def _build_batch_translation_prompt(texts: list[str], target_language: str) -> str:
+    """Формирует пользовательский запрос на пакетный перевод списка текстов."""
+    return json.dumps(
+        {"target_language": target_language, "items": texts},
+        ensure_ascii=False,
+    )
+
+
+def _parse_chat_response(content: bytes) -> ChatCompletionResponse:
+    """
+    Разбирает тело ответа Chat Completions API.
+
+    JSON разбирается и проверяется pydantic за один проход прямо из байтов
+    ответа, без промежуточного словаря, и только в объёме полей схемы.
+
+    Raises:
+        ChatGPTValidationError: Если тело ответа не JSON или не соответствует схеме
+    """
+    try:
+        return ChatCompletionResponse.model_validate_json(content)
+    except ValidationError as e:
+        logger.error(f"Ошибка валидации ответа от ChatGPT: {e}")
+        raise ChatGPTValidationError(f"Validation error: {str(e)}") from e
+
+
+def _warn_if_truncated(
+    completion: CompletionResult,
+    translation_prompt: TranslationPrompt,
+) -> None:
+    """Предупреждает, если перевод обрезан ограничением длины ответа."""
+    if completion.finish_reason == "length":
+        logger.warning(
+            f"Перевод ({translation_prompt.name}) обрезан на "
+            f"{translation_prompt.max_tokens} токенах ответа"
+        )
+
+
+def _parse_retry_after(headers: httpx.Headers) -> float | None:
+    """
+    Возвращает задержку из заголовков retry-after-ms или Retry-After в секундах.
+
+    Retry-After может содержать количество секунд или HTTP-дату.
+    """
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms is not None:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after is None:
+        return None
+
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+        if retry_at.tzinfo is None:
+            # Дата с зоной "-0000" разбирается без часового пояса, но задана в UTC
+            retry_at = retry_at.replace(tzinfo=UTC)
+        return float(max(0.0, (retry_at - datetime.now(UTC)).total_seconds()))
+    except (TypeError, ValueError):
+        return None
+
+
+def _get_error_label(error: ChatGPTHTTPError) -> str:
+    """Возвращает вид ошибки для метрик: код ответа, timeout или network."""
+    if isinstance(error, ChatGPTTimeoutError):
+        return "timeout"
+    if error.status_code is None:
+        return "network"
+    return str(error.status_code)
+
+
+async def _build_status_error(response: httpx.Response) -> ChatGPTHTTPError:
+    """Формирует исключение для ответа API с кодом ошибки."""
+    # Для потоковых ответов тело ещё не прочитано
+    await response.aread()
+    await response.aclose()
+
+    message = f"HTTP {response.status_code}: {response.text[:500]}"
+    retry_after = _parse_retry_after(response.headers)
+    if response.status_code == 429:
+        return ChatGPTRateLimitError(
+            message,
+            status_code=response.status_code,
+            retry_after=retry_after,
+        )
+    return ChatGPTHTTPError(
+        message,
+        status_code=response.status_code,
+        retry_after=retry_after,
+    )
 
 
 class ChatGPTClient:
@@ -17,15 +361,176 @@ class ChatGPTClient:
 
     def __init__(
         self,
-        api_key: str,
+        api_key: str | None = None,
         api_base_url: str | None = None,
+        backends: list[ChatGPTBackend] | None = None,
+        timeout: httpx.Timeout | None = None,
+        stream_timeout: httpx.Timeout | None = None,
+        batch_timeout: httpx.Timeout | None = None,
+        limits: httpx.Limits | None = None,
+        http2: bool = False,
+        max_retries: int = 2,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 8.0,
+        circuit_failure_threshold: int = 5,
+        circuit_reset_timeout: float = 30.0,
+        hedge_percentile: float | None = None,
+        hedge_max_ratio: float = 0.1,
     ):
-        self.api_key = api_key
-        self.base_url = (
-            api_base_url if api_base_url is not None else "https://api.openai.com/v1"
+        if backends is None:
+            if api_key is None:
+                raise ValueError("Нужно указать api_key или backends")
+            backends = [
+                ChatGPTBackend(
+                    name="default",
+                    base_url=api_base_url or "https://api.openai.com/v1",
+                    api_key=api_key,
+                    failure_threshold=circuit_failure_threshold,
+                    reset_timeout=circuit_reset_timeout,
+                )
+            ]
+        if not backends:
+            raise ValueError("Список бэкендов ChatGPT пуст")
+        # Запросы распределяются между бэкендами по задержке и доле ошибок
+        self.backends = backends
+
+        self.timeout = timeout if timeout is not None else httpx.Timeout(30.0)
+        # Для потока read-таймаут ограничивает паузу между фрагментами, а пакетный
+        # перевод генерирует длинный ответ целиком
+        self.stream_timeout = (
+            stream_timeout if stream_timeout is not None else self.timeout
+        )
+        self.batch_timeout = (
+            batch_timeout if batch_timeout is not None else self.timeout
+        )
+        self.limits = limits if limits is not None else httpx.Limits()
+        self.http2 = http2
+
+        # Повторы запросов при временных сбоях
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+
+        # Дублирующие (hedged) запросы перевода: если ответ не получен за время
+        # hedge_percentile-го перцентиля недавних ответов, сервис перевода
+        # отправляет второй запрос, но не больше hedge_max_ratio от основных
+        # запросов. Здесь хранятся порог и счетчики, сами запросы отправляются
+        # через планировщик сервиса
+        self.hedge_percentile = hedge_percentile
+        self.hedge_max_ratio = hedge_max_ratio
+        self.translation_requests = 0
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        self._translation_latencies: deque[float] = deque(
+            maxlen=TRANSLATION_LATENCY_SAMPLES
+        )
+
+        # Общий пул соединений, живёт всё время работы бота
+        self._http_client: httpx.AsyncClient | None = None
+
+    async def start(self) -> None:
+        """
+        Создаёт общий HTTP-клиент с пулом соединений.
+
+        Вызывается при старте бота. Повторный вызов ничего не делает.
+        """
+        if self._http_client is not None and not self._http_client.is_closed:
+            return
+
+        http2 = self.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("Пакет h2 не установлен, HTTP/2 для ChatGPT отключён")
+            http2 = False
+
+        self._http_client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=http2,
+        )
+        logger.debug(
+            f"Создан HTTP-клиент ChatGPT (http2={http2}, "
+            f"max_connections={self.limits.max_connections})"
+        )
+
+    async def close(self) -> None:
+        """Закрывает общий HTTP-клиент и все соединения пула."""
+        if self._http_client is None:
+            return
+
+        await self._http_client.aclose()
+        self._http_client = None
+        logger.debug("HTTP-клиент ChatGPT закрыт")
+
+    async def _get_http_client(self) -> httpx.AsyncClient:
+        """Возвращает общий HTTP-клиент, создавая его при первом обращении."""
+        if self._http_client is None or self._http_client.is_closed:
+            await self.start()
+
+        assert self._http_client is not None
+        return self._http_client
+
+    def _build_request_data(
+        self,
+        *,
+        prompt: str,
+        model: str,
+        system_message: str,
+        temperature: float,
+        max_tokens: int,
+        stream: bool = False,
+        response_format: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Формирует тело запроса к Chat Completions API."""
+        data: dict[str, Any] = {
+            "model": model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": system_message,
+                },
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        if stream:
+            data["stream"] = True
+            # Расход токенов приходит отдельным последним фрагментом
+            data["stream_options"] = {"include_usage": True}
+        if response_format is not None:
+            data["response_format"] = response_format
+        return data
+
+    def _record_usage(self, usage: Usage | None, *, model: str) -> None:
+        """Учитывает расход токенов запроса в метриках и трассировке."""
+        if usage is None:
+            return
+
+        for token_type, tokens in (
+            ("prompt", usage.prompt_tokens),
+            ("cached", usage.prompt_tokens_details.cached_tokens),
+            ("completion", usage.completion_tokens),
+        ):
+            if tokens is not None:
+                LLM_TOKENS.labels(model=model, type=token_type).inc(tokens)
+        logger.debug(
+            f"Токенов запроса: {usage.prompt_tokens}, "
+            f"из кэша: {usage.prompt_tokens_details.cached_tokens}, "
+            f"ответа: {usage.completion_tokens}"
         )
-        self.chat_url = self.base_url + "/chat/completions"
 
+        # Расход токенов виден в трассировке рядом со временем ответа
+        span = sentry_sdk.get_current_span()
+        if span is not None:
+            span.set_data("llm.model", model)
+            span.set_data("llm.prompt_tokens", usage.prompt_tokens)
+            span.set_data(
+                "llm.cached_tokens",
+                usage.prompt_tokens_details.cached_tokens,
+            )
+            span.set_data("llm.completion_tokens", usage.completion_tokens)
+
+    @traced("llm.chat")
     async def generate_text(
         self,
         *,
@@ -34,68 +539,383 @@ class ChatGPTClient:
         system_message: str,
         temperature: float = 0.5,
         max_tokens: int = 1000,
-    ) -> ChatCompletionResponse:
+        response_format: dict[str, Any] | None = None,
+        timeout: httpx.Timeout | None = None,
+    ) -> CompletionResult:
         """
         Генерирует текст через ChatGPT API.
 
         Args:
             prompt: Текст запроса
+            response_format: Формат ответа, например {"type": "json_object"}
+            timeout: Таймауты запроса вместо таймаутов клиента по умолчанию
 
         Returns:
-            dict: Распарсенный JSON ответ
+            CompletionResult: Текст ответа, модель, бэкенд, расход токенов
+                и время ответа
 
         Raises:
-            ValueError: При ошибке парсинга JSON
-            httpx.HTTPError: При ошибке HTTP запроса
+            ChatGPTHTTPError: При ошибке HTTP запроса после всех повторов
+            ChatGPTCircuitOpenError: Если API недавно отвечал ошибками
+            ChatGPTValidationError: При ошибке валидации ответа
         """
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-
-        data = {
-            "model": model,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": system_message,
-                },
-                {"role": "user", "content": prompt},
-            ],
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-        }
+        data = self._build_request_data(
+            prompt=prompt,
+            model=model,
+            system_message=system_message,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_format,
+        )
 
         logger.debug(f"Отправка запроса к ChatGPT ({model}): {prompt[:100]}...")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(self.chat_url, headers=headers, json=data)
-                response.raise_for_status()
+        started_at = time.monotonic()
+        response, backend = await self._send(data, stream=False, timeout=timeout)
 
-                try:
-                    response_data = response.json()
-                except ValueError as e:
-                    logger.error(f"Ошибка парсинга JSON ответа от ChatGPT: {e}")
-                    raise ChatGPTError(f"JSON parsing error: {str(e)}") from e
+        chat_response = _parse_chat_response(response.content)
+        self._record_usage(chat_response.usage, model=chat_response.model)
+
+        choice = chat_response.choices[0] if chat_response.choices else None
+        completion = CompletionResult(
+            text=choice.message.content or "" if choice is not None else "",
+            model=chat_response.model,
+            backend=backend.name,
+            usage=chat_response.usage,
+            latency=time.monotonic() - started_at,
+            finish_reason=choice.finish_reason if choice is not None else None,
+        )
+        if choice is None:
+            raise ChatGPTValidationError(
+                "Validation error: response has no choices",
+                completion=completion,
+            )
+        if choice.message.content is None:
+            raise ChatGPTValidationError(
+                f"Empty response: {choice.message.refusal or choice.finish_reason}",
+                completion=completion,
+            )
+
+        logger.debug(f"Получен ответ от ChatGPT: {completion.text[:100]}...")
+        return completion
+
+    @traced("llm.chat")
+    async def stream_text(
+        self,
+        *,
+        prompt: str,
+        model: str = "gpt-4.1-mini",
+        system_message: str,
+        temperature: float = 0.5,
+        max_tokens: int = 1000,
+        on_delta: Callable[[str], Awaitable[None]],
+    ) -> CompletionResult:
+        """
+        Генерирует текст через ChatGPT API в потоковом режиме (stream=True).
+
+        Запрос повторяется только до получения ответа: после начала потока
+        повтор привёл бы к дублированию уже показанного текста.
+
+        Args:
+            prompt: Текст запроса
+            on_delta: Функция, вызываемая с каждым фрагментом сгенерированного текста
+
+        Returns:
+            CompletionResult: Полный текст ответа, модель, бэкенд, расход токенов
+                (если API его вернул) и время ответа
+
+        Raises:
+            ChatGPTHTTPError: При ошибке HTTP запроса
+            ChatGPTCircuitOpenError: Если API недавно отвечал ошибками
+            ChatGPTValidationError: При ошибке валидации фрагмента ответа
+        """
+        data = self._build_request_data(
+            prompt=prompt,
+            model=model,
+            system_message=system_message,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+        )
+
+        logger.debug(
+            f"Отправка потокового запроса к ChatGPT ({model}): {prompt[:100]}..."
+        )
+
+        started_at = time.monotonic()
+        response, backend = await self._send(
+            data,
+            stream=True,
+            timeout=self.stream_timeout,
+        )
+
+        generated_text = ""
+        response_model = data["model"]
+        usage: Usage | None = None
+        finish_reason: str | None = None
+
+        def build_completion() -> CompletionResult:
+            return CompletionResult(
+                text=generated_text,
+                model=response_model,
+                backend=backend.name,
+                usage=usage,
+                latency=time.monotonic() - started_at,
+                finish_reason=finish_reason,
+            )
+
+        try:
+            # Ответ приходит в формате server-sent events: строки "data: {...}",
+            # поток завершается строкой "data: [DONE]"
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+
+                payload = line.removeprefix("data:").strip()
+                if payload == "[DONE]":
+                    break
 
                 try:
-                    chat_response = ChatCompletionResponse(**response_data)
+                    chunk = ChatCompletionChunk.model_validate_json(payload)
                 except ValidationError as e:
-                    logger.error(f"Ошибка валидации ответа от ChatGPT: {e}")
-                    raise ChatGPTValidationError(f"Validation error: {str(e)}") from e
+                    logger.error(f"Ошибка валидации фрагмента от ChatGPT: {e}")
+                    raise ChatGPTValidationError(
+                        f"Validation error: {str(e)}",
+                        completion=build_completion(),
+                    ) from e
 
-                generated_text = chat_response.choices[0].message.content
-                logger.debug(f"Получен ответ от ChatGPT: {generated_text[:100]}...")
+                response_model = chunk.model or response_model
+                if chunk.usage is not None:
+                    usage = chunk.usage
+                if chunk.choices and chunk.choices[0].finish_reason is not None:
+                    finish_reason = chunk.choices[0].finish_reason
+                if chunk.choices and chunk.choices[0].delta.content:
+                    generated_text += chunk.choices[0].delta.content
+                    await on_delta(chunk.choices[0].delta.content)
 
-                return chat_response
+        except httpx.TimeoutException as e:
+            logger.error(
+                f"Истекло время ожидания потока от ChatGPT ({backend.name}): {e}"
+            )
+            backend.record_failure()
+            LLM_ERRORS.labels(backend=backend.name, error="stream_timeout").inc()
+            raise ChatGPTTimeoutError(
+                f"Stream timeout: {str(e)}",
+                completion=build_completion(),
+            ) from e
+        except httpx.HTTPError as e:
+            logger.error(f"Ошибка HTTP запроса к ChatGPT ({backend.name}): {e}")
+            backend.record_failure()
+            LLM_ERRORS.labels(backend=backend.name, error="stream_network").inc()
+            raise ChatGPTHTTPError(
+                f"HTTP error: {str(e)}",
+                completion=build_completion(),
+            ) from e
+        finally:
+            await response.aclose()
+            # Расход учитывается и для оборванного потока, если API успел его прислать
+            self._record_usage(usage, model=response_model)
 
+        return build_completion()
+
+    async def _send(
+        self,
+        data: dict[str, Any],
+        *,
+        stream: bool,
+        timeout: httpx.Timeout | None = None,
+    ) -> tuple[httpx.Response, ChatGPTBackend]:
+        """
+        Отправляет запрос к Chat Completions API с повторами при временных сбоях.
+
+        Запрос отправляется бэкенду с наименьшей оценкой ожидаемого времени ответа
+        (см. `ChatGPTBackend.score`), повтор — по возможности другому бэкенду.
+        Повторяются сетевые ошибки, таймауты, 429 и 5xx с экспоненциальной
+        задержкой со случайным разбросом (jitter) либо с задержкой из заголовка
+        Retry-After. Ошибки ключа или модели (401, 403, 404) считаются сбоем
+        бэкенда и сразу переключают запрос на другой бэкенд. Бэкенды, у которых
+        разомкнут автоматический выключатель, не используются.
+
+        Args:
+            data: Тело запроса
+            stream: Не читать тело ответа (для потоковых ответов). Вызывающий
+                код должен закрыть такой ответ
+            timeout: Таймауты запроса вместо таймаутов клиента по умолчанию
+
+        Returns:
+            tuple[httpx.Response, ChatGPTBackend]: Успешный ответ API и бэкенд,
+                который его вернул
+
+        Raises:
+            ChatGPTHTTPError: Если запрос не удался после всех повторов
+            ChatGPTCircuitOpenError: Если выключатели всех бэкендов разомкнуты
+        """
+        client = await self._get_http_client()
+
+        tried: set[str] = set()
+        attempt = 0
+        while True:
+            backend = self._select_backend(tried)
+            if backend is None:
+                LLM_ERRORS.labels(backend="all", error="circuit_open").inc()
+                raise ChatGPTCircuitOpenError(
+                    "ChatGPT API temporarily unavailable",
+                    retry_after=min(
+                        backend.circuit_breaker.retry_after for backend in self.backends
+                    ),
+                )
+            tried.add(backend.name)
+
+            request_data = (
+                data if backend.model is None else {**data, "model": backend.model}
+            )
+
+            error: ChatGPTHTTPError
+            started_at = time.monotonic()
+            backend.in_flight += 1
+            try:
+                request = client.build_request(
+                    "POST",
+                    backend.chat_url,
+                    json=request_data,
+                    headers=backend.headers,
+                    timeout=timeout if timeout is not None else self.timeout,
+                )
+                response = await client.send(request, stream=stream)
+            except httpx.TimeoutException as e:
+                error = ChatGPTTimeoutError(f"Timeout: {str(e)}")
             except httpx.HTTPError as e:
-                logger.error(f"Ошибка HTTP запроса к ChatGPT: {e}")
-                raise ChatGPTHTTPError(f"HTTP error: {str(e)}") from e
-            except Exception as e:
-                logger.error(f"Неожиданная ошибка при работе с ChatGPT: {e}")
-                raise ChatGPTError(f"Unexpected error: {str(e)}") from e
+                error = ChatGPTHTTPError(f"HTTP error: {str(e)}")
+            else:
+                if response.is_success:
+                    latency = time.monotonic() - started_at
+                    backend.record_success(latency)
+                    LLM_REQUEST_DURATION.labels(
+                        backend=backend.name, status="ok"
+                    ).observe(latency)
+                    return response, backend
+
+                error = await _build_status_error(response)
+            finally:
+                backend.in_flight -= 1
+
+            LLM_REQUEST_DURATION.labels(backend=backend.name, status="error").observe(
+                time.monotonic() - started_at
+            )
+            LLM_ERRORS.labels(backend=backend.name, error=_get_error_label(error)).inc()
+
+            if (
+                not error.retryable
+                and error.status_code not in BACKEND_FAULT_STATUS_CODES
+            ):
+                # API отвечает, ошибка в самом запросе: это не сбой бэкенда
+                backend.circuit_breaker.record_success()
+                logger.error(f"Ошибка запроса к ChatGPT ({backend.name}): {error}")
+                raise error
+
+            backend.record_failure()
+            has_untried_backend = len(tried) < len(self.backends)
+
+            if not error.retryable:
+                if not has_untried_backend:
+                    logger.error(f"Ошибка запроса к ChatGPT ({backend.name}): {error}")
+                    raise error
+                logger.warning(
+                    f"Ошибка настройки бэкенда ChatGPT ({backend.name}): {error}. "
+                    f"Запрос переключён на другой бэкенд"
+                )
+                continue
+
+            delay = self._get_retry_delay(attempt, error.retry_after)
+            if attempt >= self.max_retries or delay is None:
+                logger.error(f"Ошибка HTTP запроса к ChatGPT ({backend.name}): {error}")
+                raise error
+
+            attempt += 1
+            # Другой бэкенд не перегружен этим запросом, ждать не нужно
+            if has_untried_backend:
+                delay = 0.0
+            logger.warning(
+                f"Ошибка запроса к ChatGPT ({backend.name}): {error}. "
+                f"Повтор {attempt}/{self.max_retries} через {delay:.2f} с"
+            )
+            await asyncio.sleep(delay)
+
+    def _select_backend(self, tried: set[str]) -> ChatGPTBackend | None:
+        """
+        Выбирает бэкенд для запроса.
+
+        Предпочтение отдаётся бэкендам, которые ещё не пробовались для этого
+        запроса, затем бэкенду с наименьшей оценкой ожидаемого времени ответа.
+        Бэкенды с разомкнутым выключателем пропускаются.
+        """
+        candidates = sorted(
+            self.backends,
+            key=lambda backend: (backend.name in tried, backend.score()),
+        )
+        for backend in candidates:
+            if backend.circuit_breaker.allow():
+                return backend
+        return None
+
+    def _get_retry_delay(self, attempt: int, retry_after: float | None) -> float | None:
+        """
+        Возвращает задержку перед повтором запроса в секундах.
+
+        Используется экспоненциальная задержка с полным случайным разбросом
+        (full jitter), чтобы повторы разных запросов не приходили одновременно.
+        Если API просит подождать дольше `retry_max_delay`, повтор не выполняется
+        (возвращается None): пользователь не должен ждать ответа так долго.
+        """
+        if retry_after is not None:
+            return retry_after if retry_after <= self.retry_max_delay else None
+
+        return random.uniform(
+            0,
+            min(self.retry_max_delay, self.retry_base_delay * 2**attempt),
+        )
+
+    def estimate_translation_tokens(
+        self,
+        text: str,
+        target_language: str = "русский",
+        completion: str | None = None,
+        *,
+        article: bool = False,
+        brief: bool = False,
+    ) -> int:
+        """
+        Оценивает расход токенов на перевод текста.
+
+        Без `completion` оценка делается сверху, по лимиту длины ответа. Если
+        передан полученный ответ, учитывается его фактическая длина.
+        """
+        translation_prompt = select_translation_prompt(
+            text,
+            article=article,
+            brief=brief,
+        )
+        prompt = _build_translation_prompt(text, target_language)
+        completion_tokens = (
+            translation_prompt.max_tokens
+            if completion is None
+            else estimate_tokens(completion)
+        )
+        return (
+            estimate_tokens(translation_prompt.system_message + prompt)
+            + completion_tokens
+        )
+
+    def estimate_batch_tokens(
+        self,
+        texts: list[str],
+        target_language: str = "русский",
+    ) -> int:
+        """Оценивает сверху расход токенов на пакетный перевод списка текстов."""
+        prompt = _build_batch_translation_prompt(texts, target_language)
+        return estimate_tokens(
+            BATCH_TRANSLATION_SYSTEM_MESSAGE + prompt
+        ) + BATCH_MAX_TOKENS_PER_ITEM * len(texts)
 
     async def translate_text(
         self,
@@ -103,69 +923,170 @@ class ChatGPTClient:
         text: str,
         target_language: str = "русский",
         model: str = "gpt-4.1-mini",
-    ) -> str:
+        brief: bool = False,
+    ) -> TranslationResult:
         """
-        Переводит текст на целевой язык с помощью ChatGPT.
+        Переводит текст на целевой язык с помощью ChatGPT в виде статьи.
+
+        Статья запрашивается в JSON (слово, значения, примеры, основной перевод)
+        и оформляется для вывода локально.
 
         Args:
             text: Текст для перевода на английском языке
             target_language: Целевой язык перевода (по умолчанию русский)
+            brief: Запросить краткую статью: только основные переводы, без
+                пояснений и примеров (`TranslationResult.brief`)
         Returns:
-            str: Переведенный текст
+            TranslationResult: Статья с переводом и данные запроса к API
+
+        Raises:
+            ChatGPTValidationError: Если ответ не соответствует схеме статьи
         """
-        system_message = (
-            "You are a professional translator. "
-            "Translate the user's text as in examples below. Include usage examples and various meanings."
-            "Return the translated text with Markdown markup, without any additional comments, "
-            "greetings, or explanations.\n\n"
+        translation_prompt = select_translation_prompt(
+            text,
+            article=True,
+            brief=brief,
         )
-        system_message += """
-Example for word:
+        prompt = _build_translation_prompt(text, target_language)
+        self.translation_requests += 1
 
-## Deliberate – решительный
-
-"Deliberate" на русский язык может переводиться в зависимости от контекста:
+        completion = await self.generate_text(
+            prompt=prompt,
+            model=model,
+            system_message=translation_prompt.system_message,
+            temperature=0.2,  # Низкая температура для более точного перевода
+            max_tokens=translation_prompt.max_tokens,
+            response_format={"type": "json_object"},
+        )
+        self._translation_latencies.append(completion.latency)
+        _warn_if_truncated(completion, translation_prompt)
 
-1. **Решительный** (в контексте решительного решения или действия).  
-   Пример: *deliberate decision* — *решительное решение*.
+        try:
+            article = TranslationArticle.model_validate_json(completion.text)
+        except ValidationError as e:
+            logger.error(f"Ошибка валидации статьи перевода от ChatGPT: {e}")
+            raise ChatGPTValidationError(
+                f"Validation error: {str(e)}",
+                completion=completion,
+            ) from e
 
-2. **Усмотрительный** (в контексте тщательного рассмотрения).  
-   Пример: *deliberate act* — *усмотрительное действие*.
+        return TranslationResult(
+            article=article,
+            completion=completion,
+            brief=translation_prompt.brief,
+        )
 
-3. **Обдуманный** (если речь идёт о тщательном планировании).  
-   Пример: *deliberate plan* — *обдуманный план*.
+    def get_hedge_delay(self) -> float | None:
+        """
+        Возвращает время ожидания ответа, после которого отправляется
+        дублирующий запрос перевода, или None, если дублирование выключено.
+        """
+        if (
+            self.hedge_percentile is None
+            or len(self._translation_latencies) < HEDGE_MIN_SAMPLES
+        ):
+            return None
 
-Если контекст не указан, наиболее распространённый перевод — **"решительный"**.
+        latencies = sorted(self._translation_latencies)
+        index = math.ceil(self.hedge_percentile / 100 * len(latencies)) - 1
+        return latencies[min(max(index, 0), len(latencies) - 1)]
 
-----
+    def hedge_budget_allows(self) -> bool:
+        """Проверяет, не превышена ли доля дублирующих запросов."""
+        primary_requests = self.translation_requests - self.hedged_requests
+        return self.hedged_requests < self.hedge_max_ratio * primary_requests
 
-Example for a phrase:
+    def record_hedge(self) -> None:
+        """Учитывает отправку дублирующего запроса перевода."""
+        self.hedged_requests += 1
 
-## Case study – тематическое исследование
+    def record_hedge_win(self) -> None:
+        """Учитывает дублирующий запрос, ответивший раньше основного."""
+        self.hedge_wins += 1
 
-"Case study" на русский язык переводится как:
+    async def translate_batch(
+        self,
+        *,
+        texts: list[str],
+        target_language: str = "русский",
+        model: str = "gpt-4.1-mini",
+    ) -> BatchTranslationResult:
+        """
+        Переводит список слов или фраз одним запросом к ChatGPT.
 
-1.  **Тематическое исследование** (детальный анализ конкретного примера или ситуации).
-    Пример: *a case study of a successful company* — *тематическое исследование успешной компании*.
+        Args:
+            texts: Тексты для перевода на английском языке
+            target_language: Целевой язык перевода (по умолчанию русский)
+        Returns:
+            BatchTranslationResult: Переводы элементов в порядке ответа модели
+                и данные запроса к API
 
-2.  **Анализ конкретного случая** (более дословный перевод).
-    Пример: *The report includes a case study on the project's failure.* — *В отчет включен анализ
-    конкретного случая неудачи проекта*.
+        Raises:
+            ChatGPTValidationError: Если ответ не соответствует ожидаемой схеме
+        """
+        completion = await self.generate_text(
+            prompt=_build_batch_translation_prompt(texts, target_language),
+            model=model,
+            system_message=BATCH_TRANSLATION_SYSTEM_MESSAGE,
+            temperature=0.2,  # Низкая температура для более точного перевода
+            max_tokens=BATCH_MAX_TOKENS_PER_ITEM * len(texts),
+            response_format={"type": "json_object"},
+            timeout=self.batch_timeout,
+        )
 
-Наиболее точный перевод — **"тематическое исследование"**.
-"""
+        try:
+            batch_response = BatchTranslationResponse.model_validate_json(
+                completion.text
+            )
+        except ValidationError as e:
+            logger.error(f"Ошибка валидации пакетного перевода от ChatGPT: {e}")
+            raise ChatGPTValidationError(
+                f"Validation error: {str(e)}",
+                completion=completion,
+            ) from e
 
-        prompt = (
-            f"Translate the following text to {target_language}:\n\n"
-            f"---\n{text}\n---"
+        return BatchTranslationResult(
+            items=batch_response.items,
+            completion=completion,
         )
 
-        chat_response = await self.generate_text(
-            prompt=prompt,
+    async def translate_text_stream(
+        self,
+        *,
+        text: str,
+        target_language: str = "русский",
+        model: str = "gpt-4.1-mini",
+        on_partial: Callable[[str], Awaitable[None]],
+    ) -> CompletionResult:
+        """
+        Переводит текст на целевой язык с помощью ChatGPT в потоковом режиме.
+
+        Перевод генерируется сразу в Markdown, т.к. незавершённую статью в JSON
+        нельзя показать пользователю по мере генерации.
+
+        Args:
+            text: Текст для перевода на английском языке
+            target_language: Целевой язык перевода (по умолчанию русский)
+            on_partial: Функция, вызываемая с накопленным переведенным текстом
+                по мере получения фрагментов
+        Returns:
+            CompletionResult: Переведенный текст и данные запроса к API
+        """
+        translation_prompt = select_translation_prompt(text)
+        translated_text = ""
+
+        async def on_delta(delta: str) -> None:
+            nonlocal translated_text
+            translated_text += delta
+            await on_partial(translated_text)
+
+        completion = await self.stream_text(
+            prompt=_build_translation_prompt(text, target_language),
             model=model,
-            system_message=system_message,
+            system_message=translation_prompt.system_message,
             temperature=0.2,  # Низкая температура для более точного перевода
+            max_tokens=translation_prompt.max_tokens,
+            on_delta=on_delta,
         )
-
-        translated_text = chat_response.choices[0].message.content
-        return translated_text.strip()
+        _warn_if_truncated(completion, translation_prompt)
+        return completion.model_copy(update={"text": completion.text.strip()})
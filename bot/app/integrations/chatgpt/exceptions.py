@@ -1,18 +1,68 @@
 """Исключения для работы с ChatGPT API."""
 
+from app.integrations.chatgpt.schemas import CompletionResult
+
+# Коды ответа, при которых запрос имеет смысл повторить
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+# Коды ответа, которые говорят о неверной настройке бэкенда (ключ, модель),
+# а не об ошибке в самом запросе
+BACKEND_FAULT_STATUS_CODES = frozenset({401, 403, 404})
+
 
 class ChatGPTError(Exception):
     """Базовое исключение для ChatGPT API."""
 
-    pass
+    def __init__(
+        self, message: str = "", *, completion: CompletionResult | None = None
+    ):
+        super().__init__(message)
+        # Ответ API, который не удалось использовать (например, некорректный JSON
+        # или оборванный поток): токены на запрос уже израсходованы
+        self.completion = completion
 
 
 class ChatGPTHTTPError(ChatGPTError):
     """HTTP ошибки при работе с API."""
 
+    def __init__(
+        self,
+        message: str,
+        *,
+        status_code: int | None = None,
+        retry_after: float | None = None,
+        completion: CompletionResult | None = None,
+    ):
+        super().__init__(message, completion=completion)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        """Можно ли повторить запрос: сетевые ошибки, 429 и 5xx."""
+        return self.status_code is None or self.status_code in RETRYABLE_STATUS_CODES
+
+
+class ChatGPTRateLimitError(ChatGPTHTTPError):
+    """Превышен лимит запросов или токенов (HTTP 429)."""
+
     pass
 
 
+class ChatGPTTimeoutError(ChatGPTHTTPError):
+    """Истекло время ожидания ответа от API."""
+
+    pass
+
+
+class ChatGPTCircuitOpenError(ChatGPTError):
+    """Запрос отклонён без отправки: API недавно отвечал ошибками."""
+
+    def __init__(self, message: str, *, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class ChatGPTValidationError(ChatGPTError):
     """Ошибки валидации данных."""
 
@@ -2,54 +2,143 @@
 
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
+
+# Схемы ответа описывают только поля, которые использует клиент: остальные поля
+# игнорируются при разборе. Необязательные поля имеют значения по умолчанию,
+# т.к. OpenAI-совместимые прокси и провайдеры часто их не возвращают или
+# возвращают null.
+
+
+def _none_to_empty(value: Any) -> Any:
+    """Заменяет null на пустой объект для вложенных схем со значениями по умолчанию."""
+    return {} if value is None else value
+
+
+def _none_to_zero(value: Any) -> Any:
+    """Заменяет null на ноль для счетчиков токенов."""
+    return 0 if value is None else value
 
 
 # Схема для вложенного сообщения
 class ChatMessage(BaseModel):
-    role: str
-    content: str
-    refusal: Any  # Может быть None или другой тип
-    annotations: list
+    role: str = "assistant"
+    # None, если модель отказалась отвечать (тогда заполнено поле refusal)
+    content: str | None = None
+    refusal: str | None = None
 
 
 # Схема для одного варианта ответа
 class ChatChoice(BaseModel):
-    index: int
+    index: int = 0
     message: ChatMessage
-    logprobs: Any  # Может быть None или другой тип
-    finish_reason: str
+    finish_reason: str | None = None
 
 
 # Детали токенов
 class TokenDetails(BaseModel):
-    cached_tokens: int = 0
-    audio_tokens: int = 0
+    cached_tokens: int | None = None
 
 
 class CompletionTokenDetails(BaseModel):
     reasoning_tokens: int = 0
-    audio_tokens: int = 0
-    accepted_prediction_tokens: int = 0
-    rejected_prediction_tokens: int = 0
+
+    _reasoning_tokens_none_to_zero = field_validator("reasoning_tokens", mode="before")(
+        _none_to_zero
+    )
 
 
-# Схема использования токенов
+# Схема использования токенов. Счетчики, которые API не вернул, остаются None,
+# а не ноль: неизвестный расход не должен выглядеть как бесплатный запрос
 class Usage(BaseModel):
-    prompt_tokens: int
-    completion_tokens: int
-    total_tokens: int
-    prompt_tokens_details: TokenDetails
-    completion_tokens_details: CompletionTokenDetails
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    total_tokens: int | None = None
+    prompt_tokens_details: TokenDetails = Field(default_factory=TokenDetails)
+    completion_tokens_details: CompletionTokenDetails = Field(
+        default_factory=CompletionTokenDetails
+    )
+
+    _details_none_to_empty = field_validator(
+        "prompt_tokens_details", "completion_tokens_details", mode="before"
+    )(_none_to_empty)
 
 
 # Основная схема ответа API
 class ChatCompletionResponse(BaseModel):
-    id: str
-    object: str
-    created: int
     model: str
     choices: list[ChatChoice]
-    usage: Usage
-    service_tier: str
-    system_fingerprint: Any  # Может быть None или
+    usage: Usage | None = None
+
+
+# Схемы для потоковых ответов (stream=True, server-sent events)
+class ChatDelta(BaseModel):
+    content: str | None = None
+
+
+class ChatChunkChoice(BaseModel):
+    index: int = 0
+    delta: ChatDelta = Field(default_factory=ChatDelta)
+    finish_reason: str | None = None
+
+
+class ChatCompletionChunk(BaseModel):
+    model: str = ""
+    choices: list[ChatChunkChoice] = Field(default_factory=list)
+    # Приходит в последнем фрагменте при stream_options.include_usage
+    usage: Usage | None = None
+
+
+# Результат одного запроса к API: текст ответа, модель, бэкенд, расход токенов,
+# время ответа в секундах и причина завершения генерации ("length" — ответ обрезан)
+class CompletionResult(BaseModel):
+    text: str
+    model: str
+    backend: str
+    usage: Usage | None = None
+    latency: float
+    finish_reason: str | None = None
+
+
+# Схемы для содержимого ответа на перевод в виде статьи (response_format=json_object).
+# Оформление статьи для Telegram выполняется локально, поэтому модель не тратит
+# токены ответа на разметку.
+class TranslationExample(BaseModel):
+    source: str
+    translation: str
+
+
+class TranslationSense(BaseModel):
+    translation: str
+    note: str = ""
+    examples: list[TranslationExample] = Field(default_factory=list)
+
+
+class TranslationArticle(BaseModel):
+    headword: str
+    senses: list[TranslationSense]
+    preferred: str
+
+
+# Результат перевода в виде статьи: статья, данные запроса к API и признак
+# краткой статьи (без пояснений и примеров)
+class TranslationResult(BaseModel):
+    article: TranslationArticle
+    completion: CompletionResult
+    brief: bool = False
+
+
+# Схемы для содержимого ответа на пакетный перевод (response_format=json_object)
+class BatchTranslationItem(BaseModel):
+    source: str
+    translation: str
+
+
+class BatchTranslationResponse(BaseModel):
+    items: list[BatchTranslationItem]
+
+
+# Результат пакетного перевода: переводы элементов и данные запроса к API
+class BatchTranslationResult(BaseModel):
+    items: list[BatchTranslationItem]
+    completion: CompletionResult
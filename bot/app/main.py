@@ -4,10 +4,21 @@ import sentry_sdk
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
 from loguru import logger
 
 from app.config import settings
+from app.db import SessionLocal
 from app.handlers import router
+from app.integrations.chatgpt import get_chatgpt_client
+from app.metrics import MetricsServer
+from app.middlewares import (
+    ConcurrencyLimitMiddleware,
+    MetricsMiddleware,
+    TracingMiddleware,
+)
+from app.services.translation import load_fuzzy_index, view_count_buffer
 
 if settings.SENTRY_DSN:
     # Инициализация Sentry/Bugsink для отслеживания ошибок
@@ -15,21 +26,116 @@ if settings.SENTRY_DSN:
         dsn=settings.SENTRY_DSN,
         send_default_pii=True,
         max_request_body_size="always",
-        traces_sample_rate=0,
+        traces_sample_rate=settings.SENTRY_TRACES_SAMPLE_RATE,
     )
 
+if settings.SENTRY_DSN and settings.SENTRY_TRACES_SAMPLE_RATE > 0:
+    router.message.middleware(TracingMiddleware())
+    router.callback_query.middleware(TracingMiddleware())
+router.message.middleware(MetricsMiddleware())
+router.callback_query.middleware(MetricsMiddleware())
+
 dp = Dispatcher()
+dp.update.outer_middleware(ConcurrencyLimitMiddleware(settings.HANDLER_MAX_CONCURRENCY))
 dp.include_router(router)
 
+metrics_server = MetricsServer(host=settings.METRICS_HOST, port=settings.METRICS_PORT)
+
+
+@dp.startup()
+async def on_startup(bot: Bot) -> None:
+    """Открывает общие ресурсы приложения при старте бота."""
+    await get_chatgpt_client().start()
+
+    if settings.METRICS_ENABLED:
+        await metrics_server.start()
+
+    if settings.VIEW_COUNT_WRITE_BEHIND:
+        await view_count_buffer.start()
+
+    if settings.FUZZY_INDEX_ENABLED:
+        async with SessionLocal() as session:
+            await load_fuzzy_index(session=session)
+
+    if settings.BOT_MODE == "webhook":
+        # Каждый экземпляр бота устанавливает один и тот же вебхук, поэтому
+        # при остановке вебхук не удаляется: обновления получат другие экземпляры
+        await bot.set_webhook(
+            url=f"{settings.WEBHOOK_BASE_URL}{settings.WEBHOOK_PATH}",
+            secret_token=settings.WEBHOOK_SECRET,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+        logger.info(
+            f"Установлен вебхук {settings.WEBHOOK_BASE_URL}{settings.WEBHOOK_PATH}"
+        )
+    else:
+        # Пока установлен вебхук, Telegram не отдаёт обновления через getUpdates
+        await bot.delete_webhook()
+
+
+@dp.shutdown()
+async def on_shutdown(bot: Bot) -> None:
+    """Освобождает общие ресурсы приложения при остановке бота."""
+    # Записываем в БД накопленные счетчики просмотров до закрытия соединений
+    await view_count_buffer.stop()
+    await get_chatgpt_client().close()
+    await metrics_server.stop()
+
+    if settings.BOT_MODE == "webhook":
+        # В режиме polling сессию закрывает сам start_polling
+        await bot.session.close()
 
-async def main() -> None:
+
+async def healthz_handler(request: web.Request) -> web.Response:
+    """Отвечает балансировщику нагрузки, что бот запущен."""
+    return web.Response(text="ok")
+
+
+def create_webhook_app(bot: Bot) -> web.Application:
+    """
+    Создаёт aiohttp-приложение, которое принимает обновления от Telegram.
+
+    Запросы без верного секрета в заголовке X-Telegram-Bot-Api-Secret-Token
+    отклоняются. Обновления обрабатываются в фоне, чтобы Telegram сразу
+    получал ответ и не повторял запрос при долгом переводе.
+    """
+    if not settings.WEBHOOK_BASE_URL or not settings.WEBHOOK_SECRET:
+        raise ValueError("Для BOT_MODE=webhook нужны WEBHOOK_BASE_URL и WEBHOOK_SECRET")
+
+    app = web.Application()
+    app.router.add_get("/healthz", healthz_handler)
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        handle_in_background=True,
+        secret_token=settings.WEBHOOK_SECRET,
+    ).register(app, path=settings.WEBHOOK_PATH)
+    # Запуск и остановка диспетчера (on_startup/on_shutdown) вместе с приложением
+    setup_application(app, dp, bot=bot)
+    return app
+
+
+def main() -> None:
     bot = Bot(
         token=settings.TELEGRAM_BOT_TOKEN,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
     )
-    logger.info("🚀 Bot started")
-    await dp.start_polling(bot)
+
+    if settings.BOT_MODE == "webhook":
+        logger.info(
+            f"🚀 Bot started (webhook on {settings.WEBHOOK_HOST}:{settings.WEBHOOK_PORT})"
+        )
+        web.run_app(
+            create_webhook_app(bot),
+            host=settings.WEBHOOK_HOST,
+            port=settings.WEBHOOK_PORT,
+            print=None,
+        )
+        return
+
+    logger.info("🚀 Bot started (polling)")
+    asyncio.run(dp.start_polling(bot))
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
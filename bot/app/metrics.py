@@ -0,0 +1,158 @@
+"""Метрики бота в формате Prometheus и HTTP-сервер для их сбора."""
+
+from collections.abc import Callable, Iterable, Iterator
+
+from aiohttp import web
+from loguru import logger
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.aiohttp import make_aiohttp_handler
+from prometheus_client.core import CounterMetricFamily
+from prometheus_client.registry import Collector
+
+# Границы гистограмм длительностей, в секундах: от запросов к БД до ответов LLM
+DURATION_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class FunctionCounter(Collector):
+    """
+    Счётчик, значения которого вычисляются функциями при каждом сборе метрик.
+
+    Подходит для счётчиков, которые уже ведёт другой объект (например, попадания
+    в кэш), чтобы не дублировать учёт в горячем пути.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._functions: dict[tuple[str, ...], Callable[[], float]] = {}
+        REGISTRY.register(self)
+
+    def set_function(self, function: Callable[[], float], **labels: str) -> None:
+        """Задаёт функцию, которая возвращает значение счётчика с метками."""
+        self._functions[tuple(labels[name] for name in self.labelnames)] = function
+
+    def collect(self) -> Iterator[CounterMetricFamily]:
+        family = CounterMetricFamily(
+            self.name, self.documentation, labels=self.labelnames
+        )
+        for label_values, function in self._functions.items():
+            family.add_metric(label_values, float(function()))
+        yield family
+
+
+# MARK: Handlers
+HANDLER_DURATION = Histogram(
+    "bot_handler_duration_seconds",
+    "Время обработки сообщений и нажатий кнопок",
+    labelnames=("handler",),
+    buckets=DURATION_BUCKETS,
+)
+HANDLER_ERRORS = Counter(
+    "bot_handler_errors_total",
+    "Необработанные исключения в обработчиках",
+    labelnames=("handler", "error"),
+)
+
+# MARK: Translations
+TRANSLATION_LOOKUP_DURATION = Histogram(
+    "translation_lookup_duration_seconds",
+    "Время получения перевода по источнику перевода",
+    labelnames=("result",),
+    buckets=DURATION_BUCKETS,
+)
+TRANSLATION_CACHE_REQUESTS = FunctionCounter(
+    "translation_cache_requests_total",
+    "Обращения к in-memory кэшу переводов",
+    labelnames=("result",),
+)
+
+# MARK: LLM
+LLM_REQUEST_DURATION = Histogram(
+    "llm_request_duration_seconds",
+    "Время ответа ChatGPT API на одну попытку запроса",
+    labelnames=("backend", "status"),
+    buckets=DURATION_BUCKETS,
+)
+LLM_ERRORS = Counter(
+    "llm_errors_total",
+    "Ошибки запросов к ChatGPT API",
+    labelnames=("backend", "error"),
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Токены запросов и ответов ChatGPT API",
+    labelnames=("model", "type"),
+)
+
+# MARK: Database
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Время получения соединения из пула соединений с БД",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Соединения в пуле соединений с БД",
+    labelnames=("state",),
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Время выполнения запросов к БД",
+    buckets=DURATION_BUCKETS,
+)
+DB_ERRORS = Counter(
+    "db_errors_total",
+    "Ошибки выполнения запросов к БД",
+    labelnames=("error",),
+)
+
+
+# MARK: Server
+def create_metrics_app() -> web.Application:
+    """Создаёт приложение, которое отдаёт метрики по адресу /metrics."""
+    app = web.Application()
+    app.router.add_get("/metrics", make_aiohttp_handler(REGISTRY))
+    return app
+
+
+class MetricsServer:
+    """HTTP-сервер, который отдаёт метрики по адресу /metrics."""
+
+    def __init__(self, *, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._runner: web.AppRunner | None = None
+
+    async def start(self) -> None:
+        """Запускает сервер."""
+        if self._runner is not None:
+            return
+
+        self._runner = web.AppRunner(create_metrics_app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(
+            f"Метрики доступны по адресу http://{self.host}:{self.port}/metrics"
+        )
+
+    async def stop(self) -> None:
+        """Останавливает сервер."""
+        if self._runner is None:
+            return
+
+        await self._runner.cleanup()
+        self._runner = None
@@ -0,0 +1,91 @@
+"""Middleware для обработчиков бота."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import sentry_sdk
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.types import TelegramObject
+
+from app.metrics import HANDLER_DURATION, HANDLER_ERRORS
+
+
+def _get_handler_name(data: dict[str, Any]) -> str:
+    """Возвращает имя функции обработчика, выбранного для события."""
+    handler_object: HandlerObject | None = data.get("handler")
+    if handler_object is None:
+        return "unknown"
+    return getattr(handler_object.callback, "__name__", "unknown")
+
+
+class ConcurrencyLimitMiddleware(BaseMiddleware):
+    """
+    Ограничивает количество одновременно обрабатываемых обновлений.
+
+    Обновления обрабатываются в отдельных задачах, и без ограничения всплеск
+    запросов превращается в сотни одновременных обращений к БД и ChatGPT.
+    Лишние обновления ждут своей очереди.
+    """
+
+    def __init__(self, limit: int):
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        async with self._semaphore:
+            return await handler(event, data)
+
+
+class TracingMiddleware(BaseMiddleware):
+    """
+    Начинает трассировку Sentry для каждого обработанного события.
+
+    Запросы к БД, ChatGPT и Telegram внутри обработчика записываются
+    как дочерние span этой трассировки.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        with sentry_sdk.start_transaction(
+            op="aiogram.handler",
+            name=_get_handler_name(data),
+        ):
+            return await handler(event, data)
+
+
+class MetricsMiddleware(BaseMiddleware):
+    """
+    Учитывает время работы и ошибки обработчиков в метриках.
+
+    Подключается как inner middleware, чтобы обработчик был уже выбран
+    фильтрами и его имя можно было использовать в метке.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        handler_name = _get_handler_name(data)
+        started_at = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception as e:
+            HANDLER_ERRORS.labels(handler=handler_name, error=type(e).__name__).inc()
+            raise
+        finally:
+            HANDLER_DURATION.labels(handler=handler_name).observe(
+                time.perf_counter() - started_at
+            )
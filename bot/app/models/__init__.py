@@ -1,7 +1,9 @@
 from app.models.base_model import BaseModel
+from app.models.llm_call import LLMCallModel
 from app.models.translation import TranslationModel
 
 __all__ = [
     "BaseModel",
+    "LLMCallModel",
     "TranslationModel",
 ]
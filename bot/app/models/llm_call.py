@@ -0,0 +1,73 @@
+"""Содержит модель запроса к LLM."""
+
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.constants import CURRENT_TIMESTAMP
+from app.models.base_model import BaseModel
+
+
+class LLMCallModel(BaseModel):
+    """Модель запроса к LLM: расход токенов и время ответа."""
+
+    __tablename__ = "llm_calls"
+
+    id: Mapped[int] = mapped_column(
+        primary_key=True,
+        index=True,
+    )
+    translation_id: Mapped[int | None] = mapped_column(
+        sa.ForeignKey("translations.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+        comment="Перевод, полученный в результате запроса (для одиночных переводов)",
+    )
+    kind: Mapped[str] = mapped_column(
+        sa.String(32),
+        nullable=False,
+        comment="Тип запроса: перевод, пакетный перевод, предварительный перевод",
+    )
+    model: Mapped[str] = mapped_column(
+        sa.String(255),
+        nullable=False,
+        comment="Модель, вернувшая ответ",
+    )
+    backend: Mapped[str] = mapped_column(
+        sa.String(255),
+        nullable=False,
+        comment="Бэкенд, вернувший ответ",
+    )
+    items: Mapped[int] = mapped_column(
+        sa.Integer(),
+        nullable=False,
+        default=1,
+        comment="Количество переведённых текстов",
+    )
+    prompt_tokens: Mapped[int | None] = mapped_column(
+        sa.Integer(),
+        nullable=True,
+        comment="Токены запроса (NULL, если API не вернул расход)",
+    )
+    cached_tokens: Mapped[int | None] = mapped_column(
+        sa.Integer(),
+        nullable=True,
+        comment="Токены запроса, прочитанные из кэша промптов",
+    )
+    completion_tokens: Mapped[int | None] = mapped_column(
+        sa.Integer(),
+        nullable=True,
+        comment="Токены ответа",
+    )
+    latency_ms: Mapped[int] = mapped_column(
+        sa.Integer(),
+        nullable=False,
+        comment="Время ответа в миллисекундах",
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        sa.TIMESTAMP(timezone=True),
+        server_default=CURRENT_TIMESTAMP,
+        index=True,
+        comment="Дата и время запроса",
+    )
@@ -1,8 +1,10 @@
 """Содержит модель перевода."""
 
 from datetime import datetime
+from typing import Any
 
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.constants import CURRENT_TIMESTAMP
@@ -19,17 +21,40 @@ class TranslationModel(BaseModel):
         index=True,
     )
     source: Mapped[str] = mapped_column(
-        sa.String(255),
+        sa.Text(),
+        nullable=False,
+        comment="Исходный текст",
+    )
+    source_hash: Mapped[str] = mapped_column(
+        sa.String(64),
         nullable=False,
         unique=True,
         index=True,
-        comment="Исходный текст",
+        comment="SHA-256 нормализованного исходного текста",
+    )
+    lemma: Mapped[str | None] = mapped_column(
+        sa.String(255),
+        nullable=True,
+        index=True,
+        comment="Начальная форма английского слова (для отдельных слов)",
     )
     translation: Mapped[str] = mapped_column(
         sa.Text(),
         nullable=False,
         comment="Переведённый текст",
     )
+    article: Mapped[dict[str, Any] | None] = mapped_column(
+        JSONB(),
+        nullable=True,
+        comment="Статья с переводом в JSON (значения, примеры, основной перевод)",
+    )
+    is_brief: Mapped[bool] = mapped_column(
+        sa.Boolean(),
+        nullable=False,
+        default=False,
+        server_default=sa.false(),
+        comment="Краткий перевод: подробная статья ещё не запрашивалась",
+    )
     view_count: Mapped[int] = mapped_column(
         sa.Integer(),
         nullable=False,
@@ -39,6 +64,7 @@ class TranslationModel(BaseModel):
     created_at: Mapped[datetime] = mapped_column(
         sa.TIMESTAMP(timezone=True),
         server_default=CURRENT_TIMESTAMP,
+        index=True,
         comment="Дата и время создания записи о городе",
     )
     updated_at: Mapped[datetime] = mapped_column(
@@ -0,0 +1,315 @@
+"""
+Предварительный перевод слов из файла, например из частотного словаря.
+
+Запуск:
+    python -m app.pretranslate words.txt --concurrency 4 --token-budget 500000
+
+Файл читается построчно: одно слово или фраза в строке, пустые строки и строки,
+начинающиеся с "#", пропускаются. Если строка содержит табуляцию (например,
+"слово<TAB>частота"), используется только первая колонка.
+
+Уже сохранённые в БД переводы пропускаются, поэтому повторный запуск после
+прерывания продолжает работу с того места, где она остановилась. Для проверки
+без расхода токенов запустите тестовый сервер и укажите его адрес:
+    python -m tests.mock_completions_server --port 8081
+    python -m app.pretranslate words.txt --api-base-url http://127.0.0.1:8081/v1
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from loguru import logger
+
+from app.config import settings
+from app.db import LLMCallDAO, SessionLocal, TranslationDAO
+from app.db.session import engine
+from app.integrations.chatgpt import (
+    ChatGPTClient,
+    ChatGPTError,
+    create_chatgpt_client,
+)
+from app.integrations.chatgpt.schemas import CompletionResult
+from app.schemas import LLMCallKind
+from app.services.input_gate import check_input
+from app.services.llm_usage import add_failed_llm_call, build_llm_call
+from app.services.translation import build_batch_translations
+from app.utils import get_source_hash, normalize_source
+
+
+@dataclass
+class PretranslateStats:
+    """Счетчики прогресса предварительного перевода."""
+
+    read: int = 0
+    skipped: int = 0
+    translated: int = 0
+    failed: int = 0
+    tokens: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def summary(self) -> str:
+        """Возвращает строку с прогрессом и скоростью перевода."""
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return (
+            f"прочитано: {self.read}, пропущено: {self.skipped}, "
+            f"переведено: {self.translated}, ошибок: {self.failed}, "
+            f"токенов: {self.tokens}, "
+            f"скорость: {self.translated / elapsed:.1f} слов/с, "
+            f"{self.tokens / elapsed:.0f} токенов/с"
+        )
+
+
+def _read_batches(
+    path: Path,
+    *,
+    batch_size: int,
+    stats: PretranslateStats,
+) -> Iterator[list[str]]:
+    """
+    Читает файл построчно и возвращает пакеты слов для перевода.
+
+    Файл не загружается в память целиком. Строки, которые бот не стал бы
+    переводить, и повторы внутри пакета пропускаются.
+    """
+    batch: dict[str, str] = {}
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            source = line.split("\t", 1)[0].strip()
+            if source == "" or source.startswith("#"):
+                continue
+
+            stats.read += 1
+            normalized_source = normalize_source(source)
+            if check_input(source) is not None or normalized_source in batch:
+                stats.skipped += 1
+                continue
+
+            batch[normalized_source] = source
+            if len(batch) >= batch_size:
+                yield list(batch.values())
+                batch = {}
+
+    if batch:
+        yield list(batch.values())
+
+
+def _count_tokens(
+    stats: PretranslateStats, completion: CompletionResult | None
+) -> None:
+    """Учитывает расход токенов запроса в бюджете, если API его сообщил."""
+    if completion is not None and completion.usage is not None:
+        stats.tokens += completion.usage.total_tokens or 0
+
+
+async def _pretranslate_batch(
+    *,
+    chatgpt_client: ChatGPTClient,
+    sources: list[str],
+    model: str,
+    stats: PretranslateStats,
+) -> None:
+    """
+    Переводит и сохраняет пакет слов, которых ещё нет в БД.
+
+    Наличие переводов проверяется одним запросом, недостающие слова
+    переводятся одним запросом к ChatGPT и сохраняются одной вставкой.
+    Ошибка не прерывает работу: слова пакета будут переведены при следующем запуске.
+    """
+    pending = sources
+    try:
+        async with SessionLocal() as session:
+            existing_hashes = await TranslationDAO.find_existing_source_hashes(
+                session,
+                sources=[normalize_source(source) for source in sources],
+            )
+
+        pending = [
+            source
+            for source in sources
+            if get_source_hash(normalize_source(source)) not in existing_hashes
+        ]
+        stats.skipped += len(sources) - len(pending)
+        if not pending:
+            return
+
+        try:
+            batch_result = await chatgpt_client.translate_batch(
+                texts=pending,
+                model=model,
+            )
+        except ChatGPTError as e:
+            # Токены на ответ, который не удалось разобрать, тоже израсходованы
+            _count_tokens(stats, e.completion)
+            async with SessionLocal() as session:
+                await add_failed_llm_call(session, e, kind=LLMCallKind.PRETRANSLATE)
+            raise
+        completion = batch_result.completion
+        _count_tokens(stats, completion)
+
+        # Предварительные переводы ещё никто не просматривал
+        translation_objs = build_batch_translations(
+            sources=pending,
+            items=batch_result.items,
+            view_count=0,
+        )
+        async with SessionLocal() as session:
+            # Переводы, добавленные ботом за время запроса, не перезаписываются
+            db_translations = await TranslationDAO.upsert_many(
+                session,
+                translation_objs,
+                index_elements=["source_hash"],
+            )
+            await LLMCallDAO.add(
+                session,
+                build_llm_call(
+                    completion,
+                    kind=LLMCallKind.PRETRANSLATE,
+                    items=len(translation_objs),
+                ),
+            )
+            await session.commit()
+
+        stats.translated += len(db_translations)
+        stats.skipped += len(translation_objs) - len(db_translations)
+        stats.failed += len(pending) - len(translation_objs)
+    except Exception as e:
+        logger.error(f"Ошибка при переводе пакета из {len(pending)} слов: {e}")
+        stats.failed += len(pending)
+
+
+async def pretranslate(
+    *,
+    path: Path,
+    model: str,
+    batch_size: int,
+    concurrency: int,
+    token_budget: int | None = None,
+    api_base_url: str | None = None,
+    progress_interval: float = 10.0,
+) -> PretranslateStats:
+    """
+    Переводит слова из файла и сохраняет переводы в БД.
+
+    Args:
+        path: Путь к файлу со словами
+        model: Название модели ChatGPT
+        batch_size: Количество слов в одном запросе к ChatGPT
+        concurrency: Максимальное количество одновременных запросов к ChatGPT
+        token_budget: Максимальный расход токенов. Проверяется перед отправкой
+            очередного пакета, поэтому может быть превышен на расход запросов,
+            которые уже выполняются
+        api_base_url: Адрес API вместо OPENAI_API_BASE_URL
+        progress_interval: Интервал вывода прогресса в секундах
+
+    Returns:
+        Итоговые счетчики прогресса
+    """
+    chatgpt_client = create_chatgpt_client(api_base_url=api_base_url)
+    await chatgpt_client.start()
+
+    stats = PretranslateStats()
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks: set[asyncio.Task[None]] = set()
+    last_report_at = time.monotonic()
+
+    async def run_batch(sources: list[str]) -> None:
+        try:
+            await _pretranslate_batch(
+                chatgpt_client=chatgpt_client,
+                sources=sources,
+                model=model,
+                stats=stats,
+            )
+        finally:
+            semaphore.release()
+
+    try:
+        for sources in _read_batches(path, batch_size=batch_size, stats=stats):
+            # Не читаем файл дальше, пока все слоты для запросов заняты
+            await semaphore.acquire()
+            if token_budget is not None and stats.tokens >= token_budget:
+                semaphore.release()
+                logger.warning(f"Исчерпан бюджет токенов: {stats.tokens}")
+                break
+
+            task = asyncio.create_task(run_batch(sources))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+            if time.monotonic() - last_report_at >= progress_interval:
+                logger.info(f"Прогресс: {stats.summary()}")
+                last_report_at = time.monotonic()
+
+        await asyncio.gather(*tasks)
+    finally:
+        await chatgpt_client.close()
+        await engine.dispose()
+
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Предварительный перевод слов из файла с сохранением в БД",
+    )
+    parser.add_argument("path", type=Path, help="Файл со словами, по одному в строке")
+    parser.add_argument(
+        "--model",
+        default=settings.OPENAI_MODEL_NAME,
+        help="Модель ChatGPT (по умолчанию OPENAI_MODEL_NAME)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=20,
+        help="Количество слов в одном запросе к ChatGPT",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Максимальное количество одновременных запросов к ChatGPT",
+    )
+    parser.add_argument(
+        "--token-budget",
+        type=int,
+        default=None,
+        help="Остановиться после расхода указанного количества токенов",
+    )
+    parser.add_argument(
+        "--api-base-url",
+        default=None,
+        help="Адрес API вместо OPENAI_API_BASE_URL, например локального тестового сервера",
+    )
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=10.0,
+        help="Интервал вывода прогресса в секундах",
+    )
+    args = parser.parse_args()
+
+    if args.batch_size < 1 or args.concurrency < 1:
+        parser.error("--batch-size и --concurrency должны быть положительными")
+
+    logger.info(f"🚀 Предварительный перевод слов из файла {args.path}")
+    stats = asyncio.run(
+        pretranslate(
+            path=args.path,
+            model=args.model,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            token_budget=args.token_budget,
+            api_base_url=args.api_base_url,
+            progress_interval=args.progress_interval,
+        )
+    )
+    logger.info(f"✅ Готово: {stats.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,21 @@
-from app.schemas.translation import TranslationCreateSchema, TranslationUpdateSchema
+from app.schemas.llm_call import (
+    LLMCallCreateSchema,
+    LLMCallKind,
+    LLMCallUpdateSchema,
+)
+from app.schemas.translation import (
+    TranslationCreateSchema,
+    TranslationSchema,
+    TranslationSuggestionSchema,
+    TranslationUpdateSchema,
+)
 
 __all__ = [
+    "LLMCallCreateSchema",
+    "LLMCallKind",
+    "LLMCallUpdateSchema",
     "TranslationCreateSchema",
+    "TranslationSchema",
+    "TranslationSuggestionSchema",
     "TranslationUpdateSchema",
 ]
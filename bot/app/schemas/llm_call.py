@@ -0,0 +1,41 @@
+"""Схемы для работы с запросами к LLM."""
+
+from enum import StrEnum
+
+from pydantic import BaseModel, Field
+
+
+class LLMCallKind(StrEnum):
+    """Типы запросов к LLM."""
+
+    TRANSLATION = "translation"
+    BATCH = "batch"
+    PRETRANSLATE = "pretranslate"
+
+
+class LLMCallBaseSchema(BaseModel):
+    """Базовая схема для запроса к LLM."""
+
+    translation_id: int | None = Field(
+        default=None,
+        title="Идентификатор перевода, полученного в результате запроса",
+    )
+    kind: LLMCallKind = Field(..., title="Тип запроса")
+    model: str = Field(..., title="Модель, вернувшая ответ")
+    backend: str = Field(..., title="Бэкенд, вернувший ответ")
+    items: int = Field(default=1, title="Количество переведённых текстов")
+    prompt_tokens: int | None = Field(default=None, title="Токены запроса")
+    cached_tokens: int | None = Field(
+        default=None,
+        title="Токены запроса, прочитанные из кэша промптов",
+    )
+    completion_tokens: int | None = Field(default=None, title="Токены ответа")
+    latency_ms: int = Field(..., title="Время ответа в миллисекундах")
+
+
+class LLMCallCreateSchema(LLMCallBaseSchema):
+    """Схема для создания записи о запросе к LLM."""
+
+
+class LLMCallUpdateSchema(LLMCallBaseSchema):
+    """Схема для обновления записи о запросе к LLM."""
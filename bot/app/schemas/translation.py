@@ -1,13 +1,35 @@
 """Схемы для работы с переводами."""
 
-from pydantic import BaseModel, Field
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.integrations.chatgpt.schemas import TranslationArticle
 
 
 class TranslationBaseSchema(BaseModel):
     """Базовая схема для перевода."""
 
     source: str = Field(..., title="Исходный текст")
+    source_hash: str = Field(
+        ...,
+        title="SHA-256 нормализованного исходного текста",
+        min_length=64,
+        max_length=64,
+    )
+    lemma: str | None = Field(
+        default=None,
+        title="Начальная форма английского слова",
+    )
     translation: str = Field(..., title="Переведённый текст")
+    article: TranslationArticle | None = Field(
+        default=None,
+        title="Статья с переводом, если перевод получен в виде JSON",
+    )
+    is_brief: bool = Field(
+        default=False,
+        title="Краткий перевод: подробная статья ещё не запрашивалась",
+    )
     view_count: int = Field(
         default=1,
         title="Количество просмотров перевода",
@@ -20,3 +42,29 @@ class TranslationCreateSchema(TranslationBaseSchema):
 
 class TranslationUpdateSchema(TranslationBaseSchema):
     """Схема для обновления перевода."""
+
+
+class TranslationSchema(TranslationBaseSchema):
+    """Схема перевода, прочитанного из базы данных."""
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    id: int = Field(..., title="Идентификатор перевода")
+    created_at: datetime = Field(..., title="Дата и время создания")
+    requested_source: str | None = Field(
+        default=None,
+        title="Текст запроса, если перевод найден для другой формы слова",
+    )
+    model: str | None = Field(
+        default=None,
+        title="Модель, выполнившая перевод (если перевод получен только что)",
+    )
+
+
+class TranslationSuggestionSchema(BaseModel):
+    """Похожее сохранённое слово вместо перевода текста с возможной опечаткой."""
+
+    model_config = ConfigDict(frozen=True)
+
+    requested_source: str = Field(..., title="Нормализованный текст запроса")
+    suggested_source: str = Field(..., title="Похожее сохранённое слово")
@@ -0,0 +1,133 @@
+"""Сервис быстрой локальной проверки текста перед запросом перевода."""
+
+import re
+import unicodedata
+from collections import Counter
+from enum import StrEnum
+
+from app.config import settings
+
+
+class RejectReason(StrEnum):
+    """Причины, по которым текст не отправляется на перевод."""
+
+    EMPTY = "empty"
+    TOO_LONG = "too_long"
+    TOO_MANY_WORDS = "too_many_words"
+    TOO_MANY_LINES = "too_many_lines"
+    URL = "url"
+    NO_LETTERS = "no_letters"
+    ALREADY_RUSSIAN = "already_russian"
+    UNSUPPORTED_SCRIPT = "unsupported_script"
+
+
+REJECT_MESSAGES: dict[RejectReason, str] = {
+    RejectReason.EMPTY: "Отправьте английское слово или словосочетание для перевода.",
+    RejectReason.TOO_LONG: (
+        f"✂️ Слишком длинный текст. Отправьте слово или фразу "
+        f"не длиннее {settings.INPUT_MAX_LENGTH} символов "
+        f"(в списке — не длиннее в каждой строке)."
+    ),
+    RejectReason.TOO_MANY_WORDS: (
+        f"✂️ Слишком много слов. Отправьте слово или фразу "
+        f"не длиннее {settings.INPUT_MAX_WORDS} слов "
+        f"(в списке — не длиннее в каждой строке)."
+    ),
+    RejectReason.TOO_MANY_LINES: (
+        f"✂️ Слишком длинный список. Отправьте не больше "
+        f"{settings.INPUT_MAX_LINES} слов или фраз за раз."
+    ),
+    RejectReason.URL: "🔗 Ссылки не переводятся. Отправьте слово или фразу.",
+    RejectReason.NO_LETTERS: "🤔 В сообщении нет слов для перевода.",
+    RejectReason.ALREADY_RUSSIAN: "🇷🇺 Текст уже на русском языке.",
+    RejectReason.UNSUPPORTED_SCRIPT: (
+        "🌐 Поддерживается перевод только с английского языка."
+    ),
+}
+
+# Количество отклонённых сообщений по причинам с момента запуска бота
+reject_counter: Counter[RejectReason] = Counter()
+
+_URL_RE = re.compile(
+    r"(https?://|www\.)\S+|\b\S+\.(com|ru|org|net|io)\b", re.IGNORECASE
+)
+
+
+def split_lines(text: str) -> list[str]:
+    """Разбивает сообщение на непустые строки (слова или фразы списка)."""
+    return [line for line in text.splitlines() if line.strip()]
+
+
+def check_input(text: str) -> RejectReason | None:
+    """
+    Проверяет, стоит ли отправлять текст на перевод.
+
+    Проверка выполняется локально, без обращения к БД и ChatGPT: количество
+    строк, а для каждой строки (элемента списка слов) — длина, количество слов,
+    ссылки и алфавит (письменность) текста.
+
+    Args:
+        text: Текст сообщения пользователя
+
+    Returns:
+        Причина отклонения или None, если текст можно переводить
+    """
+    reason = _get_reject_reason(text)
+    if reason is not None:
+        reject_counter[reason] += 1
+    return reason
+
+
+def _get_reject_reason(text: str) -> RejectReason | None:
+    """Возвращает причину отклонения текста или None."""
+    lines = split_lines(text)
+    if not lines:
+        return RejectReason.EMPTY
+
+    if len(lines) > settings.INPUT_MAX_LINES:
+        return RejectReason.TOO_MANY_LINES
+
+    for line in lines:
+        reason = _get_line_reject_reason(line.strip())
+        if reason is not None:
+            return reason
+
+    return None
+
+
+def _get_line_reject_reason(text: str) -> RejectReason | None:
+    """Возвращает причину отклонения одной строки сообщения или None."""
+    if len(text) > settings.INPUT_MAX_LENGTH:
+        return RejectReason.TOO_LONG
+
+    if len(text.split()) > settings.INPUT_MAX_WORDS:
+        return RejectReason.TOO_MANY_WORDS
+
+    if _URL_RE.search(text):
+        return RejectReason.URL
+
+    latin_count = 0
+    cyrillic_count = 0
+    other_count = 0
+    for char in text:
+        if not char.isalpha():
+            continue
+
+        name = unicodedata.name(char, "")
+        if name.startswith("LATIN"):
+            latin_count += 1
+        elif name.startswith("CYRILLIC"):
+            cyrillic_count += 1
+        else:
+            other_count += 1
+
+    if latin_count + cyrillic_count + other_count == 0:
+        return RejectReason.NO_LETTERS
+
+    if cyrillic_count > latin_count:
+        return RejectReason.ALREADY_RUSSIAN
+
+    if latin_count == 0:
+        return RejectReason.UNSUPPORTED_SCRIPT
+
+    return None
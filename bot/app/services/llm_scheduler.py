@@ -0,0 +1,225 @@
+"""Планировщик запросов к LLM: ограничение параллельности и расхода токенов."""
+
+import asyncio
+import time
+from collections import Counter, OrderedDict, deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from app.utils import traced
+
+
+class _Waiter:
+    """Запрос, ожидающий разрешения на обращение к LLM."""
+
+    __slots__ = ("user_id", "tokens", "future", "enqueued_at")
+
+    def __init__(
+        self, *, user_id: int | None, tokens: int, future: asyncio.Future[None]
+    ):
+        self.user_id = user_id
+        self.tokens = tokens
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class LLMScheduler:
+    """
+    Планировщик запросов к LLM.
+
+    Ограничивает количество одновременных запросов (всего и на одного
+    пользователя) и выдаёт разрешения пользователям по очереди (round-robin):
+    поток сообщений одного пользователя не задерживает остальных.
+
+    Если задан лимит провайдера в токенах в минуту, разрешения выдаются из
+    "ведра" токенов (token bucket), которое пополняется со скоростью лимита.
+    Расход оценивается заранее и уточняется после ответа через `adjust_tokens`,
+    поэтому при нехватке токенов запросы ждут в очереди, а не получают 429.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int,
+        max_concurrency_per_user: int,
+        tokens_per_minute: int | None = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_concurrency_per_user = max_concurrency_per_user
+        self.tokens_per_minute = tokens_per_minute
+
+        # Очереди ожидающих запросов по пользователям в порядке обслуживания
+        self._queues: OrderedDict[int | None, deque[_Waiter]] = OrderedDict()
+        self._active = 0
+        self._active_by_user: Counter[int | None] = Counter()
+
+        self._tokens = float(tokens_per_minute or 0)
+        self._refilled_at = time.monotonic()
+        self._refill_handle: asyncio.TimerHandle | None = None
+
+        # Метрики
+        self.granted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.throttled = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Количество запросов, ожидающих разрешения."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    @property
+    def active(self) -> int:
+        """Количество выполняющихся запросов."""
+        return self._active
+
+    @property
+    def avg_wait(self) -> float:
+        """Среднее время ожидания разрешения в секундах."""
+        return self.total_wait / self.granted if self.granted else 0.0
+
+    @asynccontextmanager
+    async def slot(self, *, user_id: int | None, tokens: int) -> AsyncIterator[None]:
+        """
+        Ожидает разрешения на запрос к LLM и удерживает его на время блока.
+
+        Args:
+            user_id: Идентификатор пользователя, от имени которого выполняется запрос,
+                или None для служебных запросов
+            tokens: Оценка расхода токенов на запрос
+        """
+        await self._acquire(user_id=user_id, tokens=tokens)
+        try:
+            yield
+        finally:
+            self._release(user_id)
+
+    def adjust_tokens(self, delta: int) -> None:
+        """Уточняет расход токенов после ответа: `delta` = факт - оценка."""
+        if self.tokens_per_minute is None:
+            return
+
+        self._refill()
+        self._tokens -= delta
+        if delta < 0:
+            self._dispatch()
+
+    @traced("llm.queue")
+    async def _acquire(self, *, user_id: int | None, tokens: int) -> None:
+        """Ставит запрос в очередь пользователя и ожидает разрешения."""
+        if self.tokens_per_minute is not None:
+            # Запрос больше объёма ведра иначе ждал бы бесконечно
+            tokens = min(tokens, self.tokens_per_minute)
+
+        waiter = _Waiter(
+            user_id=user_id,
+            tokens=tokens,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._queues.setdefault(user_id, deque()).append(waiter)
+        self._dispatch()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Разрешение уже выдано, но запрос отменён до начала выполнения
+                self._release(user_id)
+            else:
+                self._remove(waiter)
+            raise
+
+    def _release(self, user_id: int | None) -> None:
+        """Освобождает разрешение и выдаёт его следующему запросу."""
+        self._active -= 1
+        self._active_by_user[user_id] -= 1
+        if self._active_by_user[user_id] <= 0:
+            del self._active_by_user[user_id]
+        self._dispatch()
+
+    def _remove(self, waiter: _Waiter) -> None:
+        """Удаляет отменённый запрос из очереди."""
+        queue = self._queues.get(waiter.user_id)
+        if queue is None or waiter not in queue:
+            return
+
+        queue.remove(waiter)
+        if not queue:
+            del self._queues[waiter.user_id]
+
+    def _next_waiter(self) -> _Waiter | None:
+        """Возвращает первый запрос пользователя, который может быть обслужен."""
+        for user_id, queue in self._queues.items():
+            if self._active_by_user[user_id] < self.max_concurrency_per_user:
+                return queue[0]
+        return None
+
+    def _dispatch(self) -> None:
+        """Выдаёт разрешения ожидающим запросам, пока позволяют лимиты."""
+        while self._active < self.max_concurrency:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            if waiter.future.done():
+                # Запрос отменён, но ещё не успел удалить себя из очереди
+                self._remove(waiter)
+                continue
+            if not self._take_tokens(waiter.tokens):
+                return
+
+            queue = self._queues[waiter.user_id]
+            queue.popleft()
+            if queue:
+                # Пользователь встаёт в конец очереди обслуживания
+                self._queues.move_to_end(waiter.user_id)
+            else:
+                del self._queues[waiter.user_id]
+
+            # Место считается занятым только после выдачи разрешения
+            waiter.future.set_result(None)
+            self._active += 1
+            self._active_by_user[waiter.user_id] += 1
+
+            wait = time.monotonic() - waiter.enqueued_at
+            self.granted += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def _refill(self) -> None:
+        """Пополняет ведро токенов за время, прошедшее с прошлого пополнения."""
+        assert self.tokens_per_minute is not None
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.tokens_per_minute),
+            self._tokens + (now - self._refilled_at) * self.tokens_per_minute / 60,
+        )
+        self._refilled_at = now
+
+    def _take_tokens(self, tokens: int) -> bool:
+        """
+        Списывает токены из ведра.
+
+        Если токенов недостаточно, планирует повторную выдачу разрешений
+        на момент, когда ведро пополнится, и возвращает False.
+        """
+        if self.tokens_per_minute is None:
+            return True
+
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+
+        if self._refill_handle is None:
+            self.throttled += 1
+            delay = (tokens - self._tokens) * 60 / self.tokens_per_minute
+            self._refill_handle = asyncio.get_running_loop().call_later(
+                delay,
+                self._on_refill,
+            )
+        return False
+
+    def _on_refill(self) -> None:
+        """Выдаёт разрешения после пополнения ведра токенов."""
+        self._refill_handle = None
+        self._dispatch()
@@ -0,0 +1,199 @@
+"""Сервис учёта расхода токенов и стоимости запросов к LLM."""
+
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import ModelPriceSettings, settings
+from app.db import LLMCallDAO
+from app.integrations.chatgpt.exceptions import ChatGPTError
+from app.integrations.chatgpt.schemas import CompletionResult
+from app.schemas import LLMCallCreateSchema, LLMCallKind
+
+# Количество дней в разбивке расходов по дням в /stats
+USAGE_STATS_DAYS = 7
+# Количество дней в итогах расходов по моделям в /stats: суммирование всей
+# таблицы llm_calls замедлялось бы по мере её роста
+USAGE_TOTAL_DAYS = 30
+
+
+def build_llm_call(
+    completion: CompletionResult,
+    *,
+    kind: LLMCallKind,
+    translation_id: int | None = None,
+    items: int = 1,
+) -> LLMCallCreateSchema:
+    """
+    Формирует запись о запросе к LLM из результата запроса.
+
+    Если API не вернул расход токенов (например, прокси не поддерживает
+    stream_options), токены сохраняются как NULL, а не как ноль.
+
+    Args:
+        completion (CompletionResult): Результат запроса к API.
+        kind (LLMCallKind): Тип запроса.
+        translation_id (int | None): Перевод, полученный в результате запроса.
+        items (int): Количество переведённых текстов.
+
+    Returns:
+        LLMCallCreateSchema: Данные новой записи.
+    """
+    usage = completion.usage
+    return LLMCallCreateSchema(
+        translation_id=translation_id,
+        kind=kind,
+        model=completion.model,
+        backend=completion.backend,
+        items=items,
+        prompt_tokens=usage.prompt_tokens if usage is not None else None,
+        cached_tokens=(
+            usage.prompt_tokens_details.cached_tokens if usage is not None else None
+        ),
+        completion_tokens=usage.completion_tokens if usage is not None else None,
+        latency_ms=round(completion.latency * 1000),
+    )
+
+
+async def add_failed_llm_call(
+    session: AsyncSession,
+    error: ChatGPTError,
+    *,
+    kind: LLMCallKind,
+) -> None:
+    """
+    Записывает запрос к LLM, ответ на который не удалось использовать.
+
+    Токены на такой запрос уже израсходованы (например, модель вернула
+    некорректный JSON или поток оборвался), поэтому он учитывается в расходах.
+    Запись фиксируется сразу, т.к. после этого вызывающий код пробрасывает ошибку.
+    Ошибки без полученного ответа не записываются.
+
+    Args:
+        session (AsyncSession): Объект сессии базы данных.
+        error (ChatGPTError): Ошибка запроса к API.
+        kind (LLMCallKind): Тип запроса.
+    """
+    if error.completion is None:
+        return
+
+    await LLMCallDAO.add(
+        session,
+        build_llm_call(error.completion, kind=kind, items=0),
+    )
+    await session.commit()
+
+
+def get_model_prices(model: str) -> ModelPriceSettings | None:
+    """Находит цены модели по самому длинному совпадающему префиксу названия."""
+    matches = [name for name in settings.OPENAI_MODEL_PRICES if model.startswith(name)]
+    if not matches:
+        return None
+    return settings.OPENAI_MODEL_PRICES[max(matches, key=len)]
+
+
+def estimate_cost(
+    model: str,
+    *,
+    prompt_tokens: int,
+    cached_tokens: int,
+    completion_tokens: int,
+) -> float | None:
+    """
+    Оценивает стоимость запросов по ценам из OPENAI_MODEL_PRICES.
+
+    Returns:
+        float | None: Стоимость или None, если цены модели неизвестны.
+    """
+    prices = get_model_prices(model)
+    if prices is None:
+        return None
+
+    return (
+        (prompt_tokens - cached_tokens) * prices.input
+        + cached_tokens * prices.cached_input
+        + completion_tokens * prices.output
+    ) / 1_000_000
+
+
+def _format_usage(
+    model: str,
+    *,
+    calls: int,
+    items: int,
+    prompt_tokens: int,
+    cached_tokens: int,
+    completion_tokens: int,
+) -> str:
+    """Форматирует расход модели одной строкой."""
+    cost = estimate_cost(
+        model,
+        prompt_tokens=prompt_tokens,
+        cached_tokens=cached_tokens,
+        completion_tokens=completion_tokens,
+    )
+    cost_str = (
+        f"{settings.OPENAI_PRICE_CURRENCY}{cost:.4f}"
+        if cost is not None
+        else "цена неизвестна"
+    )
+    cached_pct = cached_tokens / prompt_tokens * 100.0 if prompt_tokens else 0.0
+    return (
+        f"{model}: запросов {calls}, текстов {items}, "
+        f"токенов {prompt_tokens} + {completion_tokens} "
+        f"(из кэша {cached_tokens}, {cached_pct:.0f}%), {cost_str}"
+    )
+
+
+async def get_usage_stats_lines(*, session: AsyncSession) -> list[str]:
+    """
+    Возвращает строки статистики расходов на LLM для /stats.
+
+    Включает расход по дням за последние USAGE_STATS_DAYS дней и по моделям
+    за последние USAGE_TOTAL_DAYS дней.
+    """
+    now = datetime.now(UTC)
+    daily_rows = await LLMCallDAO.get_usage_by_day_and_model(
+        session, since=now - timedelta(days=USAGE_STATS_DAYS)
+    )
+    total_rows = await LLMCallDAO.get_usage_by_model(
+        session, since=now - timedelta(days=USAGE_TOTAL_DAYS)
+    )
+    if not total_rows:
+        return []
+
+    lines: list[str] = []
+    lines.append(f"Расходы на ChatGPT за {USAGE_STATS_DAYS} дней:")
+    for day, model, calls, items, prompt, cached, completion in daily_rows:
+        usage = _format_usage(
+            model,
+            calls=calls,
+            items=items,
+            prompt_tokens=prompt,
+            cached_tokens=cached,
+            completion_tokens=completion,
+        )
+        lines.append(f"- {day:%Y-%m-%d} {usage}")
+
+    lines.append("")
+    lines.append(f"Расходы на ChatGPT за {USAGE_TOTAL_DAYS} дней:")
+    for model, calls, items, prompt, cached, completion in total_rows:
+        usage = _format_usage(
+            model,
+            calls=calls,
+            items=items,
+            prompt_tokens=prompt,
+            cached_tokens=cached,
+            completion_tokens=completion,
+        )
+        lines.append(f"- {usage}")
+
+    # Доля входных токенов, прочитанных из кэша промптов, по всем моделям
+    prompt_total = sum(prompt for _, _, _, prompt, _, _ in total_rows)
+    cached_total = sum(cached for _, _, _, _, cached, _ in total_rows)
+    if prompt_total:
+        lines.append(
+            f"Попадания в кэш промптов: {cached_total / prompt_total * 100.0:.1f}% "
+            f"({cached_total} из {prompt_total} токенов запроса)"
+        )
+    return lines
@@ -1,16 +1,108 @@
 """Сервис для работы с переводами и статистикой."""
 
-from collections.abc import Sequence
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Sequence
 from datetime import datetime
 
+import sentry_sdk
 from loguru import logger
 from sqlalchemy import Row, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import TranslationDAO
-from app.integrations.chatgpt import ChatGPTClient
+from app.config import settings
+from app.db import LLMCallDAO, SessionLocal, TranslationDAO
+from app.integrations.chatgpt import ChatGPTClient, ChatGPTError
+from app.integrations.chatgpt.schemas import (
+    BatchTranslationItem,
+    CompletionResult,
+    TranslationArticle,
+    TranslationResult,
+)
+from app.metrics import TRANSLATION_CACHE_REQUESTS, TRANSLATION_LOOKUP_DURATION
 from app.models import TranslationModel
-from app.schemas import TranslationCreateSchema
+from app.schemas import (
+    LLMCallKind,
+    TranslationCreateSchema,
+    TranslationSchema,
+    TranslationSuggestionSchema,
+)
+from app.services.input_gate import reject_counter
+from app.services.llm_scheduler import LLMScheduler
+from app.services.llm_usage import (
+    add_failed_llm_call,
+    build_llm_call,
+    get_usage_stats_lines,
+)
+from app.services.translation_renderer import render_article
+from app.services.view_counter import ViewCountBuffer
+from app.utils import (
+    BKTree,
+    SingleFlight,
+    TTLCache,
+    clean_text,
+    get_lemma_candidates,
+    get_source_hash,
+    lemmatize,
+    normalize_source,
+    traced,
+)
+
+# Кэш переводов по нормализованному исходному тексту. Хранит неизменяемые снимки
+# записей, чтобы популярные слова не требовали SELECT к БД.
+translation_cache: TTLCache[str, TranslationSchema] = TTLCache(
+    max_size=settings.TRANSLATION_CACHE_MAX_SIZE,
+    ttl=settings.TRANSLATION_CACHE_TTL,
+)
+TRANSLATION_CACHE_REQUESTS.set_function(lambda: translation_cache.hits, result="hit")
+TRANSLATION_CACHE_REQUESTS.set_function(lambda: translation_cache.misses, result="miss")
+
+# Соответствие формы слова исходному тексту перевода её начальной формы
+lemma_aliases: TTLCache[str, str] = TTLCache(
+    max_size=settings.TRANSLATION_CACHE_MAX_SIZE,
+    ttl=settings.TRANSLATION_CACHE_TTL,
+)
+
+# Индекс исходных текстов отдельных слов для поиска переводов слов с опечатками
+fuzzy_index = BKTree()
+
+# Одновременные запросы одного и того же нового текста выполняют один запрос
+# к ChatGPT и одну вставку в БД
+translation_flights: SingleFlight[str, TranslationSchema | None] = SingleFlight()
+
+# Одновременные запросы подробной статьи для одного перевода (например, двойное
+# нажатие кнопки "Подробнее") выполняют один запрос к ChatGPT
+detailed_translation_flights: SingleFlight[int, TranslationSchema | None] = (
+    SingleFlight()
+)
+
+# Планировщик запросов к ChatGPT: ограничивает параллельность и расход токенов,
+# обслуживая пользователей по очереди
+llm_scheduler = LLMScheduler(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    max_concurrency_per_user=settings.LLM_MAX_CONCURRENCY_PER_USER,
+    tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+)
+
+# Кэш готового текста статистики
+STATS_CACHE_KEY = "stats"
+stats_cache: TTLCache[str, str] = TTLCache(max_size=1, ttl=settings.STATS_CACHE_TTL)
+
+
+def _on_view_counts_flushed(db_translations: Sequence[TranslationModel]) -> None:
+    """Обновляет снимки в кэше после записи счетчиков просмотров в БД."""
+    for db_translation in db_translations:
+        _cache_translation(db_translation)
+
+
+# Буфер отложенной записи счетчиков просмотров (используется, если включен
+# режим VIEW_COUNT_WRITE_BEHIND)
+view_count_buffer = ViewCountBuffer(
+    session_factory=SessionLocal,
+    flush_interval=settings.VIEW_COUNT_FLUSH_INTERVAL,
+    flush_max_events=settings.VIEW_COUNT_FLUSH_MAX_EVENTS,
+    on_flush=_on_view_counts_flushed,
+)
 
 
 async def get_translation(
@@ -19,89 +111,993 @@ async def get_translation(
     chatgpt_client: ChatGPTClient,
     source: str,
     model: str,
-) -> TranslationModel | None:
+    on_partial: Callable[[str], Awaitable[None]] | None = None,
+    allow_approximate: bool = True,
+    user_id: int | None = None,
+) -> TranslationSchema | TranslationSuggestionSchema | None:
     """
-    Получает перевод из базы данных по исходному тексту.
+    Получает перевод из кэша, базы данных или от ChatGPT.
+
+    Если перевода нет, но сохранено похожее слово (возможна опечатка), ChatGPT
+    не вызывается: возвращается подсказка, а перевод текста как есть
+    запрашивается только по выбору пользователя.
 
     Args:
         session (AsyncSession): Объект сессии базы данных.
         source (str): Исходный текст.
+        on_partial (Callable | None): Если задан, перевод от ChatGPT запрашивается
+            в потоковом режиме, и функция вызывается с накопленным текстом
+            по мере получения фрагментов.
+        allow_approximate (bool): Разрешить показ перевода другой формы слова
+            вместо перевода текста как есть и подсказку похожего слова.
+        user_id (int | None): Пользователь, для которого выполняется запрос
+            к ChatGPT (для справедливой очереди запросов).
 
     Returns:
-        TranslationModel | None: Найденная модель перевода или None.
+        TranslationSchema | TranslationSuggestionSchema | None: Найденный
+            перевод, подсказка похожего слова или None.
     """
     if source is None or source.strip() == "":
         return None
 
-    # Сначала пробуем найти перевод по исходному тексту в БД
-    db_translation = await TranslationDAO.find_one_or_none(
+    # "Run ", "RUN!" и "run" с неразрывным пробелом — один и тот же перевод
+    normalized_source = normalize_source(source)
+    if normalized_source == "":
+        return None
+
+    started_at = time.perf_counter()
+    translation = await _find_and_register_view(
         session=session,
-        source=source.lower(),
+        source=normalized_source,
     )
+    if translation is not None:
+        _observe_lookup(started_at, result="stored")
+        return translation
 
-    if db_translation is not None:
-        logger.debug(f"Найден перевод в БД для текста: {source}")
-        # Увеличиваем счетчик просмотров
-        db_translation.view_count += 1
+    if allow_approximate:
+        # "running", "ran" и "runs" можно показать по статье для "run"
+        translation = await _find_by_lemma(session=session, source=normalized_source)
+        if translation is not None:
+            _observe_lookup(started_at, result="lemma")
+            return translation
+
+        # "work" и "word" — разные слова, поэтому похожее сохранённое слово
+        # только предлагается, а платный запрос к ChatGPT откладывается
+        # до выбора пользователя
+        suggested_source = _find_similar_source(normalized_source)
+        if suggested_source is not None:
+            _observe_lookup(started_at, result="suggestion")
+            return TranslationSuggestionSchema(
+                requested_source=normalized_source,
+                suggested_source=suggested_source,
+            )
+
+    # Если перевод не найден, то нужно сделать перевод и сохранить его в БД.
+    # Одинаковые одновременные запросы ждут результата первого из них.
+    translation, shared = await translation_flights.do(
+        normalized_source,
+        lambda: _translate_and_add(
+            session=session,
+            chatgpt_client=chatgpt_client,
+            source=clean_text(source),
+            model=model,
+            on_partial=on_partial,
+            user_id=user_id,
+        ),
+    )
+
+    if shared and translation is not None:
+        logger.debug(f"Получен перевод из параллельного запроса для текста: {source}")
+        # Перевод добавил другой обработчик, засчитываем текущий просмотр
+        translation = (
+            await _find_and_register_view(session=session, source=translation.source)
+            or translation
+        )
+        _observe_lookup(started_at, result="shared")
+    else:
+        _observe_lookup(
+            started_at,
+            result="llm" if translation is not None else "empty",
+        )
+    return translation
+
+
+def _observe_lookup(started_at: float, *, result: str) -> None:
+    """Учитывает время получения перевода и его источник в метриках."""
+    TRANSLATION_LOOKUP_DURATION.labels(result=result).observe(
+        time.perf_counter() - started_at
+    )
+
+
+async def get_detailed_translation(
+    *,
+    session: AsyncSession,
+    chatgpt_client: ChatGPTClient,
+    translation_id: int,
+    model: str,
+    user_id: int | None = None,
+) -> TranslationSchema | None:
+    """
+    Получает подробную статью для перевода, сохранённого кратко.
+
+    Статья запрашивается у ChatGPT только один раз и заменяет краткий перевод
+    в БД, поэтому следующие просмотры сразу показывают подробную статью.
+
+    Args:
+        session (AsyncSession): Объект сессии базы данных.
+        chatgpt_client (ChatGPTClient): Клиент ChatGPT.
+        translation_id (int): Идентификатор перевода.
+        model (str): Название модели ChatGPT.
+        user_id (int | None): Пользователь, для которого выполняется запрос
+            к ChatGPT.
+
+    Returns:
+        TranslationSchema | None: Перевод с подробной статьёй или None, если
+            перевод не найден.
+    """
+    db_translation = await TranslationDAO.find_one_or_none(session, id=translation_id)
+    # Освобождаем соединение с БД на время возможного запроса к ChatGPT
+    await session.commit()
+    if db_translation is None:
+        return None
+    if not db_translation.is_brief:
+        return TranslationSchema.model_validate(db_translation)
+
+    translation, _ = await detailed_translation_flights.do(
+        translation_id,
+        lambda: _translate_and_replace_brief(
+            session=session,
+            chatgpt_client=chatgpt_client,
+            translation_id=translation_id,
+            source=db_translation.source,
+            model=model,
+            user_id=user_id,
+        ),
+    )
+    return translation
+
+
+async def _translate_and_replace_brief(
+    *,
+    session: AsyncSession,
+    chatgpt_client: ChatGPTClient,
+    translation_id: int,
+    source: str,
+    model: str,
+    user_id: int | None = None,
+) -> TranslationSchema | None:
+    """
+    Запрашивает подробную статью и заменяет ею краткий перевод в БД и кэше.
+
+    Args:
+        session (AsyncSession): Объект сессии базы данных.
+        chatgpt_client (ChatGPTClient): Клиент ChatGPT.
+        translation_id (int): Идентификатор краткого перевода.
+        source (str): Исходный текст перевода.
+        model (str): Название модели ChatGPT.
+        user_id (int | None): Пользователь, для которого выполняется запрос.
+
+    Returns:
+        TranslationSchema | None: Перевод с подробной статьёй или None, если
+            перевод удалён.
+    """
+    translation_result = await _request_article(
+        session=session,
+        chatgpt_client=chatgpt_client,
+        source=source,
+        model=model,
+        user_id=user_id,
+    )
+    completion = translation_result.completion
+
+    # Условие на is_brief не даёт перезаписать статью, уже полученную другим
+    # процессом бота
+    db_translation = await TranslationDAO.update(
+        session,
+        TranslationModel.id == translation_id,
+        TranslationModel.is_brief.is_(True),
+        obj_in={
+            "translation": render_article(translation_result.article),
+            "article": translation_result.article.model_dump(),
+            "is_brief": False,
+        },
+    )
+    await LLMCallDAO.add(
+        session,
+        build_llm_call(
+            completion,
+            kind=LLMCallKind.TRANSLATION,
+            translation_id=translation_id,
+        ),
+    )
+    await session.commit()
+
+    if db_translation is None:
+        db_translation = await TranslationDAO.find_one_or_none(
+            session,
+            id=translation_id,
+        )
         await session.commit()
-        await session.refresh(db_translation)
-        return db_translation
+        if db_translation is None:
+            return None
+
+    logger.debug(f"Добавлена подробная статья для текста: {source}")
+    translation = _register_added_translation(db_translation)
+    return translation.model_copy(update={"model": completion.model})
+
+
+async def get_translations_batch(
+    *,
+    session: AsyncSession,
+    chatgpt_client: ChatGPTClient,
+    sources: list[str],
+    model: str,
+    user_id: int | None = None,
+) -> list[TranslationSchema]:
+    """
+    Получает переводы списка слов или фраз.
+
+    Сохранённые переводы находятся одним запросом к БД, а все недостающие
+    переводятся одним запросом к ChatGPT и сохраняются одной вставкой.
+
+    Args:
+        session (AsyncSession): Объект сессии базы данных.
+        chatgpt_client (ChatGPTClient): Клиент ChatGPT.
+        sources (list[str]): Исходные тексты.
+        model (str): Название модели ChatGPT.
+        user_id (int | None): Пользователь, для которого выполняется запрос
+            к ChatGPT.
 
-    # Если перевод не найдет, то нужно сделать перевод и сохранить его в БД
-    translated_text = await chatgpt_client.translate_text(text=source, model=model)
+    Returns:
+        list[TranslationSchema]: Найденные переводы в порядке исходных текстов,
+            без повторов и без текстов, которые не удалось перевести.
+    """
+    # Нормализованный текст -> очищенный текст для запроса к ChatGPT
+    cleaned_sources: dict[str, str] = {}
+    for source in sources:
+        normalized_source = normalize_source(source)
+        if normalized_source != "" and normalized_source not in cleaned_sources:
+            cleaned_sources[normalized_source] = clean_text(source)
+
+    if not cleaned_sources:
+        return []
+
+    translations = await _find_and_register_views(
+        session=session,
+        sources=list(cleaned_sources),
+    )
+
+    missing_sources = [
+        cleaned_sources[source]
+        for source in cleaned_sources
+        if source not in translations
+    ]
+    if missing_sources:
+        translations.update(
+            await _translate_and_add_batch(
+                session=session,
+                chatgpt_client=chatgpt_client,
+                sources=missing_sources,
+                model=model,
+                user_id=user_id,
+            )
+        )
+
+    return [
+        translations[source] for source in cleaned_sources if source in translations
+    ]
+
+
+async def _translate_and_add(
+    *,
+    session: AsyncSession,
+    chatgpt_client: ChatGPTClient,
+    source: str,
+    model: str,
+    on_partial: Callable[[str], Awaitable[None]] | None = None,
+    user_id: int | None = None,
+) -> TranslationSchema | None:
+    """
+    Переводит текст с помощью ChatGPT и сохраняет перевод в БД и кэш.
+
+    Args:
+        session (AsyncSession): Объект сессии базы данных.
+        chatgpt_client (ChatGPTClient): Клиент ChatGPT.
+        source (str): Исходный текст.
+        model (str): Название модели ChatGPT.
+        on_partial (Callable | None): Функция для получения накопленного текста
+            при потоковом переводе. Если не задана, перевод запрашивается
+            в виде статьи в JSON и оформляется локально.
+        user_id (int | None): Пользователь, для которого выполняется запрос.
+
+    Returns:
+        TranslationSchema | None: Сохранённый перевод или None.
+    """
+    article: TranslationArticle | None = None
+    is_brief = False
+    if on_partial is None:
+        translation_result = await _request_article(
+            session=session,
+            chatgpt_client=chatgpt_client,
+            source=source,
+            model=model,
+            brief=settings.TRANSLATION_BRIEF_FIRST,
+            user_id=user_id,
+        )
+        completion = translation_result.completion
+        article = translation_result.article
+        is_brief = translation_result.brief
+        translated_text = render_article(article)
+    else:
+        estimated_tokens = chatgpt_client.estimate_translation_tokens(source)
+        try:
+            async with llm_scheduler.slot(user_id=user_id, tokens=estimated_tokens):
+                completion = await chatgpt_client.translate_text_stream(
+                    text=source,
+                    model=model,
+                    on_partial=on_partial,
+                )
+        except ChatGPTError as e:
+            await add_failed_llm_call(session, e, kind=LLMCallKind.TRANSLATION)
+            raise
+        _adjust_reserved_tokens(
+            chatgpt_client,
+            source=source,
+            completion=completion,
+            estimated_tokens=estimated_tokens,
+        )
+        translated_text = completion.text
 
     db_translation = await _add_translation(
         session=session,
         source=source,
         translation=translated_text,
+        article=article,
+        is_brief=is_brief,
+        completion=completion,
     )
-    if db_translation is not None:
-        logger.debug(f"Добавлен новый перевод в БД для текста: {source}")
+    if db_translation is None:
+        return None
 
-    return db_translation
+    logger.debug(f"Добавлен новый перевод в БД для текста: {source}")
+    translation = _register_added_translation(db_translation)
+    return translation.model_copy(update={"model": completion.model})
+
+
+def _adjust_reserved_tokens(
+    chatgpt_client: ChatGPTClient,
+    *,
+    source: str,
+    completion: CompletionResult,
+    estimated_tokens: int,
+    article: bool = False,
+    brief: bool = False,
+) -> None:
+    """
+    Уточняет резерв токенов в планировщике по фактическому расходу запроса,
+    а если провайдер его не сообщил, то по длине полученного ответа.
+    """
+    if completion.usage is not None and completion.usage.total_tokens is not None:
+        actual_tokens = completion.usage.total_tokens
+    else:
+        actual_tokens = chatgpt_client.estimate_translation_tokens(
+            source,
+            completion=completion.text,
+            article=article,
+            brief=brief,
+        )
+    llm_scheduler.adjust_tokens(actual_tokens - estimated_tokens)
+
+
+async def _request_article(
+    *,
+    session: AsyncSession,
+    chatgpt_client: ChatGPTClient,
+    source: str,
+    model: str,
+    brief: bool = False,
+    user_id: int | None = None,
+) -> TranslationResult:
+    """
+    Запрашивает статью перевода через планировщик запросов к ChatGPT.
 
+    Если ответ не получен за время, обычное для недавних запросов, отправляется
+    дублирующий запрос и используется первый успешный ответ. Дублирующий запрос
+    получает своё место в планировщике и свой резерв токенов, поэтому не обходит
+    ограничения параллельности и лимит токенов. Ответы проигравших запросов,
+    успевшие прийти, записываются в сессию как запросы к ChatGPT без перевода:
+    токены на них израсходованы. Сессию фиксирует вызывающий код. Ответы,
+    которые не удалось разобрать, записываются и фиксируются сразу.
+
+    Args:
+        session (AsyncSession): Объект сессии базы данных.
+        chatgpt_client (ChatGPTClient): Клиент ChatGPT.
+        source (str): Исходный текст.
+        model (str): Название модели ChatGPT.
+        brief (bool): Запросить краткую статью.
+        user_id (int | None): Пользователь, для которого выполняется запрос.
+
+    Returns:
+        TranslationResult: Статья с переводом и данные запроса к API.
+    """
+    estimated_tokens = chatgpt_client.estimate_translation_tokens(
+        source,
+        article=True,
+        brief=brief,
+    )
+    # Время ожидания ответа отсчитывается с момента получения места в
+    # планировщике, а не с постановки в очередь
+    primary_started = asyncio.Event()
+    answered = asyncio.Event()
+
+    async def request(*, hedge: bool) -> TranslationResult:
+        async with llm_scheduler.slot(user_id=user_id, tokens=estimated_tokens):
+            if hedge:
+                if answered.is_set():
+                    # Ответ получен, пока дублирующий запрос ждал места
+                    raise asyncio.CancelledError
+                chatgpt_client.record_hedge()
+                logger.debug(f"Отправлен дублирующий запрос перевода: {source}")
+            else:
+                primary_started.set()
+            translation_result = await chatgpt_client.translate_text(
+                text=source,
+                model=model,
+                brief=brief,
+            )
+            answered.set()
+        _adjust_reserved_tokens(
+            chatgpt_client,
+            source=source,
+            completion=translation_result.completion,
+            estimated_tokens=estimated_tokens,
+            article=True,
+            brief=brief,
+        )
+        return translation_result
+
+    primary = asyncio.create_task(request(hedge=False))
+    tasks = {primary}
+    try:
+        hedge_delay = chatgpt_client.get_hedge_delay()
+        if hedge_delay is not None:
+            started = asyncio.create_task(primary_started.wait())
+            await asyncio.wait({primary, started}, return_when=asyncio.FIRST_COMPLETED)
+            started.cancel()
+
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if not done and chatgpt_client.hedge_budget_allows():
+                tasks.add(asyncio.create_task(request(hedge=True)))
+
+        winner = await _first_successful(tasks, primary=primary)
+    finally:
+        # Проигравший запрос отменяется, его ошибка уже не важна
+        for task in tasks:
+            if task.done() and not task.cancelled():
+                task.exception()
+            task.cancel()
+
+    if winner is not primary:
+        chatgpt_client.record_hedge_win()
+    for task in tasks:
+        if task is winner or not task.done() or task.cancelled():
+            continue
+        error = task.exception()
+        if error is None:
+            await LLMCallDAO.add(
+                session,
+                build_llm_call(
+                    task.result().completion,
+                    kind=LLMCallKind.TRANSLATION,
+                ),
+            )
+        elif isinstance(error, ChatGPTError):
+            await add_failed_llm_call(session, error, kind=LLMCallKind.TRANSLATION)
+
+    # Если все запросы завершились ошибкой, пробрасывается ошибка основного
+    error = winner.exception()
+    if isinstance(error, ChatGPTError):
+        await add_failed_llm_call(session, error, kind=LLMCallKind.TRANSLATION)
+    return winner.result()
+
+
+async def _first_successful(
+    tasks: set[asyncio.Task[TranslationResult]],
+    *,
+    primary: asyncio.Task[TranslationResult],
+) -> asyncio.Task[TranslationResult]:
+    """
+    Ожидает первый успешный из нескольких одинаковых запросов.
+
+    Если все запросы завершились ошибкой, возвращается основной запрос:
+    его результат пробросит ошибку.
+    """
+    pending = set(tasks)
+    while pending:
+        done, pending = await asyncio.wait(
+            pending,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        for task in done:
+            if not task.cancelled() and task.exception() is None:
+                return task
+
+    return primary
+
+
+async def _find_and_register_views(
+    *,
+    session: AsyncSession,
+    sources: list[str],
+) -> dict[str, TranslationSchema]:
+    """
+    Находит сохранённые переводы нескольких текстов и засчитывает их просмотры.
+
+    Пакетный аналог `_find_and_register_view`: вместо запроса на каждый текст
+    выполняется один UPDATE ... FROM (VALUES ...) RETURNING, а в режиме
+    отложенной записи — один SELECT ... WHERE source_hash IN (...) для текстов,
+    которых нет в кэше.
+
+    Args:
+        session (AsyncSession): Объект сессии базы данных.
+        sources (list[str]): Нормализованные исходные тексты без повторов.
+
+    Returns:
+        dict[str, TranslationSchema]: Найденные переводы по исходному тексту.
+    """
+    # Сопоставление по хэшу, т.к. исходный текст старых записей может
+    # отличаться от нормализованного
+    sources_by_hash = {get_source_hash(source): source for source in sources}
+
+    if not settings.VIEW_COUNT_WRITE_BEHIND:
+        db_translations = await TranslationDAO.bulk_increment_view_count(
+            session,
+            amounts={source: 1 for source in sources},
+        )
+        await session.commit()
+        return {
+            sources_by_hash[db_translation.source_hash]: _cache_translation(
+                db_translation
+            )
+            for db_translation in db_translations
+        }
 
+    translations: dict[str, TranslationSchema] = {}
+    uncached_sources: list[str] = []
+    for source in sources:
+        cached_translation = translation_cache.get(source)
+        if cached_translation is None:
+            uncached_sources.append(source)
+        else:
+            translations[source] = cached_translation
+
+    if uncached_sources:
+        db_translations = await TranslationDAO.find_by_sources(
+            session,
+            sources=uncached_sources,
+        )
+        # Завершаем читающую транзакцию, не сбрасывая загруженные атрибуты
+        await session.commit()
+        for db_translation in db_translations:
+            translations[sources_by_hash[db_translation.source_hash]] = (
+                _cache_translation(db_translation)
+            )
+
+    for source, translation in translations.items():
+        view_count_buffer.add(translation.source)
+        translations[source] = translation.model_copy(
+            update={
+                "view_count": translation.view_count
+                + view_count_buffer.pending(translation.source)
+            }
+        )
+
+    return translations
+
+
+async def _translate_and_add_batch(
+    *,
+    session: AsyncSession,
+    chatgpt_client: ChatGPTClient,
+    sources: list[str],
+    model: str,
+    user_id: int | None = None,
+) -> dict[str, TranslationSchema]:
+    """
+    Переводит несколько текстов одним запросом к ChatGPT и сохраняет их одной вставкой.
+
+    Args:
+        session (AsyncSession): Объект сессии базы данных.
+        chatgpt_client (ChatGPTClient): Клиент ChatGPT.
+        sources (list[str]): Очищенные исходные тексты с разным нормализованным видом.
+        model (str): Название модели ChatGPT.
+        user_id (int | None): Пользователь, для которого выполняется запрос.
+
+    Returns:
+        dict[str, TranslationSchema]: Сохранённые переводы по нормализованному
+            исходному тексту.
+    """
+    estimated_tokens = chatgpt_client.estimate_batch_tokens(sources)
+    try:
+        async with llm_scheduler.slot(user_id=user_id, tokens=estimated_tokens):
+            batch_result = await chatgpt_client.translate_batch(
+                texts=sources,
+                model=model,
+            )
+    except ChatGPTError as e:
+        await add_failed_llm_call(session, e, kind=LLMCallKind.BATCH)
+        raise
+    completion = batch_result.completion
+    if completion.usage is not None and completion.usage.total_tokens is not None:
+        llm_scheduler.adjust_tokens(completion.usage.total_tokens - estimated_tokens)
+
+    translation_objs = build_batch_translations(
+        sources=sources,
+        items=batch_result.items,
+    )
+
+    db_translations = await TranslationDAO.add_many_or_increment_view_count(
+        session,
+        translation_objs,
+    )
+    await LLMCallDAO.add(
+        session,
+        build_llm_call(
+            completion,
+            kind=LLMCallKind.BATCH,
+            items=len(translation_objs),
+        ),
+    )
+    await session.commit()
+
+    logger.debug(f"Добавлено новых переводов в БД: {len(db_translations)}")
+    sources_by_hash = {obj.source_hash: obj.source for obj in translation_objs}
+    return {
+        sources_by_hash[db_translation.source_hash]: _register_added_translation(
+            db_translation
+        )
+        for db_translation in db_translations
+    }
+
+
+def build_batch_translations(
+    *,
+    sources: list[str],
+    items: list[BatchTranslationItem],
+    view_count: int = 1,
+) -> list[TranslationCreateSchema]:
+    """
+    Сопоставляет ответ ChatGPT на пакетный перевод с исходными текстами.
+
+    Args:
+        sources (list[str]): Исходные тексты в порядке запроса.
+        items (list[BatchTranslationItem]): Переводы из ответа ChatGPT.
+        view_count (int): Начальное значение счетчика просмотров.
+
+    Returns:
+        list[TranslationCreateSchema]: Данные новых переводов для текстов,
+            которые удалось перевести, без повторов.
+    """
+    normalized_sources = list(dict.fromkeys(normalize_source(s) for s in sources))
+    translated_texts = {
+        normalize_source(item.source): item.translation.strip() for item in items
+    }
+    # Модель может изменить написание элемента, тогда сопоставляем по порядку
+    if len(items) == len(normalized_sources) and not all(
+        source in translated_texts for source in normalized_sources
+    ):
+        translated_texts = {
+            source: item.translation.strip()
+            for source, item in zip(normalized_sources, items, strict=True)
+        }
+
+    translation_objs = [
+        TranslationCreateSchema(
+            source=source,
+            source_hash=get_source_hash(source),
+            lemma=lemmatize(source),
+            translation=translated_texts[source],
+            view_count=view_count,
+        )
+        for source in normalized_sources
+        if source != "" and translated_texts.get(source)
+    ]
+    if len(translation_objs) < len(normalized_sources):
+        logger.warning(
+            f"ChatGPT вернул переводы для {len(translation_objs)} "
+            f"из {len(normalized_sources)} текстов"
+        )
+    return translation_objs
+
+
+def _register_added_translation(db_translation: TranslationModel) -> TranslationSchema:
+    """Обновляет кэши и индекс похожих слов после добавления перевода в БД."""
+    stats_cache.invalidate(STATS_CACHE_KEY)
+    if db_translation.lemma is not None:
+        fuzzy_index.add(db_translation.source)
+    return _cache_translation(db_translation)
+
+
+async def _find_and_register_view(
+    *,
+    session: AsyncSession,
+    source: str,
+) -> TranslationSchema | None:
+    """
+    Находит сохранённый перевод и засчитывает его просмотр.
+
+    Перевод берётся из кэша (или из БД при промахе). В режиме отложенной
+    записи просмотр добавляется в буфер без обращения к БД. Иначе (по умолчанию)
+    просмотр сразу записывается в БД: для перевода из кэша — запросом UPDATE
+    без RETURNING, при промахе — одним запросом UPDATE ... RETURNING, который
+    заодно загружает перевод.
+
+    Args:
+        session (AsyncSession): Объект сессии базы данных.
+        source (str): Нормализованный исходный текст.
+
+    Returns:
+        TranslationSchema | None: Найденный перевод или None.
+    """
+    cached_translation = translation_cache.get(source)
+
+    if not settings.VIEW_COUNT_WRITE_BEHIND:
+        # Транзакция завершается сразу, поэтому соединение с БД не удерживается
+        # на время возможного последующего запроса к ChatGPT
+        if cached_translation is None:
+            translation = await _increment_view_count(session=session, source=source)
+            if translation is not None:
+                logger.debug(f"Найден перевод в БД для текста: {source}")
+            return translation
+
+        # Статья и перевод уже в кэше, поэтому строка из БД не читается
+        found = await TranslationDAO.increment_view_count_without_returning(
+            session,
+            source=source,
+        )
+        await session.commit()
+        if not found:
+            translation_cache.invalidate(source)
+            return None
+
+        logger.debug(f"Найден перевод в кэше для текста: {source}")
+        translation = cached_translation.model_copy(
+            update={"view_count": cached_translation.view_count + 1}
+        )
+        translation_cache.set(source, translation)
+        return translation
+
+    if cached_translation is not None:
+        logger.debug(f"Найден перевод в кэше для текста: {source}")
+    else:
+        db_translation = await TranslationDAO.find_by_source(
+            session=session,
+            source=source,
+        )
+        # Завершаем читающую транзакцию, не сбрасывая загруженные атрибуты
+        await session.commit()
+        if db_translation is None:
+            return None
+
+        logger.debug(f"Найден перевод в БД для текста: {source}")
+        cached_translation = _cache_translation(db_translation)
+
+    view_count_buffer.add(cached_translation.source)
+    # Показываем пользователю счетчик с учётом ещё не записанных просмотров
+    return cached_translation.model_copy(
+        update={
+            "view_count": cached_translation.view_count
+            + view_count_buffer.pending(cached_translation.source)
+        }
+    )
+
+
+async def _find_by_lemma(
+    *,
+    session: AsyncSession,
+    source: str,
+) -> TranslationSchema | None:
+    """
+    Находит перевод другой формы того же английского слова и засчитывает просмотр.
+
+    Args:
+        session (AsyncSession): Объект сессии базы данных.
+        source (str): Нормализованный исходный текст.
+
+    Returns:
+        TranslationSchema | None: Перевод начальной формы слова или None.
+    """
+    base_source = lemma_aliases.get(source)
+    if base_source is None:
+        lemmas = get_lemma_candidates(source)
+        if not lemmas:
+            return None
+
+        db_translation = await TranslationDAO.find_by_lemma(
+            session=session,
+            lemmas=lemmas,
+        )
+        # Освобождаем соединение с БД на время возможного запроса к ChatGPT.
+        # Не rollback: он сбросил бы загруженные атрибуты, а их повторная
+        # загрузка в асинхронной сессии невозможна (MissingGreenlet)
+        await session.commit()
+        if db_translation is None:
+            return None
+
+        base_source = db_translation.source
+        lemma_aliases.set(source, base_source)
+
+    translation = await _find_and_register_view(session=session, source=base_source)
+    if translation is None:
+        lemma_aliases.invalidate(source)
+        return None
+
+    logger.debug(f"Найден перевод формы слова {source}: {base_source}")
+    return translation.model_copy(update={"requested_source": source})
+
+
+def _find_similar_source(source: str) -> str | None:
+    """
+    Находит сохранённое слово, похожее на текст запроса (возможная опечатка).
+
+    Без словаря нельзя отличить опечатку от другого существующего слова
+    (work/word), поэтому найденное слово только предлагается пользователю.
+
+    Args:
+        source (str): Нормализованный исходный текст.
+
+    Returns:
+        str | None: Исходный текст похожего сохранённого слова или None.
+    """
+    if not settings.FUZZY_INDEX_ENABLED or lemmatize(source) is None:
+        return None
+
+    # Короткие слова часто отличаются одной буквой (cat/car), их не предлагаем.
+    # Длинные не проверяем: похожее слово должно поместиться в callback-данные.
+    if not 4 <= len(source) <= 32:
+        return None
+    max_distance = 1 if len(source) < 7 else 2
+
+    # Текст мог попасть в индекс после поиска в БД (его перевёл параллельный
+    # запрос), себя же не предлагаем
+    similar = [
+        item
+        for item in fuzzy_index.search(source, max_distance=max_distance)
+        if item[1] != source
+    ]
+    if not similar:
+        return None
+
+    _, similar_source = similar[0]
+    logger.debug(f"Найдено похожее слово для {source}: {similar_source}")
+    return similar_source
+
+
+async def load_fuzzy_index(*, session: AsyncSession) -> None:
+    """Загружает в индекс похожих слов исходные тексты всех отдельных слов из БД."""
+    result = await session.stream_scalars(
+        select(TranslationModel.source).where(TranslationModel.lemma.is_not(None))
+    )
+    loaded_count = 0
+    async for source in result:
+        fuzzy_index.add(source)
+        loaded_count += 1
+        # Построение индекса нагружает CPU, периодически отдаём управление
+        if loaded_count % 1000 == 0:
+            await asyncio.sleep(0)
+
+    logger.info(f"Загружен индекс похожих слов: {len(fuzzy_index)} слов")
+
+
+def _cache_translation(db_translation: TranslationModel) -> TranslationSchema:
+    """Сохраняет снимок записи перевода в кэш и возвращает его."""
+    translation = TranslationSchema.model_validate(db_translation)
+    translation_cache.set(translation.source, translation)
+    return translation
+
+
+async def _increment_view_count(
+    *,
+    session: AsyncSession,
+    source: str,
+) -> TranslationSchema | None:
+    """
+    Атомарно увеличивает счётчик просмотров перевода одним запросом.
+
+    Обновляет запись в кэше. Если записи в БД нет, удаляет её из кэша.
+
+    Args:
+        session (AsyncSession): Объект сессии базы данных.
+        source (str): Нормализованный исходный текст.
+
+    Returns:
+        TranslationSchema | None: Обновлённый перевод или None, если записи нет.
+    """
+    db_translation = await TranslationDAO.increment_view_count(
+        session,
+        source=source,
+    )
+    await session.commit()
+
+    if db_translation is None:
+        translation_cache.invalidate(source)
+        return None
+
+    return _cache_translation(db_translation)
+
+
+@traced("translation.add")
 async def _add_translation(
     *,
     session: AsyncSession,
     source: str,
     translation: str,
+    article: TranslationArticle | None,
+    completion: CompletionResult,
+    is_brief: bool = False,
 ) -> TranslationModel | None:
     """
-    Добавляет новую запись перевода в базу данных.
+    Добавляет новую запись перевода и запись о запросе к ChatGPT в базу данных.
+
+    Запрос к ChatGPT записывается и тогда, когда перевод пустой: токены
+    всё равно израсходованы.
 
     Args:
         session (AsyncSession): Объект сессии базы данных.
         source (str): Исходный текст.
         translation (str): Переведенный текст.
+        article (TranslationArticle | None): Статья с переводом, если перевод
+            получен в виде JSON.
+        completion (CompletionResult): Результат запроса перевода к ChatGPT.
+        is_brief (bool): Краткий перевод без пояснений и примеров.
 
     Returns:
         TranslationModel: Созданная модель перевода
     """
-    if source.strip() == "" or translation.strip() == "":
-        return None
+    db_translation = None
+    if source.strip() != "" and translation.strip() != "":
+        normalized_source = normalize_source(source)
+        translation_obj = TranslationCreateSchema(
+            source=normalized_source,
+            source_hash=get_source_hash(normalized_source),
+            lemma=lemmatize(normalized_source),
+            translation=translation,
+            article=article,
+            is_brief=is_brief,
+            view_count=1,
+        )
+        # Если перевод того же текста уже добавил другой процесс бота, то вместо
+        # ошибки уникальности увеличится счетчик просмотров существующей записи
+        db_translation = await TranslationDAO.add_or_increment_view_count(
+            session=session,
+            obj_in=translation_obj,
+        )
 
-    translation_obj = TranslationCreateSchema(
-        source=source.lower(),
-        translation=translation,
-        view_count=1,
+    await LLMCallDAO.add(
+        session,
+        build_llm_call(
+            completion,
+            kind=LLMCallKind.TRANSLATION,
+            translation_id=db_translation.id if db_translation is not None else None,
+        ),
     )
-    db_translation = await TranslationDAO.add(
-        session=session,
-        obj_in=translation_obj,
-    )
-    await session.commit()
-
-    if db_translation:
-        await session.refresh(db_translation)
+    with sentry_sdk.start_span(op="db.commit", name="_add_translation commit"):
+        await session.commit()
 
     return db_translation
 
 
 # MARK: Stats
-async def get_stats_text(*, session: AsyncSession) -> str:
+async def get_stats_text(
+    *,
+    session: AsyncSession,
+    chatgpt_client: ChatGPTClient | None = None,
+) -> str:
     """Возвращает текст со статистикой по словам/фразам в БД.
 
+    Готовый текст кэшируется на STATS_CACHE_TTL секунд и сбрасывается
+    при добавлении новых переводов.
+
     Формирует человекочитаемое сообщение со сводной информацией:
       - количество записей
       - суммарные просмотры
@@ -109,44 +1105,38 @@ async def get_stats_text(*, session: AsyncSession) -> str:
       - число записей с более чем одним просмотром
       - топ-10 записей по количеству просмотров
       - последние 5 добавленных записей
+      - расходы на ChatGPT по дням и моделям
+      - состояние бэкендов ChatGPT, если передан клиент
     """
 
-    # Общие агрегаты
-    total_count = (
-        await session.execute(select(func.count(TranslationModel.id)))
-    ).scalar_one()
+    cached_stats_text = stats_cache.get(STATS_CACHE_KEY)
+    if cached_stats_text is not None:
+        return cached_stats_text
 
-    total_views = (
+    # Все агрегаты считаются за один проход по таблице
+    aggregates = (
         await session.execute(
-            select(func.coalesce(func.sum(TranslationModel.view_count), 0))
+            select(
+                func.count(TranslationModel.id),
+                func.coalesce(func.sum(TranslationModel.view_count), 0),
+                func.count(TranslationModel.id).filter(TranslationModel.view_count > 1),
+                func.count(TranslationModel.id).filter(
+                    TranslationModel.view_count == 1
+                ),
+            )
         )
-    ).scalar_one()
+    ).one()
+    total_count, total_views, popular_count, one_view_count = aggregates
 
     avg_views: float = 0.0
     if total_count and total_count > 0:
         avg_views = float(total_views) / float(total_count)
 
-    # Дополнительные показатели
-    popular_count = (
-        await session.execute(
-            select(func.count(TranslationModel.id)).where(
-                TranslationModel.view_count > 1
-            )
-        )
-    ).scalar_one()
-
-    one_view_count = (
-        await session.execute(
-            select(func.count(TranslationModel.id)).where(
-                TranslationModel.view_count == 1
-            )
-        )
-    ).scalar_one()
-
     popular_pct = (popular_count / total_count * 100.0) if total_count else 0.0
     one_view_pct = (one_view_count / total_count * 100.0) if total_count else 0.0
 
-    # Топ-10 по просмотрам
+    # Топ-10 по просмотрам. Индекса по view_count нет намеренно: он замедлил бы
+    # обновление счетчика при каждом просмотре, а текст статистики кэшируется
     top_rows: Sequence[Row[tuple[str, int]]] = (
         await session.execute(
             select(TranslationModel.source, TranslationModel.view_count)
@@ -155,7 +1145,7 @@ async def get_stats_text(*, session: AsyncSession) -> str:
         )
     ).all()
 
-    # Последние 5 добавлений
+    # Последние 5 добавлений (использует индекс по created_at)
     recent_rows: Sequence[Row[tuple[str, datetime]]] = (
         await session.execute(
             select(TranslationModel.source, TranslationModel.created_at)
@@ -176,6 +1166,24 @@ async def get_stats_text(*, session: AsyncSession) -> str:
     lines.append(
         f"Записей с 1 просмотром: {int(one_view_count or 0)} ({one_view_pct:.1f}%)"
     )
+    lines.append(
+        f"Кэш переводов: {len(translation_cache)} записей, "
+        f"попаданий {translation_cache.hits}, промахов {translation_cache.misses} "
+        f"({translation_cache.hit_rate * 100.0:.1f}%)"
+    )
+    lines.append(
+        f"Очередь к ChatGPT: ожидают {llm_scheduler.queue_depth}, "
+        f"выполняются {llm_scheduler.active}, "
+        f"среднее ожидание {llm_scheduler.avg_wait:.2f} с "
+        f"(макс. {llm_scheduler.max_wait:.2f} с), "
+        f"задержек по лимиту токенов {llm_scheduler.throttled}"
+    )
+    if reject_counter:
+        rejected = ", ".join(
+            f"{reason.value} — {count}"
+            for reason, count in reject_counter.most_common()
+        )
+        lines.append(f"Отклонено без перевода: {rejected}")
 
     if len(top_rows) > 0:
         lines.append("")
@@ -194,4 +1202,39 @@ async def get_stats_text(*, session: AsyncSession) -> str:
                 created_str = created_at.strftime("%Y-%m-%d %H:%M:%S")
             lines.append(f"- {source} — {created_str}")
 
-    return "\n".join(lines)
+    usage_lines = await get_usage_stats_lines(session=session)
+    if usage_lines:
+        lines.append("")
+        lines.extend(usage_lines)
+
+    if chatgpt_client is not None:
+        lines.append("")
+        lines.append("Бэкенды ChatGPT:")
+        for backend in chatgpt_client.backends:
+            latency = (
+                f"{backend.latency * 1000:.0f} мс"
+                if backend.latency is not None
+                else "нет данных"
+            )
+            lines.append(
+                f"- {backend.name} ({backend.circuit_breaker.state.value}): "
+                f"задержка {latency}, ошибок {backend.error_rate * 100.0:.1f}%, "
+                f"запросов {backend.requests}, сбоев {backend.failures}, "
+                f"отключений {backend.circuit_breaker.opened_count}"
+            )
+        if chatgpt_client.hedge_percentile is not None:
+            hedge_delay = chatgpt_client.get_hedge_delay()
+            hedge_threshold = (
+                f"{hedge_delay * 1000:.0f} мс"
+                if hedge_delay is not None
+                else "нет данных"
+            )
+            lines.append(
+                f"Дублирующие запросы: {chatgpt_client.hedged_requests} "
+                f"из {chatgpt_client.translation_requests}, "
+                f"выиграли {chatgpt_client.hedge_wins}, порог {hedge_threshold}"
+            )
+
+    stats_text = "\n".join(lines)
+    stats_cache.set(STATS_CACHE_KEY, stats_text)
+    return stats_text
@@ -0,0 +1,86 @@
+"""Сервис оформления переводов для отправки в Telegram (parse_mode="Markdown")."""
+
+from app.integrations.chatgpt.schemas import TranslationArticle
+from app.schemas import TranslationSchema
+
+# Символы разметки Markdown в Telegram
+MARKDOWN_SPECIAL_CHARS = "_*`["
+
+
+def escape_markdown(text: str) -> str:
+    """Экранирует символы разметки в тексте вне выделения."""
+    for char in MARKDOWN_SPECIAL_CHARS:
+        text = text.replace(char, "\\" + char)
+    return text
+
+
+def _entity(text: str, marker: str) -> str:
+    """
+    Выделяет текст жирным ("*") или курсивом ("_").
+
+    Внутри выделения экранирование не работает, поэтому символы разметки
+    удаляются: в переводах слов они практически не встречаются.
+    """
+    for char in MARKDOWN_SPECIAL_CHARS:
+        text = text.replace(char, "")
+    text = text.strip()
+    return f"{marker}{text}{marker}" if text else ""
+
+
+def render_article(article: TranslationArticle) -> str:
+    """
+    Оформляет статью с переводом в текст сообщения Telegram.
+
+    Args:
+        article (TranslationArticle): Статья с переводом.
+
+    Returns:
+        str: Текст сообщения с разметкой Markdown.
+    """
+    senses = [sense for sense in article.senses if sense.translation.strip()]
+    heading = _entity(article.headword, "*")
+    if article.preferred.strip():
+        heading += f" — {escape_markdown(article.preferred.strip())}"
+    blocks = [heading]
+
+    # Краткая статья (и перевод предложения): только варианты перевода,
+    # кроме основного, который уже показан в заголовке
+    if all(not sense.note.strip() and not sense.examples for sense in senses):
+        preferred = article.preferred.strip().casefold()
+        alternatives = [
+            escape_markdown(sense.translation.strip())
+            for sense in senses
+            if sense.translation.strip().casefold() != preferred
+        ]
+        if alternatives:
+            blocks.append("Также: " + ", ".join(alternatives))
+        return "\n\n".join(blocks)
+
+    for index, sense in enumerate(senses, start=1):
+        line = _entity(sense.translation, "*")
+        if len(senses) > 1:
+            line = f"{index}. {line}"
+        if sense.note.strip():
+            line += f" — {escape_markdown(sense.note.strip())}"
+
+        for example in sense.examples:
+            example_source = _entity(example.source, "_")
+            example_translation = _entity(example.translation, "_")
+            if example_source and example_translation:
+                line += f"\n    {example_source} — {example_translation}"
+        blocks.append(line)
+
+    return "\n\n".join(blocks)
+
+
+def render_translation(translation: TranslationSchema) -> str:
+    """
+    Возвращает текст перевода для отправки в Telegram.
+
+    Перевод, полученный в виде статьи, оформляется при каждом выводе, поэтому
+    изменение оформления применяется и к сохранённым переводам без запросов
+    к ChatGPT. Переводы в Markdown выводятся как есть.
+    """
+    if translation.article is not None:
+        return render_article(translation.article)
+    return translation.translation
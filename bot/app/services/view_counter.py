@@ -0,0 +1,121 @@
+"""Сервис отложенной (write-behind) записи счетчиков просмотров переводов."""
+
+import asyncio
+import contextlib
+from collections import Counter
+from collections.abc import Callable, Sequence
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db import TranslationDAO
+from app.models import TranslationModel
+
+
+class ViewCountBuffer:
+    """
+    Накапливает приращения счетчиков просмотров в памяти и записывает их пачкой.
+
+    Приращения группируются по исходному тексту и записываются в БД одним
+    запросом UPDATE раз в `flush_interval` секунд или после `flush_max_events`
+    просмотров, в зависимости от того, что наступит раньше. При остановке
+    оставшиеся приращения записываются сразу.
+    """
+
+    def __init__(
+        self,
+        *,
+        session_factory: async_sessionmaker[AsyncSession],
+        flush_interval: float,
+        flush_max_events: int,
+        on_flush: Callable[[Sequence[TranslationModel]], None] | None = None,
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.flush_max_events = flush_max_events
+        self.on_flush = on_flush
+
+        # Приращения, ещё не отправленные в БД
+        self._pending: Counter[str] = Counter()
+        # Приращения, которые записываются в БД прямо сейчас
+        self._inflight: Counter[str] = Counter()
+        self._events = 0
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+
+    def add(self, source: str, amount: int = 1) -> None:
+        """Добавляет приращение счетчика просмотров для исходного текста."""
+        self._pending[source] += amount
+        self._events += 1
+
+        if self._events >= self.flush_max_events:
+            self._flush_requested.set()
+
+    def pending(self, source: str) -> int:
+        """Возвращает ещё не записанное в БД приращение для исходного текста."""
+        return self._pending[source] + self._inflight[source]
+
+    async def start(self) -> None:
+        """Запускает фоновую задачу периодической записи счетчиков."""
+        if self._task is not None:
+            return
+
+        self._task = asyncio.create_task(self._run(), name="view-count-flush")
+        logger.debug(
+            f"Запущена отложенная запись счетчиков просмотров "
+            f"(каждые {self.flush_interval} с или {self.flush_max_events} просмотров)"
+        )
+
+    async def stop(self) -> None:
+        """Останавливает фоновую задачу и записывает оставшиеся приращения."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Записывает накопленные приращения в БД одним запросом."""
+        async with self._flush_lock:
+            self._flush_requested.clear()
+            if not self._pending:
+                return
+
+            self._inflight, self._pending = self._pending, Counter()
+            self._events = 0
+
+            try:
+                async with self.session_factory() as session:
+                    db_translations = await TranslationDAO.bulk_increment_view_count(
+                        session,
+                        amounts=dict(self._inflight),
+                    )
+                    await session.commit()
+            except Exception as e:
+                logger.error(f"Ошибка при записи счетчиков просмотров: {e}")
+                # Возвращаем приращения, чтобы записать их при следующей попытке
+                self._pending.update(self._inflight)
+                self._inflight = Counter()
+                return
+
+            # Сначала обновляем снимки, затем сбрасываем приращения: так сумма
+            # "значение в БД + приращение" остаётся согласованной
+            if self.on_flush is not None:
+                self.on_flush(db_translations)
+            logger.debug(
+                f"Записаны счетчики просмотров для {len(self._inflight)} переводов"
+            )
+            self._inflight = Counter()
+
+    async def _run(self) -> None:
+        """Периодически записывает накопленные приращения в БД."""
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(
+                    self._flush_requested.wait(),
+                    timeout=self.flush_interval,
+                )
+            await self.flush()
@@ -0,0 +1,21 @@
+from app.utils.cache import TTLCache
+from app.utils.circuit_breaker import CircuitBreaker, CircuitState
+from app.utils.fuzzy import BKTree
+from app.utils.lemma import get_lemma_candidates, lemmatize
+from app.utils.singleflight import SingleFlight
+from app.utils.text import clean_text, get_source_hash, normalize_source
+from app.utils.tracing import traced
+
+__all__ = [
+    "BKTree",
+    "CircuitBreaker",
+    "CircuitState",
+    "SingleFlight",
+    "TTLCache",
+    "clean_text",
+    "get_lemma_candidates",
+    "get_source_hash",
+    "lemmatize",
+    "normalize_source",
+    "traced",
+]
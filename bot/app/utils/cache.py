@@ -0,0 +1,75 @@
+"""Содержит простой in-memory кэш с вытеснением по размеру (LRU) и по времени жизни (TTL)."""
+
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar
+
+KeyType = TypeVar("KeyType")
+ValueType = TypeVar("ValueType")
+
+
+class TTLCache(Generic[KeyType, ValueType]):
+    """
+    Ограниченный по размеру кэш с временем жизни записей.
+
+    При переполнении вытесняется запись, к которой дольше всех не обращались.
+    Записи старше `ttl` секунд считаются отсутствующими. Кэш рассчитан на работу
+    в одном event loop и не использует блокировки.
+    """
+
+    def __init__(self, *, max_size: int, ttl: float):
+        if max_size < 0:
+            raise ValueError("max_size не может быть отрицательным")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[KeyType, tuple[float, ValueType]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: KeyType) -> ValueType | None:
+        """Возвращает значение по ключу или None, если его нет или оно устарело."""
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: KeyType, value: ValueType) -> None:
+        """Сохраняет значение, вытесняя самые старые записи при переполнении."""
+        if self.max_size == 0:
+            return
+
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: KeyType) -> None:
+        """Удаляет запись из кэша, если она есть."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Очищает кэш и сбрасывает счётчики."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Доля попаданий в кэш среди всех обращений."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,96 @@
+"""Содержит автоматический выключатель (circuit breaker) для внешних сервисов."""
+
+import time
+from enum import StrEnum
+
+from loguru import logger
+
+
+class CircuitState(StrEnum):
+    """Состояния автоматического выключателя."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Автоматический выключатель для запросов к внешнему сервису.
+
+    После `failure_threshold` сбоев подряд выключатель размыкается, и запросы
+    сразу отклоняются, не дожидаясь таймаута. Через `reset_timeout` секунд
+    пропускается один пробный запрос: при успехе выключатель замыкается,
+    при сбое снова размыкается.
+    """
+
+    def __init__(self, *, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_count = 0
+        self.rejected_count = 0
+        self._opened_at = 0.0
+        self._trial_started_at: float | None = None
+
+    @property
+    def retry_after(self) -> float:
+        """Время в секундах до пропуска пробного запроса."""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Проверяет, можно ли выполнить запрос сейчас."""
+        now = time.monotonic()
+        if self.state == CircuitState.OPEN:
+            if now - self._opened_at < self.reset_timeout:
+                self.rejected_count += 1
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self._trial_started_at = None
+
+        if self.state == CircuitState.HALF_OPEN:
+            # Пробный запрос, не завершившийся за reset_timeout (например,
+            # отменённый), не должен блокировать выключатель навсегда
+            if (
+                self._trial_started_at is not None
+                and now - self._trial_started_at < self.reset_timeout
+            ):
+                self.rejected_count += 1
+                return False
+            self._trial_started_at = now
+
+        return True
+
+    def record_success(self) -> None:
+        """Отмечает успешный запрос."""
+        self.consecutive_failures = 0
+        if self.state != CircuitState.CLOSED:
+            logger.info(f"Выключатель {self.name} замкнут: сервис снова отвечает")
+        self.state = CircuitState.CLOSED
+        self._trial_started_at = None
+
+    def record_failure(self) -> None:
+        """Отмечает сбой запроса и при необходимости размыкает выключатель."""
+        self.consecutive_failures += 1
+        if (
+            self.state == CircuitState.HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        """Размыкает выключатель."""
+        if self.state != CircuitState.OPEN:
+            self.opened_count += 1
+            logger.warning(
+                f"Выключатель {self.name} разомкнут после "
+                f"{self.consecutive_failures} сбоев подряд"
+            )
+        self.state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._trial_started_at = None
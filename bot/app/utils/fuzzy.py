@@ -0,0 +1,118 @@
+"""Содержит индекс для приближённого поиска слов по расстоянию Левенштейна."""
+
+from typing import TypeAlias
+
+# Узел BK-дерева: слово и дочерние узлы по расстоянию до этого слова
+_Node: TypeAlias = tuple[str, dict[int, "_Node"]]
+
+
+def levenshtein_distance(a: str, b: str) -> int:
+    """Возвращает расстояние Левенштейна между двумя строками."""
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a)
+
+    previous_row = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current_row = [i]
+        left = i
+        for j, char_b in enumerate(b, start=1):
+            # Минимум из замены, удаления и вставки без вызова min() для скорости
+            value = previous_row[j - 1] + (char_a != char_b)
+            if previous_row[j] + 1 < value:
+                value = previous_row[j] + 1
+            if left + 1 < value:
+                value = left + 1
+            current_row.append(value)
+            left = value
+        previous_row = current_row
+
+    return previous_row[-1]
+
+
+def transposition_distance(a: str, b: str) -> int:
+    """
+    Возвращает расстояние Дамерау–Левенштейна (вариант OSA) между строками.
+
+    В отличие от расстояния Левенштейна, перестановка двух соседних символов
+    (recieve -> receive) считается одной правкой. Используется для ранжирования
+    найденных кандидатов, так как не является метрикой для BK-дерева.
+    """
+    rows = [list(range(len(b) + 1))]
+    for i in range(1, len(a) + 1):
+        row = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            row[j] = min(row[j - 1] + 1, rows[i - 1][j] + 1, rows[i - 1][j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], rows[i - 2][j - 2] + 1)
+        rows.append(row)
+
+    return rows[-1][-1]
+
+
+class BKTree:
+    """
+    BK-дерево (Burkhard–Keller) для поиска слов в пределах заданного расстояния.
+
+    Каждый узел хранит слово и дочерние узлы по расстоянию до этого слова.
+    Неравенство треугольника позволяет при поиске обходить только поддеревья
+    с расстоянием в диапазоне [d - max_distance, d + max_distance], поэтому
+    поиск близких слов затрагивает малую часть словаря.
+    """
+
+    def __init__(self) -> None:
+        self._root: _Node | None = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, word: str) -> bool:
+        """Добавляет слово в индекс. Возвращает False, если слово уже есть."""
+        if self._root is None:
+            self._root = (word, {})
+            self._size = 1
+            return True
+
+        node_word, children = self._root
+        while True:
+            distance = levenshtein_distance(word, node_word)
+            if distance == 0:
+                return False
+
+            child = children.get(distance)
+            if child is None:
+                children[distance] = (word, {})
+                self._size += 1
+                return True
+
+            node_word, children = child
+
+    def search(self, word: str, max_distance: int) -> list[tuple[int, str]]:
+        """
+        Находит слова на расстоянии не больше `max_distance` от заданного.
+
+        Returns:
+            Список пар (расстояние, слово), отсортированный по близости: сначала
+            по расстоянию с учётом перестановок соседних символов, затем по слову
+        """
+        if self._root is None:
+            return []
+
+        found: list[tuple[int, str]] = []
+        stack = [self._root]
+        while stack:
+            node_word, children = stack.pop()
+            distance = levenshtein_distance(word, node_word)
+            if distance <= max_distance:
+                found.append((transposition_distance(word, node_word), node_word))
+
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+
+        return sorted(found)
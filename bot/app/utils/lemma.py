@@ -0,0 +1,253 @@
+"""Содержит простую лемматизацию английских слов на правилах."""
+
+import re
+
+# Одно английское слово в нижнем регистре, допускается дефис и апостроф
+_WORD_RE = re.compile(r"[a-z]+(?:['-][a-z]+)*")
+
+# Неправильные формы, которые нельзя получить отбрасыванием окончаний.
+# Неоднозначные формы (left, saw, rose, felt, ...) намеренно не включены.
+IRREGULAR_FORMS: dict[str, str] = {
+    "am": "be",
+    "is": "be",
+    "are": "be",
+    "was": "be",
+    "were": "be",
+    "been": "be",
+    "has": "have",
+    "had": "have",
+    "does": "do",
+    "did": "do",
+    "done": "do",
+    "went": "go",
+    "gone": "go",
+    "ran": "run",
+    "ate": "eat",
+    "eaten": "eat",
+    "made": "make",
+    "said": "say",
+    "took": "take",
+    "taken": "take",
+    "came": "come",
+    "seen": "see",
+    "knew": "know",
+    "known": "know",
+    "got": "get",
+    "gotten": "get",
+    "gave": "give",
+    "given": "give",
+    "thought": "think",
+    "told": "tell",
+    "became": "become",
+    "brought": "bring",
+    "began": "begin",
+    "begun": "begin",
+    "kept": "keep",
+    "held": "hold",
+    "wrote": "write",
+    "written": "write",
+    "stood": "stand",
+    "heard": "hear",
+    "meant": "mean",
+    "paid": "pay",
+    "spoke": "speak",
+    "spoken": "speak",
+    "grew": "grow",
+    "grown": "grow",
+    "fallen": "fall",
+    "sent": "send",
+    "built": "build",
+    "understood": "understand",
+    "drew": "draw",
+    "drawn": "draw",
+    "broke": "break",
+    "broken": "break",
+    "spent": "spend",
+    "drove": "drive",
+    "driven": "drive",
+    "bought": "buy",
+    "wore": "wear",
+    "worn": "wear",
+    "chose": "choose",
+    "chosen": "choose",
+    "sought": "seek",
+    "threw": "throw",
+    "thrown": "throw",
+    "caught": "catch",
+    "taught": "teach",
+    "fought": "fight",
+    "flew": "fly",
+    "flown": "fly",
+    "sang": "sing",
+    "sung": "sing",
+    "swam": "swim",
+    "slept": "sleep",
+    "forgot": "forget",
+    "forgotten": "forget",
+    "hid": "hide",
+    "hidden": "hide",
+    "rode": "ride",
+    "ridden": "ride",
+    "shook": "shake",
+    "shaken": "shake",
+    "stole": "steal",
+    "stolen": "steal",
+    "woke": "wake",
+    "woken": "wake",
+    "men": "man",
+    "women": "woman",
+    "children": "child",
+    "feet": "foot",
+    "teeth": "tooth",
+    "mice": "mouse",
+    "geese": "goose",
+    "better": "good",
+    "best": "good",
+    "worse": "bad",
+    "worst": "bad",
+}
+
+_VOWELS = "aeiou"
+
+# Слова на -s, которые не являются формами множественного числа или 3-го лица
+_NOT_PLURAL = frozenset(
+    {
+        "always",
+        "perhaps",
+        "news",
+        "series",
+        "species",
+        "lens",
+        "bus",
+        "gas",
+        "yes",
+        "this",
+        "thus",
+        "his",
+        "its",
+        "was",
+        "physics",
+        "mathematics",
+        "politics",
+        "economics",
+    }
+)
+
+# Слова на -ing/-ed, которые обычно ищут как самостоятельные существительные
+# или прилагательные: после отбрасывания окончания получилось бы другое слово
+# (evening -> even, wedding -> wed, wicked -> wick)
+_NOT_VERB_FORMS = frozenset(
+    {
+        "meaning",
+        "evening",
+        "morning",
+        "wedding",
+        "building",
+        "ceiling",
+        "feeling",
+        "painting",
+        "clothing",
+        "pudding",
+        "herring",
+        "earring",
+        "railing",
+        "lightning",
+        "darling",
+        "sibling",
+        "shilling",
+        "sterling",
+        "stocking",
+        "spring",
+        "string",
+        "offspring",
+        "during",
+        "nothing",
+        "something",
+        "anything",
+        "everything",
+        "interesting",
+        "cunning",
+        "hundred",
+        "sacred",
+        "naked",
+        "wicked",
+        "rugged",
+        "ragged",
+        "crooked",
+        "wretched",
+    }
+)
+
+
+def _stem_variants(stem: str) -> list[str]:
+    """Возвращает варианты основы после отбрасывания -ed/-ing."""
+    # running -> run, stopped -> stop (но falling -> fall, missed -> miss)
+    if len(stem) >= 3 and stem[-1] == stem[-2] and stem[-1] not in "lsz":
+        return [stem[:-1], stem]
+    # making -> make, loved -> love, danced -> dance: короткая основа вида
+    # "согласная-гласная-согласная" или основа на v/c/u обычно теряла немое -e
+    if stem.endswith(("v", "c", "u")) or (
+        len(stem) == 3
+        and stem[0] not in _VOWELS
+        and stem[1] in _VOWELS
+        and stem[2] not in _VOWELS + "wxy"
+    ):
+        return [stem + "e", stem]
+    return [stem, stem + "e"]
+
+
+def get_lemma_candidates(word: str) -> list[str]:
+    """
+    Возвращает возможные начальные формы английского слова.
+
+    Без словаря нельзя однозначно восстановить основу (making -> mak или make),
+    поэтому возвращаются все правдоподобные варианты, от более вероятного
+    к менее вероятному. Для начальной формы и не-слов возвращается пустой список.
+
+    Args:
+        word: Нормализованное слово в нижнем регистре
+
+    Returns:
+        Список вариантов начальной формы, не включающий само слово
+    """
+    if not _WORD_RE.fullmatch(word):
+        return []
+
+    if word in IRREGULAR_FORMS:
+        return [IRREGULAR_FORMS[word]]
+    if word in _NOT_VERB_FORMS:
+        return []
+
+    candidates: list[str] = []
+    if word.endswith("ies") and len(word) > 4:
+        candidates.append(word[:-3] + "y")
+    elif word.endswith(("sses", "shes", "ches", "xes", "zes")):
+        candidates.append(word[:-2])
+    elif (
+        word.endswith("s")
+        and not word.endswith(("ss", "us", "is"))
+        and len(word) > 3
+        and word not in _NOT_PLURAL
+    ):
+        candidates.append(word[:-1])
+    elif word.endswith("ied") and len(word) > 4:
+        candidates.append(word[:-3] + "y")
+    elif word.endswith("ed") and len(word) > 4:
+        candidates.extend(_stem_variants(word[:-2]))
+    elif word.endswith("ing") and len(word) > 5:
+        candidates.extend(_stem_variants(word[:-3]))
+
+    return [candidate for candidate in candidates if candidate != word]
+
+
+def lemmatize(source: str) -> str | None:
+    """
+    Возвращает наиболее вероятную начальную форму для одного английского слова.
+
+    Для фраз и текста, не являющегося английским словом, возвращает None.
+    """
+    if not _WORD_RE.fullmatch(source):
+        return None
+
+    candidates = get_lemma_candidates(source)
+    return candidates[0] if candidates else source
@@ -0,0 +1,64 @@
+"""Содержит механизм объединения одновременных одинаковых асинхронных вызовов."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ResultType = TypeVar("ResultType")
+
+
+class SingleFlight(Generic[KeyType, ResultType]):
+    """
+    Объединяет одновременные вызовы с одинаковым ключом в один.
+
+    Первый вызов ("ведущий") выполняет функцию, остальные вызовы с тем же ключом
+    дожидаются его результата или исключения. После завершения ведущего вызова
+    ключ освобождается, и следующий вызов снова выполнит функцию.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[KeyType, asyncio.Future[ResultType]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self,
+        key: KeyType,
+        func: Callable[[], Awaitable[ResultType]],
+    ) -> tuple[ResultType, bool]:
+        """
+        Выполняет функцию или присоединяется к уже выполняющемуся вызову.
+
+        Args:
+            key: Ключ, по которому объединяются вызовы
+            func: Функция без аргументов, возвращающая awaitable с результатом
+
+        Returns:
+            Кортеж из результата и признака того, что результат получен
+            от другого (ведущего) вызова
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            # shield: отмена ожидающего не должна отменять общий результат
+            return await asyncio.shield(future), True
+
+        future = asyncio.get_running_loop().create_future()
+        # Помечаем исключение как полученное, даже если ожидающих не было
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._calls[key] = future
+
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._calls[key]
@@ -0,0 +1,241 @@
+"""Содержит вспомогательные классы для работы с сообщениями Telegram."""
+
+import asyncio
+import time
+
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramNetworkError,
+    TelegramRetryAfter,
+)
+from aiogram.types import InlineKeyboardMarkup, Message
+from loguru import logger
+
+# Максимальная длина текста сообщения в Telegram
+MAX_MESSAGE_LENGTH = 4096
+
+# Окончательный текст отправляется повторно после ограничения частоты или сетевой
+# ошибки, если ждать придётся не дольше этого времени, в секундах
+FINISH_MAX_RETRY_DELAY = 5.0
+# Пауза перед повторной отправкой окончательного текста после сетевой ошибки
+FINISH_NETWORK_RETRY_DELAY = 1.0
+
+
+class ProgressiveMessage:
+    """
+    Сообщение-ответ, которое постепенно дополняется по мере генерации текста.
+
+    Первый фрагмент отправляется новым сообщением, последующие обновления
+    применяются через редактирование не чаще одного раза в `min_interval` секунд,
+    чтобы не упираться в ограничения Telegram на частоту редактирования.
+    Промежуточные версии отправляются без разметки, так как незавершённый
+    Markdown может не разобраться. Если промежуточное обновление не удалось
+    (ограничение частоты, сетевая ошибка), оно пропускается: перевод продолжает
+    генерироваться, а пользователь увидит следующую версию текста.
+
+    Фрагменты передаются вызовами `update` с накопленным текстом (колбэк
+    `on_partial` сервиса переводов), а не через асинхронный итератор.
+    """
+
+    def __init__(self, *, message: Message, min_interval: float):
+        self.message = message
+        self.min_interval = min_interval
+        self._sent_message: Message | None = None
+        self._sent_text = ""
+        self._last_edit_at = 0.0
+        # До этого момента Telegram просил не редактировать сообщение
+        self._retry_at = 0.0
+        # Количество уже отправленных частей окончательного текста
+        self._final_parts_sent = 0
+
+    async def update(self, text: str) -> None:
+        """Показывает пользователю текущую версию текста с учётом ограничения частоты."""
+        text = text[:MAX_MESSAGE_LENGTH]
+        if not text.strip() or text == self._sent_text:
+            return
+
+        now = time.monotonic()
+        if now < self._retry_at:
+            return
+        if (
+            self._sent_message is not None
+            and now - self._last_edit_at < self.min_interval
+        ):
+            return
+
+        try:
+            if self._sent_message is None:
+                self._sent_message = await self.message.answer(text, parse_mode=None)
+            else:
+                await self._sent_message.edit_text(text, parse_mode=None)
+        except TelegramRetryAfter as e:
+            logger.warning(
+                f"Обновление сообщения с переводом отложено на {e.retry_after} с"
+            )
+            self._retry_at = now + e.retry_after
+            return
+        except (TelegramBadRequest, TelegramNetworkError) as e:
+            logger.warning(f"Не удалось обновить сообщение с переводом: {e}")
+            return
+
+        self._sent_text = text
+        self._last_edit_at = now
+
+    async def finish(
+        self,
+        text: str,
+        parse_mode: str | None = None,
+        reply_markup: InlineKeyboardMarkup | None = None,
+    ) -> None:
+        """
+        Отправляет окончательную версию текста с разметкой.
+
+        После ограничения частоты или сетевой ошибки отправка повторяется один
+        раз, если ждать не дольше FINISH_MAX_RETRY_DELAY секунд. Иначе ошибка
+        записывается в лог, а пользователь остаётся с последней версией текста.
+        """
+        try:
+            await self._send_final(text, parse_mode, reply_markup)
+            return
+        except TelegramRetryAfter as e:
+            delay = float(e.retry_after)
+            error: Exception = e
+        except TelegramNetworkError as e:
+            delay = FINISH_NETWORK_RETRY_DELAY
+            error = e
+
+        if delay > FINISH_MAX_RETRY_DELAY:
+            logger.error(f"Не удалось отправить окончательный перевод: {error}")
+            return
+
+        logger.warning(
+            f"Повтор отправки окончательного перевода через {delay} с: {error}"
+        )
+        await asyncio.sleep(delay)
+        try:
+            await self._send_final(text, parse_mode, reply_markup)
+        except (TelegramRetryAfter, TelegramNetworkError) as e:
+            logger.error(f"Не удалось отправить окончательный перевод: {e}")
+
+    async def fail(self, text: str) -> None:
+        """
+        Показывает сообщение об ошибке вместо начатого перевода.
+
+        Если часть перевода уже показана, сообщение с ней заменяется текстом
+        ошибки, чтобы оборванный перевод не выглядел как окончательный.
+        """
+        if self._sent_message is not None:
+            try:
+                await self._sent_message.edit_text(text, parse_mode=None)
+                return
+            except (TelegramBadRequest, TelegramNetworkError, TelegramRetryAfter) as e:
+                logger.warning(f"Не удалось заменить начатый перевод ошибкой: {e}")
+
+        try:
+            await self.message.answer(text, parse_mode=None)
+        except (TelegramBadRequest, TelegramNetworkError, TelegramRetryAfter) as e:
+            logger.error(f"Не удалось отправить сообщение об ошибке: {e}")
+
+    async def _send_final(
+        self,
+        text: str,
+        parse_mode: str | None,
+        reply_markup: InlineKeyboardMarkup | None,
+    ) -> None:
+        """
+        Отправляет или редактирует сообщение с окончательным текстом.
+
+        Текст длиннее ограничения Telegram разбивается по абзацам на несколько
+        сообщений, кнопки прикрепляются к последнему. При повторе после ошибки
+        уже отправленные части не отправляются заново.
+        """
+        parts = join_message_parts(text.split("\n\n"))
+        while self._final_parts_sent < len(parts):
+            index = self._final_parts_sent
+            await self._send_part(
+                parts[index],
+                parse_mode=parse_mode,
+                reply_markup=reply_markup if index == len(parts) - 1 else None,
+                edit=index == 0 and self._sent_message is not None,
+            )
+            self._final_parts_sent += 1
+
+    async def _send_part(
+        self,
+        text: str,
+        *,
+        parse_mode: str | None,
+        reply_markup: InlineKeyboardMarkup | None,
+        edit: bool,
+    ) -> None:
+        """Отправляет часть окончательного текста, при ошибке разметки — без неё."""
+        try:
+            await self._deliver(
+                text, parse_mode=parse_mode, reply_markup=reply_markup, edit=edit
+            )
+            return
+        except TelegramBadRequest as e:
+            if parse_mode is None:
+                logger.error(f"Не удалось отправить окончательный перевод: {e}")
+                return
+            logger.warning(f"Не удалось отправить сообщение с разметкой: {e}")
+
+        try:
+            await self._deliver(
+                text, parse_mode=None, reply_markup=reply_markup, edit=edit
+            )
+        except TelegramBadRequest as e:
+            logger.error(f"Не удалось отправить окончательный перевод: {e}")
+
+    async def _deliver(
+        self,
+        text: str,
+        *,
+        parse_mode: str | None,
+        reply_markup: InlineKeyboardMarkup | None,
+        edit: bool,
+    ) -> None:
+        """Редактирует уже показанное сообщение или отправляет новое."""
+        if edit and self._sent_message is not None:
+            await self._sent_message.edit_text(
+                text,
+                parse_mode=parse_mode,
+                reply_markup=reply_markup,
+            )
+        else:
+            await self.message.answer(
+                text,
+                parse_mode=parse_mode,
+                reply_markup=reply_markup,
+            )
+
+
+def join_message_parts(parts: list[str], separator: str = "\n\n") -> list[str]:
+    """
+    Объединяет части текста в как можно меньшее число сообщений Telegram.
+
+    Части не разрываются между сообщениями, чтобы не ломать Markdown-разметку.
+    Часть длиннее ограничения Telegram обрезается.
+
+    Args:
+        parts: Части текста в порядке вывода
+        separator: Разделитель между частями внутри одного сообщения
+
+    Returns:
+        Тексты сообщений, каждый не длиннее `MAX_MESSAGE_LENGTH`
+    """
+    messages: list[str] = []
+    current = ""
+    for part in parts:
+        part = part[:MAX_MESSAGE_LENGTH]
+        if current and len(current) + len(separator) + len(part) <= MAX_MESSAGE_LENGTH:
+            current += separator + part
+            continue
+
+        if current:
+            messages.append(current)
+        current = part
+
+    if current:
+        messages.append(current)
+    return messages
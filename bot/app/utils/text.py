@@ -0,0 +1,44 @@
+"""Содержит функции нормализации исходного текста для поиска переводов."""
+
+import hashlib
+import unicodedata
+
+# Кавычки и похожие символы, которые срезаются по краям текста
+_QUOTES = "\"'`«»„“”‚‘’‹›"
+
+
+def _is_surrounding_char(char: str) -> bool:
+    """Проверяет, нужно ли срезать символ с краёв текста."""
+    return (
+        char.isspace() or char in _QUOTES or unicodedata.category(char).startswith("P")
+    )
+
+
+def clean_text(text: str) -> str:
+    """
+    Приводит текст к каноническому виду с сохранением регистра.
+
+    - нормализация Unicode NFKC (неразрывные пробелы, ligatures, full-width символы)
+    - схлопывание последовательностей пробельных символов в один пробел
+    - удаление пунктуации, кавычек и пробелов по краям текста
+    """
+    text = unicodedata.normalize("NFKC", text)
+    text = " ".join(text.split())
+
+    start, end = 0, len(text)
+    while start < end and _is_surrounding_char(text[start]):
+        start += 1
+    while end > start and _is_surrounding_char(text[end - 1]):
+        end -= 1
+
+    return text[start:end]
+
+
+def normalize_source(text: str) -> str:
+    """Возвращает нормализованный исходный текст, по которому ищутся переводы."""
+    return clean_text(text).lower()
+
+
+def get_source_hash(normalized_source: str) -> str:
+    """Возвращает ключ фиксированной длины (SHA-256, hex) для нормализованного текста."""
+    return hashlib.sha256(normalized_source.encode("utf-8")).hexdigest()
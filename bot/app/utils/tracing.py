@@ -0,0 +1,45 @@
+"""Содержит декоратор для трассировки асинхронных функций в Sentry."""
+
+import functools
+from collections.abc import Awaitable, Callable, Coroutine
+from typing import Any, ParamSpec, TypeVar
+
+import sentry_sdk
+
+ParamsType = ParamSpec("ParamsType")
+ResultType = TypeVar("ResultType")
+
+
+def traced(
+    op: str,
+    name: str | None = None,
+) -> Callable[
+    [Callable[ParamsType, Awaitable[ResultType]]],
+    Callable[ParamsType, Coroutine[Any, Any, ResultType]],
+]:
+    """
+    Выполняет асинхронную функцию внутри дочернего span текущей трассировки.
+
+    Если трассировка не начата (Sentry не настроен или запрос не попал
+    в выборку), span не записывается и почти ничего не стоит.
+
+    Args:
+        op: Тип операции span, например "db.dao"
+        name: Название span. По умолчанию — полное имя функции
+    """
+
+    def decorator(
+        func: Callable[ParamsType, Awaitable[ResultType]],
+    ) -> Callable[ParamsType, Coroutine[Any, Any, ResultType]]:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(
+            *args: ParamsType.args, **kwargs: ParamsType.kwargs
+        ) -> ResultType:
+            with sentry_sdk.start_span(op=op, name=span_name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,182 @@
+"""
+Замер времени разбора ответа Chat Completions API.
+
+Сравнивает прежний способ разбора (json.loads и проверка полной схемы ответа
+со всеми вложенными полями) с текущим (model_validate_json из байтов ответа
+по схеме только с используемыми полями).
+
+Запуск из каталога bot (нужны переменные окружения бота, как для app.main):
+    python -m benchmarks.chatgpt_response_parsing --number 20000
+"""
+
+import argparse
+import json
+import timeit
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from app.integrations.chatgpt.client import _parse_chat_response
+
+
+# MARK: Прежняя схема ответа
+class _StrictChatMessage(BaseModel):
+    role: str
+    content: str
+    refusal: Any
+    annotations: list
+
+
+class _StrictChatChoice(BaseModel):
+    index: int
+    message: _StrictChatMessage
+    logprobs: Any
+    finish_reason: str
+
+
+class _StrictTokenDetails(BaseModel):
+    cached_tokens: int = 0
+    audio_tokens: int = 0
+
+
+class _StrictCompletionTokenDetails(BaseModel):
+    reasoning_tokens: int = 0
+    audio_tokens: int = 0
+    accepted_prediction_tokens: int = 0
+    rejected_prediction_tokens: int = 0
+
+
+class _StrictUsage(BaseModel):
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    prompt_tokens_details: _StrictTokenDetails
+    completion_tokens_details: _StrictCompletionTokenDetails
+
+
+class _StrictChatCompletionResponse(BaseModel):
+    id: str
+    object: str
+    created: int
+    model: str
+    choices: list[_StrictChatChoice]
+    usage: _StrictUsage
+    service_tier: str
+    system_fingerprint: Any
+
+
+def _parse_strict(content: bytes) -> _StrictChatCompletionResponse:
+    """Прежний способ разбора ответа."""
+    return _StrictChatCompletionResponse(**json.loads(content))
+
+
+# MARK: Примеры ответов
+_ARTICLE = {
+    "headword": "deliberate",
+    "senses": [
+        {
+            "translation": "обдуманный",
+            "note": "о тщательно спланированном действии",
+            "examples": [
+                {"source": "a deliberate plan", "translation": "обдуманный план"}
+            ],
+        },
+        {
+            "translation": "преднамеренный",
+            "note": "сделанный нарочно",
+            "examples": [
+                {"source": "a deliberate lie", "translation": "намеренная ложь"}
+            ],
+        },
+    ],
+    "preferred": "обдуманный",
+}
+
+OPENAI_RESPONSE = json.dumps(
+    {
+        "id": "chatcmpl-123",
+        "object": "chat.completion",
+        "created": 1760000000,
+        "model": "gpt-4.1-mini-2025-04-14",
+        "choices": [
+            {
+                "index": 0,
+                "message": {
+                    "role": "assistant",
+                    "content": json.dumps(_ARTICLE, ensure_ascii=False),
+                    "refusal": None,
+                    "annotations": [],
+                },
+                "logprobs": None,
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": 312,
+            "completion_tokens": 118,
+            "total_tokens": 430,
+            "prompt_tokens_details": {"cached_tokens": 0, "audio_tokens": 0},
+            "completion_tokens_details": {
+                "reasoning_tokens": 0,
+                "audio_tokens": 0,
+                "accepted_prediction_tokens": 0,
+                "rejected_prediction_tokens": 0,
+            },
+        },
+        "service_tier": "default",
+        "system_fingerprint": "fp_123",
+    },
+    ensure_ascii=False,
+).encode()
+
+# Ответ OpenAI-совместимого прокси без необязательных полей
+PROXY_RESPONSE = json.dumps(
+    {
+        "model": "gpt-4.1-mini",
+        "choices": [
+            {
+                "message": {"role": "assistant", "content": "перевод"},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 312, "completion_tokens": 118, "total_tokens": 430},
+    },
+    ensure_ascii=False,
+).encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Замер времени разбора ответа ChatGPT")
+    parser.add_argument("--number", type=int, default=20000, help="Количество разборов")
+    args = parser.parse_args()
+
+    strict_time = min(
+        timeit.repeat(
+            lambda: _parse_strict(OPENAI_RESPONSE), number=args.number, repeat=5
+        )
+    )
+    lenient_time = min(
+        timeit.repeat(
+            lambda: _parse_chat_response(OPENAI_RESPONSE), number=args.number, repeat=5
+        )
+    )
+    strict_us = strict_time / args.number * 1e6
+    lenient_us = lenient_time / args.number * 1e6
+    print(f"Прежний разбор:  {strict_us:.2f} мкс на ответ")
+    print(f"Текущий разбор:  {lenient_us:.2f} мкс на ответ")
+    print(f"Ускорение:       {strict_us / lenient_us:.1f}x")
+
+    try:
+        _parse_strict(PROXY_RESPONSE)
+        print("Ответ прокси без необязательных полей: прежний разбор — ok")
+    except ValidationError as e:
+        print(
+            f"Ответ прокси без необязательных полей: прежний разбор — "
+            f"{e.error_count()} ошибок валидации"
+        )
+    _parse_chat_response(PROXY_RESPONSE)
+    print("Ответ прокси без необязательных полей: текущий разбор — ok")
+
+
+if __name__ == "__main__":
+    main()
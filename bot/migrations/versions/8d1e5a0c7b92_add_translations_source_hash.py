@@ -0,0 +1,180 @@
+"""Add translations.source_hash field
+
+Revision ID: 8d1e5a0c7b92
+Revises: 3f9c2b7e1d4a
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+
+import hashlib
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d1e5a0c7b92"
+down_revision: Union[str, None] = "3f9c2b7e1d4a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Снимок нормализации и хэширования из app.utils.text на момент создания
+# миграции: миграция не импортирует код приложения, чтобы его изменения
+# не меняли результат уже выпущенной миграции
+
+# Кавычки и похожие символы, которые срезаются по краям текста
+_QUOTES = "\"'`«»„“”‚‘’‹›"
+
+
+def _is_surrounding_char(char: str) -> bool:
+    """Проверяет, нужно ли срезать символ с краёв текста."""
+    return (
+        char.isspace() or char in _QUOTES or unicodedata.category(char).startswith("P")
+    )
+
+
+def _clean_text(text: str) -> str:
+    """
+    Приводит текст к каноническому виду с сохранением регистра.
+
+    - нормализация Unicode NFKC (неразрывные пробелы, ligatures, full-width символы)
+    - схлопывание последовательностей пробельных символов в один пробел
+    - удаление пунктуации, кавычек и пробелов по краям текста
+    """
+    text = unicodedata.normalize("NFKC", text)
+    text = " ".join(text.split())
+
+    start, end = 0, len(text)
+    while start < end and _is_surrounding_char(text[start]):
+        start += 1
+    while end > start and _is_surrounding_char(text[end - 1]):
+        end -= 1
+
+    return text[start:end]
+
+
+def _normalize_source(text: str) -> str:
+    """Возвращает нормализованный исходный текст, по которому ищутся переводы."""
+    return _clean_text(text).lower()
+
+
+def _get_source_hash(normalized_source: str) -> str:
+    """Возвращает ключ фиксированной длины (SHA-256, hex) для нормализованного текста."""
+    return hashlib.sha256(normalized_source.encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "translations",
+        sa.Column(
+            "source_hash",
+            sa.String(length=64),
+            nullable=True,
+            comment="SHA-256 нормализованного исходного текста",
+        ),
+    )
+
+    # Поиск идёт по хэшу, поэтому длина исходного текста больше не ограничена.
+    # Уникальный индекс по source удаляется до пересчёта: нормализация может
+    # временно совпасть с исходным текстом другой записи.
+    op.drop_index(op.f("ix_translations_source"), table_name="translations")
+    op.alter_column(
+        "translations",
+        "source",
+        existing_type=sa.String(length=255),
+        type_=sa.Text(),
+        existing_nullable=False,
+        existing_comment="Исходный текст",
+    )
+
+    _normalize_sources()
+
+    op.alter_column("translations", "source_hash", nullable=False)
+    op.create_index(
+        op.f("ix_translations_source_hash"),
+        "translations",
+        ["source_hash"],
+        unique=True,
+    )
+
+
+def _normalize_sources() -> None:
+    """
+    Приводит исходные тексты существующих записей к нормализованному виду.
+
+    Раньше source только переводился в нижний регистр, поэтому "run ", "run!"
+    и "run" хранились отдельно. Такие записи объединяются: остаётся самая ранняя,
+    а просмотры остальных прибавляются к её счётчику.
+    """
+    connection = op.get_bind()
+    translations = sa.table(
+        "translations",
+        sa.column("id", sa.Integer()),
+        sa.column("source", sa.Text()),
+        sa.column("source_hash", sa.String()),
+        sa.column("view_count", sa.Integer()),
+        sa.column("created_at", sa.TIMESTAMP(timezone=True)),
+    )
+    rows = connection.execute(
+        sa.select(
+            translations.c.id,
+            translations.c.source,
+            translations.c.view_count,
+        ).order_by(translations.c.created_at, translations.c.id)
+    )
+
+    # Для каждого нормализованного текста: запись, которая остаётся, и её просмотры
+    kept: dict[str, dict[str, object]] = {}
+    duplicate_ids: list[int] = []
+    for row_id, source, view_count in rows:
+        # Текст только из пунктуации не нормализуется в пустую строку, чтобы
+        # такие записи не слились в одну
+        normalized_source = _normalize_source(source) or source
+        kept_row = kept.get(normalized_source)
+        if kept_row is None:
+            kept[normalized_source] = {
+                "row_id": row_id,
+                "row_source": normalized_source,
+                "row_source_hash": _get_source_hash(normalized_source),
+                "row_view_count": view_count,
+            }
+        else:
+            kept_row["row_view_count"] = int(kept_row["row_view_count"]) + view_count
+            duplicate_ids.append(row_id)
+
+    if duplicate_ids:
+        connection.execute(
+            translations.delete().where(translations.c.id.in_(duplicate_ids))
+        )
+    if kept:
+        connection.execute(
+            translations.update()
+            .where(translations.c.id == sa.bindparam("row_id"))
+            .values(
+                source=sa.bindparam("row_source"),
+                source_hash=sa.bindparam("row_source_hash"),
+                view_count=sa.bindparam("row_view_count"),
+            ),
+            list(kept.values()),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Записи, объединённые при нормализации, не восстанавливаются
+    op.alter_column(
+        "translations",
+        "source",
+        existing_type=sa.Text(),
+        type_=sa.String(length=255),
+        existing_nullable=False,
+        existing_comment="Исходный текст",
+    )
+    op.create_index(
+        op.f("ix_translations_source"), "translations", ["source"], unique=True
+    )
+    op.drop_index(op.f("ix_translations_source_hash"), table_name="translations")
+    op.drop_column("translations", "source_hash")
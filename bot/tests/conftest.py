@@ -0,0 +1,6 @@
+import os
+
+# Обязательные настройки приложения, которые проверяются при импорте app.config
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "123456:test-token")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("ALLOWED_USERS", '["1"]')
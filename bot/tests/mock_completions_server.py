@@ -0,0 +1,124 @@
+"""
+Локальный тестовый сервер, имитирующий Chat Completions API.
+
+Отвечает без обращения к OpenAI и без расхода токенов, поэтому подходит для
+тестов и для ручной проверки предварительного перевода:
+    python -m tests.mock_completions_server --port 8081
+    python -m app.pretranslate words.txt --api-base-url http://127.0.0.1:8081/v1
+
+Запрос на пакетный перевод (JSON с полем "items") получает перевод каждого
+элемента вида "<текст> (перевод)", остальные запросы - фиксированный ответ.
+"""
+
+import argparse
+import json
+import time
+from typing import Any
+
+from aiohttp import web
+
+# Ключи приложения для доступа к полученным запросам из тестов и для ответа
+# некорректным JSON вместо перевода
+REQUESTS_KEY = web.AppKey("requests", list[dict[str, Any]])
+INVALID_JSON_KEY = web.AppKey("invalid_json", bool)
+MODEL_NAME = "mock-model"
+
+
+def _translate_item(source: str) -> str:
+    """Возвращает фиктивный перевод элемента пакета."""
+    return f"{source} (перевод)"
+
+
+def _build_content(messages: list[dict[str, Any]]) -> str:
+    """Формирует текст ответа модели по последнему сообщению пользователя."""
+    prompt = messages[-1].get("content", "") if messages else ""
+    try:
+        batch = json.loads(prompt)
+    except ValueError:
+        batch = None
+
+    if isinstance(batch, dict) and isinstance(batch.get("items"), list):
+        items = [
+            {"source": source, "translation": _translate_item(source)}
+            for source in batch["items"]
+        ]
+        return json.dumps({"items": items}, ensure_ascii=False)
+
+    return f"{prompt} (перевод)"
+
+
+async def _chat_completions(request: web.Request) -> web.Response:
+    """Обработчик POST /v1/chat/completions."""
+    data = await request.json()
+    request.app[REQUESTS_KEY].append(data)
+
+    content = (
+        "not a json"
+        if request.app[INVALID_JSON_KEY]
+        else _build_content(data.get("messages", []))
+    )
+    # Грубая оценка по длине текста: точное число токенов для тестов не важно
+    prompt_tokens = sum(
+        len(str(message.get("content", ""))) for message in data.get("messages", [])
+    )
+    completion_tokens = len(content)
+
+    return web.json_response(
+        {
+            "id": f"chatcmpl-mock-{len(request.app[REQUESTS_KEY])}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": MODEL_NAME,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+    )
+
+
+def create_app(*, invalid_json: bool = False) -> web.Application:
+    """
+    Создаёт приложение тестового сервера.
+
+    Args:
+        invalid_json: Отвечать текстом, который не является JSON, с расходом
+            токенов, как при ошибке модели
+    """
+    app = web.Application()
+    app[REQUESTS_KEY] = []
+    app[INVALID_JSON_KEY] = invalid_json
+    app.router.add_post("/v1/chat/completions", _chat_completions)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Локальный тестовый сервер Chat Completions API",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Адрес для подключения")
+    parser.add_argument("--port", type=int, default=8081, help="Порт сервера")
+    parser.add_argument(
+        "--invalid-json",
+        action="store_true",
+        help="Отвечать некорректным JSON для проверки обработки ошибок",
+    )
+    args = parser.parse_args()
+
+    web.run_app(
+        create_app(invalid_json=args.invalid_json),
+        host=args.host,
+        port=args.port,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import pytest
+
+from app.utils import TTLCache
+from app.utils import cache as cache_module
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_get_and_set():
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl=60)
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_rate == 0.5
+
+
+def test_evicts_least_recently_used():
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_expires_entries(clock):
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl=60)
+    cache.set("a", 1)
+
+    clock[0] += 59
+    assert cache.get("a") == 1
+
+    clock[0] += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_set_refreshes_ttl(clock):
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl=60)
+    cache.set("a", 1)
+    clock[0] += 50
+    cache.set("a", 2)
+    clock[0] += 50
+
+    assert cache.get("a") == 2
+
+
+def test_zero_size_cache_stores_nothing():
+    cache: TTLCache[str, int] = TTLCache(max_size=0, ttl=60)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_negative_size_is_rejected():
+    with pytest.raises(ValueError):
+        TTLCache(max_size=-1, ttl=60)
+
+
+def test_invalidate_and_clear():
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.invalidate("a")
+    cache.invalidate("missing")
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
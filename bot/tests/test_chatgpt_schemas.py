@@ -0,0 +1,37 @@
+from app.integrations.chatgpt.schemas import ChatCompletionResponse, CompletionResult
+from app.schemas import LLMCallKind
+from app.services.llm_usage import build_llm_call
+
+
+def test_missing_usage_counters_stay_unknown():
+    response = ChatCompletionResponse.model_validate_json(
+        b'{"model": "gpt-test", "choices": [{"message": {"content": "hi"}}],'
+        b' "usage": {"prompt_tokens": 12, "prompt_tokens_details": null}}'
+    )
+
+    assert response.usage is not None
+    assert response.usage.prompt_tokens == 12
+    assert response.usage.completion_tokens is None
+    assert response.usage.total_tokens is None
+    assert response.usage.prompt_tokens_details.cached_tokens is None
+
+
+def test_llm_call_keeps_unknown_tokens_as_null():
+    response = ChatCompletionResponse.model_validate_json(
+        b'{"model": "gpt-test", "choices": [{"message": {"content": "hi"}}],'
+        b' "usage": {"prompt_tokens": 12, "prompt_tokens_details": {}}}'
+    )
+    completion = CompletionResult(
+        text="hi",
+        model=response.model,
+        backend="default",
+        usage=response.usage,
+        latency=0.5,
+    )
+
+    llm_call = build_llm_call(completion, kind=LLMCallKind.TRANSLATION)
+
+    assert llm_call.prompt_tokens == 12
+    assert llm_call.cached_tokens is None
+    assert llm_call.completion_tokens is None
+    assert llm_call.latency_ms == 500
@@ -0,0 +1,77 @@
+import pytest
+
+from app.utils import CircuitBreaker, CircuitState
+from app.utils import circuit_breaker as circuit_breaker_module
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(name="test", failure_threshold=3, reset_timeout=30)
+
+
+def test_opens_after_consecutive_failures(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow()
+    assert breaker.opened_count == 1
+    assert breaker.rejected_count == 1
+
+
+def test_success_resets_failure_count(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow()
+
+
+def test_lets_one_trial_request_through_after_timeout(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.retry_after == 30
+
+    clock[0] += 30
+    assert breaker.retry_after == 0
+    assert breaker.allow()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock[0] += 30
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow()
+    assert breaker.opened_count == 2
+
+
+def test_unfinished_trial_does_not_block_forever(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock[0] += 30
+    assert breaker.allow()
+
+    # Пробный запрос отменён и не сообщил результат
+    clock[0] += 30
+    assert breaker.allow()
@@ -0,0 +1,23 @@
+import pytest
+from pydantic import ValidationError
+
+from app.config import Settings
+
+
+def test_backend_names_must_be_unique():
+    with pytest.raises(ValidationError, match="primary"):
+        Settings(
+            OPENAI_BACKENDS=[
+                {"name": "primary"},
+                {"name": "primary", "base_url": "http://127.0.0.1:8081/v1"},
+            ]
+        )
+
+
+def test_distinct_backend_names_are_accepted():
+    settings = Settings(OPENAI_BACKENDS=[{"name": "primary"}, {"name": "fallback"}])
+
+    assert [backend.name for backend in settings.OPENAI_BACKENDS] == [
+        "primary",
+        "fallback",
+    ]
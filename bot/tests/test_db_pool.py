@@ -0,0 +1,54 @@
+import sqlite3
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.util import greenlet_spawn
+
+from app.db.session import InstrumentedQueuePool
+
+
+def checkout_stats() -> tuple[int, float]:
+    count = REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count")
+    total = REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_sum")
+    return int(count or 0), total or 0.0
+
+
+def make_pool() -> InstrumentedQueuePool:
+    return InstrumentedQueuePool(
+        lambda: sqlite3.connect(":memory:", check_same_thread=False),
+        pool_size=1,
+        max_overflow=0,
+        timeout=0.05,
+    )
+
+
+# Пул асинхронного движка вызывается из greenlet, как в AsyncEngine
+async def test_connect_records_checkout_time():
+    pool = make_pool()
+    count_before, _ = checkout_stats()
+
+    # Первое соединение открывается, второе берётся из пула
+    connection = await greenlet_spawn(pool.connect)
+    connection.close()
+    connection = await greenlet_spawn(pool.connect)
+    connection.close()
+    pool.dispose()
+
+    count_after, _ = checkout_stats()
+    assert count_after == count_before + 2
+
+
+async def test_connect_records_wait_for_busy_pool():
+    pool = make_pool()
+    connection = await greenlet_spawn(pool.connect)
+    count_before, sum_before = checkout_stats()
+
+    with pytest.raises(PoolTimeoutError):
+        await greenlet_spawn(pool.connect)
+    connection.close()
+    pool.dispose()
+
+    count_after, sum_after = checkout_stats()
+    assert count_after == count_before + 1
+    assert sum_after - sum_before >= 0.05
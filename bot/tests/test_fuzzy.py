@@ -0,0 +1,60 @@
+import random
+import string
+
+from app.utils import BKTree
+from app.utils.fuzzy import levenshtein_distance, transposition_distance
+
+
+def test_levenshtein_distance():
+    assert levenshtein_distance("kitten", "sitting") == 3
+    assert levenshtein_distance("", "abc") == 3
+    assert levenshtein_distance("abc", "abc") == 0
+    assert levenshtein_distance("recieve", "receive") == 2
+
+
+def test_transposition_distance_counts_swap_as_one_edit():
+    assert transposition_distance("recieve", "receive") == 1
+    assert transposition_distance("kitten", "sitting") == 3
+
+
+def test_add_ignores_duplicates():
+    tree = BKTree()
+
+    assert tree.add("word")
+    assert tree.add("work")
+    assert not tree.add("word")
+    assert len(tree) == 2
+
+
+def test_search_in_empty_tree():
+    assert BKTree().search("word", max_distance=2) == []
+
+
+def test_search_ranks_transpositions_first():
+    tree = BKTree()
+    for word in ["believe", "receive", "deceive", "perceive"]:
+        tree.add(word)
+
+    # Оба слова на расстоянии Левенштейна 2, но receive — одна перестановка
+    assert tree.search("recieve", max_distance=2) == [(1, "receive"), (2, "believe")]
+
+
+def test_search_matches_brute_force():
+    rng = random.Random(42)
+    words = {
+        "".join(rng.choices(string.ascii_lowercase[:6], k=rng.randint(3, 7)))
+        for _ in range(500)
+    }
+    tree = BKTree()
+    for word in words:
+        tree.add(word)
+
+    for query in ["abc", "fedcb", "aaaa", "bcdefa"]:
+        for max_distance in range(3):
+            expected = {
+                word
+                for word in words
+                if levenshtein_distance(query, word) <= max_distance
+            }
+            found = {word for _, word in tree.search(query, max_distance)}
+            assert found == expected
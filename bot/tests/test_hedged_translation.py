@@ -0,0 +1,193 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+import app.services.llm_usage as llm_usage_module
+import app.services.translation as translation_module
+from app.integrations.chatgpt import ChatGPTValidationError
+from app.integrations.chatgpt.schemas import (
+    CompletionResult,
+    TranslationArticle,
+    TranslationResult,
+    TranslationSense,
+    Usage,
+)
+from app.services.llm_scheduler import LLMScheduler
+
+
+def make_result(backend: str) -> TranslationResult:
+    return TranslationResult(
+        article=TranslationArticle(
+            headword="run",
+            preferred="бежать",
+            senses=[TranslationSense(translation="бежать")],
+        ),
+        completion=CompletionResult(
+            text="{}",
+            model="gpt-test",
+            backend=backend,
+            usage=Usage(prompt_tokens=10, completion_tokens=5, total_tokens=15),
+            latency=0.01,
+        ),
+    )
+
+
+class FakeChatGPTClient:
+    """Первый запрос отвечает только после release, остальные сразу."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.requests = 0
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+
+    def estimate_translation_tokens(self, text: str, **kwargs: Any) -> int:
+        return 15
+
+    def get_hedge_delay(self) -> float | None:
+        return 0.01
+
+    def hedge_budget_allows(self) -> bool:
+        return True
+
+    def record_hedge(self) -> None:
+        self.hedged_requests += 1
+
+    def record_hedge_win(self) -> None:
+        self.hedge_wins += 1
+
+    async def translate_text(self, **kwargs: Any) -> TranslationResult:
+        self.requests += 1
+        if self.requests == 1:
+            await self.release.wait()
+            return make_result("primary")
+        return make_result("hedge")
+
+
+class FakeLLMCallDAO:
+    def __init__(self) -> None:
+        self.calls: list[Any] = []
+
+    async def add(self, session: Any, obj_in: Any) -> Any:
+        self.calls.append(obj_in)
+        return obj_in
+
+
+@pytest.fixture
+def llm_calls(monkeypatch: pytest.MonkeyPatch) -> FakeLLMCallDAO:
+    dao = FakeLLMCallDAO()
+    monkeypatch.setattr(translation_module, "LLMCallDAO", dao)
+    monkeypatch.setattr(llm_usage_module, "LLMCallDAO", dao)
+    return dao
+
+
+def use_scheduler(monkeypatch: pytest.MonkeyPatch, **kwargs: Any) -> LLMScheduler:
+    scheduler = LLMScheduler(**kwargs)
+    monkeypatch.setattr(translation_module, "llm_scheduler", scheduler)
+    return scheduler
+
+
+class FakeSession:
+    async def commit(self) -> None:
+        pass
+
+
+async def request_article(client: FakeChatGPTClient) -> TranslationResult:
+    return await translation_module._request_article(
+        session=FakeSession(),
+        chatgpt_client=client,
+        source="run",
+        model="gpt-test",
+        user_id=1,
+    )
+
+
+async def test_hedge_takes_its_own_scheduler_slot(monkeypatch, llm_calls):
+    scheduler = use_scheduler(
+        monkeypatch, max_concurrency=2, max_concurrency_per_user=2
+    )
+    client = FakeChatGPTClient()
+
+    result = await request_article(client)
+
+    assert result.completion.backend == "hedge"
+    assert client.hedged_requests == 1
+    assert client.hedge_wins == 1
+    assert scheduler.granted == 2
+    await asyncio.sleep(0)
+    assert scheduler.active == 0
+
+
+async def test_hedge_waits_for_free_slot(monkeypatch, llm_calls):
+    # Единственное место занято основным запросом, поэтому дублирующий
+    # запрос ждёт в очереди и не отправляется в обход ограничения
+    scheduler = use_scheduler(
+        monkeypatch, max_concurrency=1, max_concurrency_per_user=1
+    )
+    client = FakeChatGPTClient()
+
+    task = asyncio.create_task(request_article(client))
+    await asyncio.sleep(0.05)
+    assert client.requests == 1
+    assert scheduler.queue_depth == 1
+
+    client.release.set()
+    result = await task
+
+    assert result.completion.backend == "primary"
+    assert client.requests == 1
+    assert client.hedged_requests == 0
+    await asyncio.sleep(0)
+    assert scheduler.queue_depth == 0
+    assert scheduler.active == 0
+
+
+async def test_finished_loser_is_recorded(monkeypatch, llm_calls):
+    use_scheduler(monkeypatch, max_concurrency=2, max_concurrency_per_user=2)
+    client = FakeChatGPTClient()
+
+    async def translate_text(**kwargs: Any) -> TranslationResult:
+        client.requests += 1
+        if client.requests == 1:
+            await client.release.wait()
+            return make_result("primary")
+        # Основной запрос завершается одновременно с дублирующим
+        client.release.set()
+        return make_result("hedge")
+
+    monkeypatch.setattr(client, "translate_text", translate_text)
+
+    result = await request_article(client)
+
+    # Ответ проигравшего запроса записывается без перевода: токены израсходованы
+    loser = "hedge" if result.completion.backend == "primary" else "primary"
+    assert [call.backend for call in llm_calls.calls] == [loser]
+    assert llm_calls.calls[0].translation_id is None
+    assert llm_calls.calls[0].prompt_tokens == 10
+
+
+async def test_unparsable_answer_is_recorded(monkeypatch, llm_calls):
+    use_scheduler(monkeypatch, max_concurrency=2, max_concurrency_per_user=2)
+    client = FakeChatGPTClient()
+
+    async def translate_text(**kwargs: Any) -> TranslationResult:
+        client.requests += 1
+        if client.requests == 1:
+            await client.release.wait()
+            raise ChatGPTValidationError(
+                "Validation error",
+                completion=make_result("primary").completion,
+            )
+        # Основной запрос получает некорректный ответ раньше дублирующего
+        result = make_result("hedge")
+        client.release.set()
+        await asyncio.sleep(0.01)
+        return result
+
+    monkeypatch.setattr(client, "translate_text", translate_text)
+
+    result = await request_article(client)
+
+    assert result.completion.backend == "hedge"
+    assert [(call.backend, call.items) for call in llm_calls.calls] == [("primary", 0)]
@@ -0,0 +1,57 @@
+import pytest
+
+from app.utils import get_lemma_candidates, lemmatize
+
+
+@pytest.mark.parametrize(
+    ("word", "lemma"),
+    [
+        ("running", "run"),
+        ("stopped", "stop"),
+        ("making", "make"),
+        ("loved", "love"),
+        ("danced", "dance"),
+        ("missed", "miss"),
+        ("falling", "fall"),
+        ("stories", "story"),
+        ("watches", "watch"),
+        ("cats", "cat"),
+        ("studied", "study"),
+        ("went", "go"),
+        ("children", "child"),
+    ],
+)
+def test_get_lemma_candidates_starts_with_most_likely_lemma(word, lemma):
+    assert get_lemma_candidates(word)[0] == lemma
+
+
+@pytest.mark.parametrize("word", ["run", "news", "bus", "class", "sing", "red"])
+def test_get_lemma_candidates_is_empty_for_base_forms(word):
+    assert get_lemma_candidates(word) == []
+
+
+@pytest.mark.parametrize(
+    "word", ["meaning", "evening", "wedding", "morning", "building", "wicked"]
+)
+def test_get_lemma_candidates_keeps_nouns_and_adjectives(word):
+    # Самостоятельное слово не должно показываться по статье другого слова
+    assert get_lemma_candidates(word) == []
+    assert lemmatize(word) == word
+
+
+@pytest.mark.parametrize("text", ["take off", "Run", "42", "привет", ""])
+def test_get_lemma_candidates_is_empty_for_non_words(text):
+    assert get_lemma_candidates(text) == []
+
+
+def test_get_lemma_candidates_does_not_include_word_itself():
+    assert "running" not in get_lemma_candidates("running")
+
+
+def test_lemmatize():
+    assert lemmatize("ran") == "run"
+    assert lemmatize("run") == "run"
+    assert lemmatize("well-known") == "well-known"
+    assert lemmatize("don't") == "don't"
+    assert lemmatize("take off") is None
+    assert lemmatize("Run") is None
@@ -0,0 +1,180 @@
+import asyncio
+
+import pytest
+
+from app.services.llm_scheduler import LLMScheduler
+
+
+async def _hold(
+    scheduler: LLMScheduler,
+    user_id: int | None,
+    release: asyncio.Event,
+    started: list[int | None],
+    tokens: int = 1,
+) -> None:
+    async with scheduler.slot(user_id=user_id, tokens=tokens):
+        started.append(user_id)
+        await release.wait()
+
+
+async def test_limits_total_concurrency():
+    scheduler = LLMScheduler(max_concurrency=2, max_concurrency_per_user=10)
+    release = asyncio.Event()
+    started: list[int | None] = []
+
+    tasks = [
+        asyncio.create_task(_hold(scheduler, user_id, release, started))
+        for user_id in range(5)
+    ]
+    await asyncio.sleep(0.01)
+
+    assert scheduler.active == 2
+    assert scheduler.queue_depth == 3
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert scheduler.active == 0
+    assert scheduler.queue_depth == 0
+    assert scheduler.granted == 5
+
+
+async def test_limits_concurrency_per_user_and_serves_users_in_turn():
+    scheduler = LLMScheduler(max_concurrency=1, max_concurrency_per_user=1)
+    releases = [asyncio.Event() for _ in range(6)]
+    started: list[int | None] = []
+
+    # Пока выполняется служебный запрос, пользователь 1 отправил три запроса
+    # подряд, а пользователь 2 — два
+    tasks = [
+        asyncio.create_task(_hold(scheduler, user_id, releases[index], started))
+        for index, user_id in enumerate([None, 1, 1, 1, 2, 2])
+    ]
+    for release in releases:
+        await asyncio.sleep(0.01)
+        release.set()
+    await asyncio.gather(*tasks)
+
+    assert started == [None, 1, 2, 1, 2, 1]
+
+
+async def test_user_cannot_take_all_slots():
+    scheduler = LLMScheduler(max_concurrency=3, max_concurrency_per_user=2)
+    release = asyncio.Event()
+    started: list[int | None] = []
+
+    tasks = [
+        asyncio.create_task(_hold(scheduler, 1, release, started)) for _ in range(3)
+    ]
+    await asyncio.sleep(0.01)
+    assert started == [1, 1]
+
+    tasks.append(asyncio.create_task(_hold(scheduler, 2, release, started)))
+    await asyncio.sleep(0.01)
+    assert started == [1, 1, 2]
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+async def test_cancelled_waiter_leaves_queue():
+    scheduler = LLMScheduler(max_concurrency=1, max_concurrency_per_user=1)
+    release = asyncio.Event()
+    started: list[int | None] = []
+
+    holder = asyncio.create_task(_hold(scheduler, 1, release, started))
+    waiter = asyncio.create_task(_hold(scheduler, 2, release, started))
+    await asyncio.sleep(0.01)
+    assert scheduler.queue_depth == 1
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert scheduler.queue_depth == 0
+
+    release.set()
+    await holder
+    assert scheduler.active == 0
+    assert started == [1]
+
+
+async def test_waiter_cancelled_in_same_tick_as_release():
+    scheduler = LLMScheduler(max_concurrency=1, max_concurrency_per_user=1)
+    release = asyncio.Event()
+    started: list[int | None] = []
+
+    holder = asyncio.create_task(_hold(scheduler, 1, release, started))
+    waiter = asyncio.create_task(_hold(scheduler, 2, release, started))
+    await asyncio.sleep(0.01)
+
+    # Основной запрос освобождает место раньше, чем отменённый запрос
+    # успевает удалить себя из очереди
+    release.set()
+    waiter.cancel()
+
+    await holder
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert scheduler.active == 0
+    assert scheduler.queue_depth == 0
+    assert started == [1]
+
+    async with asyncio.timeout(1):
+        async with scheduler.slot(user_id=2, tokens=1):
+            pass
+
+
+async def test_waits_for_token_bucket_refill():
+    # 6000 токенов в минуту — 100 токенов в секунду
+    scheduler = LLMScheduler(
+        max_concurrency=10,
+        max_concurrency_per_user=10,
+        tokens_per_minute=6000,
+    )
+    async with scheduler.slot(user_id=1, tokens=6000):
+        pass
+
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
+    async with scheduler.slot(user_id=2, tokens=20):
+        waited = loop.time() - started_at
+
+    assert 0.1 <= waited < 1.0
+    assert scheduler.throttled == 1
+
+
+async def test_adjust_tokens_returns_unused_tokens():
+    scheduler = LLMScheduler(
+        max_concurrency=10,
+        max_concurrency_per_user=10,
+        tokens_per_minute=6000,
+    )
+    async with scheduler.slot(user_id=1, tokens=6000):
+        pass
+
+    started: list[int | None] = []
+    waiter = asyncio.create_task(
+        _hold(scheduler, 2, asyncio.Event(), started, tokens=1000)
+    )
+    await asyncio.sleep(0.01)
+    assert started == []
+
+    # Фактический расход оказался на 5000 токенов меньше оценки
+    scheduler.adjust_tokens(-5000)
+    await asyncio.sleep(0)
+    assert started == [2]
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+
+async def test_oversized_request_does_not_wait_forever():
+    scheduler = LLMScheduler(
+        max_concurrency=1,
+        max_concurrency_per_user=1,
+        tokens_per_minute=6000,
+    )
+
+    async with asyncio.timeout(1):
+        async with scheduler.slot(user_id=1, tokens=100_000):
+            pass
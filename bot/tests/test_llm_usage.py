@@ -0,0 +1,29 @@
+from typing import Any
+
+import pytest
+
+import app.services.llm_usage as llm_usage_module
+
+
+class FakeLLMCallDAO:
+    async def get_usage_by_day_and_model(self, session: Any, *, since: Any) -> list:
+        return []
+
+    async def get_usage_by_model(self, session: Any, *, since: Any) -> list:
+        return [
+            ("gpt-a", 10, 10, 3000, 1500, 500),
+            ("gpt-b", 5, 5, 1000, 0, 200),
+        ]
+
+
+@pytest.fixture(autouse=True)
+def llm_calls(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(llm_usage_module, "LLMCallDAO", FakeLLMCallDAO())
+
+
+async def test_usage_stats_include_prompt_cache_hit_ratio():
+    lines = await llm_usage_module.get_usage_stats_lines(session=None)
+
+    assert lines[-1] == (
+        "Попадания в кэш промптов: 37.5% (1500 из 4000 токенов запроса)"
+    )
@@ -0,0 +1,37 @@
+from aiohttp.test_utils import TestClient, TestServer
+from prometheus_client import REGISTRY
+
+from app.metrics import (
+    HANDLER_ERRORS,
+    TRANSLATION_CACHE_REQUESTS,
+    create_metrics_app,
+)
+
+
+def test_function_counter_reads_values_on_collect():
+    hits = 0
+    TRANSLATION_CACHE_REQUESTS.set_function(lambda: hits, result="test_hit")
+
+    hits = 3
+
+    assert (
+        REGISTRY.get_sample_value(
+            "translation_cache_requests_total", {"result": "test_hit"}
+        )
+        == 3
+    )
+
+
+async def test_metrics_endpoint_serves_registered_metrics():
+    HANDLER_ERRORS.labels(handler="test_handler", error="ValueError").inc()
+    async with TestClient(TestServer(create_metrics_app())) as client:
+        response = await client.get("/metrics")
+        text = await response.text()
+
+    assert response.status == 200
+    assert response.content_type == "text/plain"
+    assert (
+        'bot_handler_errors_total{error="ValueError",handler="test_handler"} 1.0'
+        in text
+    )
+    assert "# TYPE translation_cache_requests_total counter" in text
@@ -0,0 +1,166 @@
+from typing import Any
+
+import pytest
+from aiohttp.test_utils import TestServer
+
+import app.pretranslate as pretranslate_module
+import app.services.llm_usage as llm_usage_module
+from app.integrations.chatgpt import create_chatgpt_client
+from app.pretranslate import PretranslateStats, _pretranslate_batch
+from app.schemas import LLMCallKind
+from app.utils import get_source_hash
+from tests.mock_completions_server import REQUESTS_KEY, create_app
+
+
+class FakeSession:
+    async def __aenter__(self) -> "FakeSession":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        pass
+
+    async def commit(self) -> None:
+        pass
+
+
+class FakeDatabase:
+    """Хранит переводы и записи о запросах к LLM в памяти вместо PostgreSQL."""
+
+    def __init__(self) -> None:
+        self.translations: dict[str, Any] = {}
+        self.llm_calls: list[Any] = []
+
+    async def find_existing_source_hashes(
+        self, session: FakeSession, *, sources: list[str]
+    ) -> set[str]:
+        hashes = {get_source_hash(source) for source in sources}
+        return hashes & self.translations.keys()
+
+    async def upsert_many(
+        self, session: FakeSession, objs_in: list[Any], *, index_elements: list[str]
+    ) -> list[Any]:
+        # Как ON CONFLICT DO NOTHING: существующие строки не попадают в результат
+        created = [obj for obj in objs_in if obj.source_hash not in self.translations]
+        for obj in created:
+            self.translations[obj.source_hash] = obj
+        return created
+
+    async def add(self, session: FakeSession, obj_in: Any) -> Any:
+        self.llm_calls.append(obj_in)
+        return obj_in
+
+
+@pytest.fixture
+def database(monkeypatch: pytest.MonkeyPatch) -> FakeDatabase:
+    database = FakeDatabase()
+    monkeypatch.setattr(pretranslate_module, "SessionLocal", FakeSession)
+    monkeypatch.setattr(pretranslate_module, "TranslationDAO", database)
+    monkeypatch.setattr(pretranslate_module, "LLMCallDAO", database)
+    monkeypatch.setattr(llm_usage_module, "LLMCallDAO", database)
+    return database
+
+
+@pytest.fixture
+async def server():
+    server = TestServer(create_app())
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+async def chatgpt_client(server: TestServer):
+    client = create_chatgpt_client(api_base_url=str(server.make_url("/v1")))
+    await client.start()
+    yield client
+    await client.close()
+
+
+async def test_pretranslate_batch_saves_translations(database, server, chatgpt_client):
+    stats = PretranslateStats()
+
+    await _pretranslate_batch(
+        chatgpt_client=chatgpt_client,
+        sources=["Apple", "bread"],
+        model="mock-model",
+        stats=stats,
+    )
+
+    assert stats.translated == 2
+    assert stats.failed == 0
+    assert stats.tokens > 0
+    translations = {obj.source: obj for obj in database.translations.values()}
+    assert translations["apple"].translation == "Apple (перевод)"
+    assert translations["bread"].view_count == 0
+    assert len(database.llm_calls) == 1
+    assert database.llm_calls[0].kind == LLMCallKind.PRETRANSLATE
+    assert database.llm_calls[0].items == 2
+
+
+async def test_pretranslate_batch_resume_skips_stored_words(
+    database, server, chatgpt_client
+):
+    await _pretranslate_batch(
+        chatgpt_client=chatgpt_client,
+        sources=["apple", "bread"],
+        model="mock-model",
+        stats=PretranslateStats(),
+    )
+
+    # Повторный запуск после прерывания переводит только недостающие слова
+    stats = PretranslateStats()
+    await _pretranslate_batch(
+        chatgpt_client=chatgpt_client,
+        sources=["apple", "bread", "cheese"],
+        model="mock-model",
+        stats=stats,
+    )
+
+    requests = server.app[REQUESTS_KEY]
+    assert len(requests) == 2
+    assert '"cheese"' in requests[-1]["messages"][-1]["content"]
+    assert '"apple"' not in requests[-1]["messages"][-1]["content"]
+    assert stats.skipped == 2
+    assert stats.translated == 1
+    assert len(database.translations) == 3
+
+    # Пакет из уже сохранённых слов не отправляется в API
+    stats = PretranslateStats()
+    await _pretranslate_batch(
+        chatgpt_client=chatgpt_client,
+        sources=["apple", "cheese"],
+        model="mock-model",
+        stats=stats,
+    )
+
+    assert len(requests) == 2
+    assert stats.skipped == 2
+    assert stats.translated == 0
+
+
+async def test_pretranslate_batch_records_unparsable_response(database):
+    server = TestServer(create_app(invalid_json=True))
+    await server.start_server()
+    client = create_chatgpt_client(api_base_url=str(server.make_url("/v1")))
+    await client.start()
+    try:
+        stats = PretranslateStats()
+        await _pretranslate_batch(
+            chatgpt_client=client,
+            sources=["apple", "bread"],
+            model="mock-model",
+            stats=stats,
+        )
+    finally:
+        await client.close()
+        await server.close()
+
+    # Токены на некорректный ответ израсходованы и учитываются в расходах
+    assert stats.failed == 2
+    assert stats.tokens > 0
+    assert database.translations == {}
+    assert len(database.llm_calls) == 1
+    assert database.llm_calls[0].kind == LLMCallKind.PRETRANSLATE
+    assert database.llm_calls[0].items == 0
+    assert database.llm_calls[0].prompt_tokens > 0
+    assert database.llm_calls[0].cached_tokens is None
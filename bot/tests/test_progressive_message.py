@@ -0,0 +1,69 @@
+from typing import Any
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import SendMessage
+
+from app.utils.telegram import MAX_MESSAGE_LENGTH, ProgressiveMessage
+
+
+def bad_request() -> TelegramBadRequest:
+    return TelegramBadRequest(
+        method=SendMessage(chat_id=1, text=""), message="can't parse entities"
+    )
+
+
+class FakeMessage:
+    """Записывает отправленные и отредактированные тексты вместо Telegram."""
+
+    def __init__(self, log: list[tuple[str, str, Any]], *, fail_all: bool = False):
+        self.log = log
+        self.fail_all = fail_all
+
+    async def answer(self, text: str, parse_mode: Any = None, **kwargs: Any):
+        if self.fail_all or parse_mode is not None:
+            raise bad_request()
+        self.log.append(("answer", text, kwargs.get("reply_markup")))
+        return FakeMessage(self.log, fail_all=self.fail_all)
+
+    async def edit_text(self, text: str, parse_mode: Any = None, **kwargs: Any):
+        if self.fail_all or parse_mode is not None:
+            raise bad_request()
+        self.log.append(("edit", text, kwargs.get("reply_markup")))
+
+
+async def test_finish_splits_long_text_and_keeps_buttons_on_last_part():
+    log: list[tuple[str, str, Any]] = []
+    progressive = ProgressiveMessage(message=FakeMessage(log), min_interval=0)
+    await progressive.update("начало")
+
+    paragraph = "а" * (MAX_MESSAGE_LENGTH - 10)
+    await progressive.finish(
+        f"{paragraph}\n\n{paragraph}", parse_mode="Markdown", reply_markup="buttons"
+    )
+
+    assert [(action, len(text), markup) for action, text, markup in log] == [
+        ("answer", len("начало"), None),
+        ("edit", len(paragraph), None),
+        ("answer", len(paragraph), "buttons"),
+    ]
+
+
+async def test_finish_survives_failed_plain_text_fallback():
+    log: list[tuple[str, str, Any]] = []
+    progressive = ProgressiveMessage(
+        message=FakeMessage(log, fail_all=True), min_interval=0
+    )
+
+    await progressive.finish("*перевод*", parse_mode="Markdown")
+
+    assert log == []
+
+
+async def test_fail_replaces_partial_translation():
+    log: list[tuple[str, str, Any]] = []
+    progressive = ProgressiveMessage(message=FakeMessage(log), min_interval=0)
+    await progressive.update("незаконченный перев")
+
+    await progressive.fail("❌ Ошибка")
+
+    assert log[-1] == ("edit", "❌ Ошибка", None)
@@ -0,0 +1,49 @@
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import httpx
+
+from app.integrations.chatgpt.client import _parse_retry_after
+
+
+def test_retry_after_seconds():
+    assert _parse_retry_after(httpx.Headers({"Retry-After": "7"})) == 7.0
+
+
+def test_retry_after_ms_takes_precedence():
+    headers = httpx.Headers({"retry-after-ms": "1500", "Retry-After": "7"})
+    assert _parse_retry_after(headers) == 1.5
+
+
+def test_retry_after_http_date():
+    retry_at = datetime.now(UTC) + timedelta(seconds=30)
+    headers = httpx.Headers({"Retry-After": format_datetime(retry_at, usegmt=True)})
+
+    delay = _parse_retry_after(headers)
+
+    assert delay is not None
+    assert 25 <= delay <= 30
+
+
+def test_retry_after_http_date_without_zone():
+    # Зона "-0000" даёт дату без часового пояса, её нельзя вычитать из aware-даты
+    retry_at = datetime.now(UTC) + timedelta(seconds=30)
+    headers = httpx.Headers(
+        {"Retry-After": retry_at.strftime("%a, %d %b %Y %H:%M:%S -0000")}
+    )
+
+    delay = _parse_retry_after(headers)
+
+    assert delay is not None
+    assert 25 <= delay <= 30
+
+
+def test_retry_after_past_date_and_garbage():
+    assert (
+        _parse_retry_after(
+            httpx.Headers({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        )
+        == 0.0
+    )
+    assert _parse_retry_after(httpx.Headers({"Retry-After": "soon"})) is None
+    assert _parse_retry_after(httpx.Headers()) is None
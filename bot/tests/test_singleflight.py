@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from app.utils import SingleFlight
+
+
+async def test_concurrent_calls_share_one_execution():
+    flights: SingleFlight[str, int] = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def func() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return 42
+
+    tasks = [asyncio.create_task(flights.do("key", func)) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert len(flights) == 1
+
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert calls == 1
+    assert sorted(results) == [(42, False), (42, True), (42, True)]
+    assert len(flights) == 0
+
+
+async def test_different_keys_run_separately():
+    flights: SingleFlight[str, str] = SingleFlight()
+
+    async def echo(value: str) -> str:
+        await asyncio.sleep(0)
+        return value
+
+    results = await asyncio.gather(
+        flights.do("a", lambda: echo("a")),
+        flights.do("b", lambda: echo("b")),
+    )
+
+    assert results == [("a", False), ("b", False)]
+
+
+async def test_key_is_released_after_call():
+    flights: SingleFlight[str, int] = SingleFlight()
+    calls = 0
+
+    async def func() -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await flights.do("key", func) == (1, False)
+    assert await flights.do("key", func) == (2, False)
+
+
+async def test_exception_is_propagated_to_followers():
+    flights: SingleFlight[str, int] = SingleFlight()
+    release = asyncio.Event()
+
+    async def func() -> int:
+        await release.wait()
+        raise RuntimeError("boom")
+
+    leader = asyncio.create_task(flights.do("key", func))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.do("key", func))
+    await asyncio.sleep(0)
+    release.set()
+
+    with pytest.raises(RuntimeError):
+        await leader
+    with pytest.raises(RuntimeError):
+        await follower
+    assert len(flights) == 0
+
+
+async def test_cancelled_leader_cancels_followers():
+    flights: SingleFlight[str, int] = SingleFlight()
+
+    async def func() -> int:
+        await asyncio.Event().wait()
+        return 1
+
+    leader = asyncio.create_task(flights.do("key", func))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.do("key", func))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    with pytest.raises(asyncio.CancelledError):
+        await follower
+    assert len(flights) == 0
+
+
+async def test_cancelled_follower_does_not_cancel_leader():
+    flights: SingleFlight[str, int] = SingleFlight()
+    release = asyncio.Event()
+
+    async def func() -> int:
+        await release.wait()
+        return 1
+
+    leader = asyncio.create_task(flights.do("key", func))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.do("key", func))
+    await asyncio.sleep(0)
+
+    follower.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await follower
+
+    release.set()
+    assert await leader == (1, False)
@@ -0,0 +1,33 @@
+import pytest
+
+from app.utils import clean_text, get_source_hash, normalize_source
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("run", "run"),
+        ("  Run ", "run"),
+        ("RUN!", "run"),
+        ("«run»", "run"),
+        ("run away", "run away"),
+        ("take   \t off", "take off"),
+        ("ＲＵＮ", "run"),
+        ("“Don’t”", "don’t"),
+        ("...", ""),
+    ],
+)
+def test_normalize_source(text, expected):
+    assert normalize_source(text) == expected
+
+
+def test_clean_text_keeps_case_and_inner_punctuation():
+    assert clean_text("  Mr. Smith's car?! ") == "Mr. Smith's car"
+
+
+def test_get_source_hash_is_equal_for_equivalent_texts():
+    source_hash = get_source_hash(normalize_source("Run!"))
+
+    assert source_hash == get_source_hash(normalize_source(" run "))
+    assert source_hash != get_source_hash(normalize_source("ran"))
+    assert len(source_hash) == 64
@@ -0,0 +1,105 @@
+from datetime import UTC, datetime
+
+from app.integrations.chatgpt.schemas import (
+    TranslationArticle,
+    TranslationExample,
+    TranslationSense,
+)
+from app.schemas import TranslationSchema
+from app.services.translation_renderer import (
+    escape_markdown,
+    render_article,
+    render_translation,
+)
+from app.utils import get_source_hash
+
+
+def test_escape_markdown():
+    assert escape_markdown("a_b*c`d[e") == "a\\_b\\*c\\`d\\[e"
+
+
+def test_render_brief_article():
+    article = TranslationArticle(
+        headword="run",
+        preferred="бежать",
+        senses=[
+            TranslationSense(translation="бежать"),
+            TranslationSense(translation="управлять"),
+            TranslationSense(translation="  "),
+        ],
+    )
+
+    assert render_article(article) == "*run* — бежать\n\nТакже: управлять"
+
+
+def test_render_brief_article_without_alternatives():
+    article = TranslationArticle(
+        headword="cat",
+        preferred="кошка",
+        senses=[TranslationSense(translation="Кошка")],
+    )
+
+    assert render_article(article) == "*cat* — кошка"
+
+
+def test_render_full_article():
+    article = TranslationArticle(
+        headword="run",
+        preferred="бежать",
+        senses=[
+            TranslationSense(
+                translation="бежать",
+                note="двигаться быстро",
+                examples=[
+                    TranslationExample(
+                        source="I run fast", translation="Я бегу быстро"
+                    ),
+                ],
+            ),
+            TranslationSense(translation="управлять", note="о бизнесе"),
+        ],
+    )
+
+    assert render_article(article) == (
+        "*run* — бежать\n\n"
+        "1. *бежать* — двигаться быстро\n"
+        "    _I run fast_ — _Я бегу быстро_\n\n"
+        "2. *управлять* — о бизнесе"
+    )
+
+
+def test_render_article_removes_markup_inside_entities():
+    article = TranslationArticle(
+        headword="snake_case",
+        preferred="змеиный_регистр",
+        senses=[TranslationSense(translation="змеиный_регистр")],
+    )
+
+    assert render_article(article) == "*snakecase* — змеиный\\_регистр"
+
+
+def _translation(**kwargs) -> TranslationSchema:
+    return TranslationSchema(
+        id=1,
+        source="run",
+        source_hash=get_source_hash("run"),
+        created_at=datetime(2026, 1, 1, tzinfo=UTC),
+        **kwargs,
+    )
+
+
+def test_render_translation_prefers_article():
+    article = TranslationArticle(
+        headword="run",
+        preferred="бежать",
+        senses=[TranslationSense(translation="бежать")],
+    )
+    translation = _translation(translation="*run* — бежать", article=article)
+
+    assert render_translation(translation) == render_article(article)
+
+
+def test_render_translation_without_article_returns_markdown_as_is():
+    translation = _translation(translation="**run** — _бежать_")
+
+    assert render_translation(translation) == "**run** — _бежать_"
@@ -0,0 +1,64 @@
+from typing import Any
+
+import pytest
+
+import app.services.translation as translation_module
+from app.schemas import TranslationSuggestionSchema
+from app.utils import BKTree
+
+
+class FailingChatGPTClient:
+    """Падает при любом обращении: подсказка не должна вызывать ChatGPT."""
+
+    def __getattr__(self, name: str) -> Any:
+        raise AssertionError(f"ChatGPT client used: {name}")
+
+
+@pytest.fixture
+def stored_words(monkeypatch: pytest.MonkeyPatch) -> BKTree:
+    async def find_nothing(**kwargs: Any) -> None:
+        return None
+
+    index = BKTree()
+    monkeypatch.setattr(translation_module, "fuzzy_index", index)
+    monkeypatch.setattr(translation_module, "_find_and_register_view", find_nothing)
+    monkeypatch.setattr(translation_module, "_find_by_lemma", find_nothing)
+    return index
+
+
+async def test_typo_returns_suggestion_without_llm_call(stored_words):
+    stored_words.add("weather")
+
+    result = await translation_module.get_translation(
+        session=None,
+        chatgpt_client=FailingChatGPTClient(),
+        source="Wether ",
+        model="gpt-test",
+    )
+
+    assert result == TranslationSuggestionSchema(
+        requested_source="wether",
+        suggested_source="weather",
+    )
+
+
+async def test_exact_request_skips_suggestion(monkeypatch, stored_words):
+    stored_words.add("weather")
+    requested: list[str] = []
+
+    async def translate_and_add(*, source: str, **kwargs: Any) -> None:
+        requested.append(source)
+        return None
+
+    monkeypatch.setattr(translation_module, "_translate_and_add", translate_and_add)
+
+    result = await translation_module.get_translation(
+        session=None,
+        chatgpt_client=FailingChatGPTClient(),
+        source="wether",
+        model="gpt-test",
+        allow_approximate=False,
+    )
+
+    assert result is None
+    assert requested == ["wether"]
@@ -0,0 +1,70 @@
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+import app.services.translation as translation_module
+from app.config import settings
+from app.utils import TTLCache, get_source_hash
+
+
+class FakeSession:
+    async def commit(self) -> None:
+        pass
+
+
+class FakeTranslationDAO:
+    """Хранит одну запись перевода и считает выполненные запросы."""
+
+    def __init__(self) -> None:
+        self.row = SimpleNamespace(
+            id=1,
+            source="run",
+            source_hash=get_source_hash("run"),
+            lemma="run",
+            translation="бежать",
+            article=None,
+            is_brief=False,
+            view_count=1,
+            created_at=datetime.now(UTC),
+        )
+        self.queries: list[str] = []
+
+    async def increment_view_count(self, session: Any, *, source: str) -> Any:
+        self.queries.append("update returning")
+        self.row.view_count += 1
+        return self.row
+
+    async def increment_view_count_without_returning(
+        self, session: Any, *, source: str
+    ) -> bool:
+        self.queries.append("update")
+        self.row.view_count += 1
+        return True
+
+
+@pytest.fixture
+def database(monkeypatch: pytest.MonkeyPatch) -> FakeTranslationDAO:
+    dao = FakeTranslationDAO()
+    monkeypatch.setattr(translation_module, "TranslationDAO", dao)
+    monkeypatch.setattr(
+        translation_module, "translation_cache", TTLCache(max_size=10, ttl=60)
+    )
+    monkeypatch.setattr(settings, "VIEW_COUNT_WRITE_BEHIND", False)
+    return dao
+
+
+async def test_cached_translation_is_not_read_again(database):
+    first = await translation_module._find_and_register_view(
+        session=FakeSession(), source="run"
+    )
+    second = await translation_module._find_and_register_view(
+        session=FakeSession(), source="run"
+    )
+
+    # Повторный просмотр записывается в БД, но статья берётся из кэша
+    assert database.queries == ["update returning", "update"]
+    assert first.view_count == 2
+    assert second.view_count == 3
+    assert second.translation == "бежать"